@@ -6,11 +6,52 @@ __name__ = 'gridwxcomp'
 __author__ = 'John Volk and Chris Pearson'
 __version__ = '0.0.57'
 
+import sys
+import types
+from importlib import import_module
 
-from gridwxcomp.prep_input import prep_input
-from gridwxcomp.download_gridmet_ee import download_gridmet_ee
-from gridwxcomp.calc_bias_ratios import calc_bias_ratios
-from gridwxcomp.interpgdal import InterpGdal
-from gridwxcomp.spatial import make_points_file, make_grid, interpolate
-from gridwxcomp.daily_comparison import daily_comparison
-from gridwxcomp.monthly_comparison import monthly_comparison
+# public API and the submodule of each name, submodules are imported on 
+# first access so that importing gridwxcomp does not load Earth Engine, 
+# GDAL, fiona, rasterio, or bokeh until they are needed
+_LAZY_IMPORTS = {
+    'prep_input': 'gridwxcomp.prep_input',
+    'download_gridmet_ee': 'gridwxcomp.download_gridmet_ee',
+    'calc_bias_ratios': 'gridwxcomp.calc_bias_ratios',
+    'calc_bias_ratio_tables': 'gridwxcomp.calc_bias_ratios',
+    'InterpGdal': 'gridwxcomp.interpgdal',
+    'make_points_file': 'gridwxcomp.spatial',
+    'make_grid': 'gridwxcomp.spatial',
+    'interpolate': 'gridwxcomp.spatial',
+    'daily_comparison': 'gridwxcomp.daily_comparison',
+    'monthly_comparison': 'gridwxcomp.monthly_comparison'
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Keep functions as package attributes when their submodule of the same 
+    name is imported, e.g. ``gridwxcomp.prep_input`` is the function as it
+    was when all names were imported by this module.
+    """
+    def __setattr__(self, name, value):
+        if name in _LAZY_IMPORTS and isinstance(value, types.ModuleType):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
@@ -38,13 +38,13 @@ Note:
 """
 
 import os
+import json
 import calendar
 import argparse
-import warnings
 
 import pandas as pd
 import numpy as np
-from .util import parse_yr_filter
+from .util import parse_yr_filter, map_workers
 
 # keys = gridMET variable name
 # values = climate station variable name
@@ -61,8 +61,16 @@ GRIDMET_STATION_VARS = {
 
 OPJ = os.path.join
 
+# months of non-monthly periods in the order of summary file columns
+_PERIODS = (
+    ('growseason', [4,5,6,7,8,9]),
+    ('summer', [6,7,8]),
+    ('annual', list(range(1,13)))
+)
+
 def main(input_file_path, out_dir, gridmet_var='etr_mm', station_var=None,
-         gridmet_id=None, day_limit=10, years='all', comp=True):
+         gridmet_id=None, day_limit=10, years='all', comp=True, workers=1,
+         cache_dir=None, windows=None, rolling=None, checkpoint=None):
     """
     Calculate monthly bias ratios between station climate and gridMET
     cells that correspond with each other geographically. Saves data
@@ -80,13 +88,13 @@ def main(input_file_path, out_dir, gridmet_var='etr_mm', station_var=None,
             
     Keyword Arguments:
         gridmet_var (str): default 'etr_mm'. GridMET climate variable
-            to calculate bias ratios.
+            to calculate bias ratios, comma separated variables, or 'all'.
         station_var (str): default None. Climate station variable to use
             to calculate bias ratios. If None, look up using ``gridmet_var`` 
             as a key to ``GRIDMET_STATION_VARS`` dictionary which is a 
             module attribute to :mod:`gridwxcomp.calc_bias_ratios`.
         gridmet_ID (str): optional gridMET ID number to only calculate bias 
-            ratios for a single gridMET cell.
+            ratios for a single gridMET cell, or comma separated IDs.
         day_limit (int): default 10. Threshold number of days in month
             of missing data, if less exclude month from calculations.
         years (int or str): default 'all'. Years to use for calculations
@@ -94,6 +102,18 @@ def main(input_file_path, out_dir, gridmet_var='etr_mm', station_var=None,
         comp (bool): default True. Save a "comprehensive" summary
             output CSV file that contains additional station metadata
             and statistics in addition to the mean monthly ratios.
+        workers (int): default 1. Number of processes used to calculate
+            ratios for stations in parallel.
+        cache_dir (str): default None. Directory to store monthly sums of
+            each station and reuse them in later runs if the station and 
+            gridMET time series files have not changed.
+        windows (str): default None. Comma separated years or year ranges
+            to calculate ratios for each in one pass, e.g. 
+            '1980-1989,1990-1999'.
+        rolling (int): default None. Length in years of rolling windows 
+            within ``years`` to calculate ratios for in one pass.
+        checkpoint (str): default None. Path to a checkpoint journal to
+            resume a run, stations that finished are not recalculated.
 
     Returns:
         None
@@ -107,10 +127,18 @@ def main(input_file_path, out_dir, gridmet_var='etr_mm', station_var=None,
             $ python calc_bias_ratios.py -i merged_input.csv -o monthly_ratios
             $ # for all gridMET cells in input file for gridMET var "eto_mm"
             $ python calc_bias_ratios.py -i merged_input.csv -o monthly_ratios -gv eto_mm
+            $ # for all gridMET variables, each station is read once
+            $ python calc_bias_ratios.py -i merged_input.csv -o monthly_ratios -gv all
             $ # for a specific gridMET cell ID for "etr_mm"
             $ python calc_bias_ratios.py -i merged_input.csv -o monthly_ratios -id 509011
             $ # to exclude any months with less than 15 days of data
             $ python calc_bias_ratios.py -i merged_input.csv -o monthly_ratios -d 15
+            $ # to reuse monthly sums of unchanged stations in later runs
+            $ python calc_bias_ratios.py -i merged_input.csv -o monthly_ratios --cache-dir monthly_sums
+            $ # for every 10 year window from 1980 to 2019 in long format
+            $ python calc_bias_ratios.py -i merged_input.csv -o monthly_ratios -y 1980-2019 --rolling 10
+            $ # to resume the same command after a crash
+            $ python calc_bias_ratios.py -i merged_input.csv -o monthly_ratios --checkpoint ratios.jsonl
             
         It is also possible for the user to define their own station 
         variable name if, for example, they are using station data that was
@@ -151,21 +179,27 @@ def main(input_file_path, out_dir, gridmet_var='etr_mm', station_var=None,
         station_var=station_var, 
         gridmet_ID=gridmet_id, 
         day_limit=day_limit,
-        comp=comp
+        years=years,
+        comp=comp,
+        workers=workers,
+        cache_dir=cache_dir,
+        windows=windows,
+        rolling=rolling,
+        checkpoint=checkpoint
     )
 
 def _save_output(out_df, comp_out_df, out_dir, gridmet_ID, var_name, yrs):
     """
-    Save short summary file or overwrite existing data for a single
-    climate station.
+    Save short summary file or overwrite existing data for climate 
+    stations, each file is read and written once for all stations.
     
     Arguments:
         out_df (:class:`pandas.DataFrame`): data containing short
-            summary info, mainly mean monthly bias ratios for a 
-            single climate station to save.
+            summary info, mainly mean monthly bias ratios for 
+            climate stations to save, one row per station.
         comp_out_df (:class:`pandas.DataFrame`, bool): either a 
-            single row dataframe with comprehensive summary data
-            or False (default). depends on ``comp`` argument to 
+            dataframe with comprehensive summary data, one row per 
+            station, or False (default). depends on ``comp`` argument to 
             :func:`calc_bias_ratios`. If :class:`pandas.DataFrame` 
             is passed then save or update existing file.
         out_dir (str): path to directory to save or update summary data
@@ -176,7 +210,9 @@ def _save_output(out_df, comp_out_df, out_dir, gridmet_ID, var_name, yrs):
             the given gridMET ID with the suffix "_X" where X is the
             gridMET ID value.
         var_name (str): name of gridMET variable that is being processed.
-        yrs (str): years used to calc ratios, save to out files as suffix.
+        yrs (str): years used to calc ratios, save to out files as suffix,
+            or "windows" or "rolling_[N]yr" for long format summaries of
+            multiple year windows indexed by STATION_ID and WINDOW.
     
     Returns:
         None       
@@ -188,20 +224,21 @@ def _save_output(out_df, comp_out_df, out_dir, gridmet_ID, var_name, yrs):
         Helper function that is reused for both short and long summary
         files.        
         """
-        # if short file exists add/overwrite row for station
+        # last result is kept if a station was processed more than once
+        out_df = out_df[~out_df.index.duplicated(keep='last')]
+        # if short file exists add/overwrite rows for stations
         if os.path.isfile(out_file):
-            existing_df = pd.read_csv(out_file, index_col='STATION_ID')
-            if not out_df.index.values[0] in existing_df.index.values:
-                out_df = pd.concat([existing_df, out_df], sort=False)
-                out_df.to_csv(out_file, na_rep=-999, index=True)
+            existing_df = pd.read_csv(
+                out_file, index_col=list(out_df.index.names)
+            )
+            exists = out_df.index.isin(existing_df.index)
             # overwrite if station is in existing, could change to
             # allow for duplicates if values are different
-            else:
-                existing_df.loc[out_df.index.values[0], :] =\
-                    out_df.loc[out_df.index.values[0]]
-                existing_df.to_csv(out_file, na_rep=-999, index=True)
-        else:
-            out_df.to_csv(out_file, na_rep=-999, index=True)
+            if exists.any():
+                existing_df.loc[out_df.index[exists], :] =\
+                    out_df.loc[exists].reindex(columns=existing_df.columns)
+            out_df = pd.concat([existing_df, out_df.loc[~exists]], sort=False)
+        out_df.to_csv(out_file, na_rep=-999, index=True)
             
     # save or update short and comprehensive summary files
     if not os.path.isdir(out_dir):
@@ -236,9 +273,931 @@ def _save_output(out_df, comp_out_df, out_dir, gridmet_ID, var_name, yrs):
             )
         __save_update(comp_out_df, comp_out_file)
     
+def _file_fingerprint(path):
+    """
+    Helper function to get the size and modification time of a file to 
+    detect changes between runs, None if the file does not exist.
+    """
+    if not os.path.isfile(path):
+        return None
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+def _input_fingerprints(row):
+    """
+    Helper function to get fingerprints of the station and gridMET time 
+    series files of a row of the input table.
+    """
+    return {
+        'STATION_FILE_PATH': _file_fingerprint(row.STATION_FILE_PATH),
+        'GRIDMET_FILE_PATH': _file_fingerprint(row.GRIDMET_FILE_PATH)
+    }
+
+def _read_checkpoint(checkpoint):
+    """
+    Helper function to read the last entry of each station from a 
+    checkpoint journal written by :func:`_checkpoint_monthly_sums`, keyed
+    by STATION_ID as a string. Incomplete lines, e.g. from a crash while
+    writing, are ignored.
+    """
+    entries = {}
+    if not os.path.isfile(checkpoint):
+        return entries
+    with open(checkpoint) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry['STATION_ID']] = entry
+    return entries
+
+def _checkpoint_result(entry, row, var_pairs):
+    """
+    Helper function to get monthly sums of a station from its checkpoint 
+    journal entry if it finished with the same time series files and 
+    variables, otherwise None.
+    """
+    if not entry or entry['status'] != 'done' or \
+            entry['files'] != _input_fingerprints(row) or \
+            any(entry['vars'].get(g) != s for g, s in var_pairs):
+        return None
+    monthly = pd.DataFrame(entry['monthly']).set_index(['year', 'month'])
+    monthly.columns = pd.MultiIndex.from_tuples(
+        [tuple(c.rsplit('_', 1)) for c in monthly.columns]
+    )
+    return monthly
+
+def _checkpoint_monthly_sums(row_df, var_pairs, cache_dir, checkpoint):
+    """
+    Calculate monthly sums of a station with :func:`_station_monthly_sums`
+    and append the result to a checkpoint journal, one JSON line per 
+    station with its STATION_ID, time series file fingerprints, variables,
+    status ("done", "missing", or "failed"), and monthly sums. Errors are 
+    recorded in the journal and printed instead of stopping the run.
+    """
+    row = row_df.iloc[0]
+    entry = {
+        'STATION_ID': str(row.STATION_ID),
+        'files': _input_fingerprints(row),
+        'vars': dict(var_pairs)
+    }
+    try:
+        monthly = _station_monthly_sums(row_df, var_pairs, cache_dir)
+    except Exception as e:
+        print('WARNING: calculation failed for station:', row.STATION_ID,
+              '\n{}'.format(e))
+        monthly = None
+        entry.update(status='failed', error=repr(e))
+    else:
+        if monthly is None:
+            entry['status'] = 'missing'
+        else:
+            flat = monthly.copy()
+            flat.columns = ['_'.join(c) for c in flat.columns]
+            entry.update(
+                status='done', monthly=flat.reset_index().to_dict('list')
+            )
+    # one write per line so entries of parallel workers are not mixed 
+    with open(checkpoint, 'a') as f:
+        f.write(json.dumps(entry, default=lambda x: x.item()) + '\n')
+
+    return monthly
+
+def _read_monthly_sums(cache_dir, station_id):
+    """
+    Helper function to read stored monthly sums and day counts of a 
+    station and their metadata (file fingerprints and variable pairs) 
+    saved by :func:`_write_monthly_sums`. Returns (None, None) if they 
+    do not exist.
+    """
+    sums_file = OPJ(cache_dir, '{}_monthly_sums.csv'.format(station_id))
+    meta_file = OPJ(cache_dir, '{}_monthly_sums.json'.format(station_id))
+    if not os.path.isfile(sums_file) or not os.path.isfile(meta_file):
+        return None, None
+    with open(meta_file) as f:
+        meta = json.load(f)
+    monthly = pd.read_csv(sums_file, index_col=['year', 'month'])
+    monthly.columns = pd.MultiIndex.from_tuples(
+        [tuple(c.rsplit('_', 1)) for c in monthly.columns]
+    )
+    return monthly, meta
+
+def _write_monthly_sums(cache_dir, station_id, monthly, meta):
+    """
+    Helper function to save monthly sums and day counts of a station to
+    "[STATION_ID]_monthly_sums.csv" with their metadata in a JSON file of 
+    the same name in ``cache_dir``.
+    """
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+    monthly = monthly.copy()
+    monthly.columns = ['_'.join(c) for c in monthly.columns]
+    monthly.to_csv(OPJ(cache_dir, '{}_monthly_sums.csv'.format(station_id)))
+    with open(OPJ(cache_dir, '{}_monthly_sums.json'.format(station_id)), 
+            'w') as f:
+        json.dump(meta, f, indent=4)
+
+def _station_monthly_sums(row_df, var_pairs, cache_dir=None):
+    """
+    Read and join the station and gridMET time series of a single climate 
+    station once and calculate monthly sums and day counts of all variables
+    with a single grouped reduction, used by :func:`calc_bias_ratios` 
+    possibly in a worker process. Days missing either variable of a pair 
+    are masked for that pair.
+
+    If ``cache_dir`` is given monthly sums stored by a previous run are 
+    reused for variables whose station and gridMET files have not changed
+    since (same size and modification time), only variables that are not
+    stored are calculated from the time series files and added to the 
+    stored sums. If either file changed the station is recalculated.
+    
+    Arguments:
+        row_df (:class:`pandas.DataFrame`): single row of the input table 
+            with station and gridMET metadata and time series file paths.
+        var_pairs (list): list of (gridMET variable, station variable) 
+            name tuples.
+
+    Keyword Arguments:
+        cache_dir (str): default None. Directory to store and reuse monthly
+            sums of the station.
+
+    Returns:
+        None if the station time series file was not found or has none of
+        the variables, otherwise a
+        :class:`pandas.DataFrame` indexed by year and month with columns
+        ("station_[var]", "sum"), ("station_[var]", "count"), 
+        ("gridmet_[var]", "sum"), and ("gridmet_[var]", "count") for each 
+        gridMET variable. Variables missing from the station file are left 
+        out.
+
+    Raises:
+        KeyError: if the only station variable is not found in the 
+            station file.
+        Exception: errors raised by :mod:`pandas` when reading a station 
+            or gridMET time series file that exists but can not be parsed.
+    """
+    row = row_df.iloc[0]
+    all_pairs = var_pairs
+    if cache_dir:
+        fingerprints = _input_fingerprints(row)
+        cached, meta = _read_monthly_sums(cache_dir, row.STATION_ID)
+        if cached is None or meta.get('files') != fingerprints:
+            cached = None
+            meta = {'files': fingerprints, 'vars': {}, 'missing': []}
+        # only calculate variables that are not stored 
+        var_pairs = [(g, s) for g, s in all_pairs if meta['vars'].get(g) != s]
+        if not var_pairs:
+            print('\nUsing stored monthly sums for station:', row.STATION_ID)
+            return _select_vars(cached, all_pairs, meta)
+    # load station and gridMET time series files, files that exist but 
+    # can not be parsed raise so they are not mistaken for missing files
+    try:
+        # if time series not from PyWeatherQaQc, CSV with 'date' column
+        if not row.STATION_FILE_PATH.endswith('.xlsx'):
+            station_df = pd.read_csv(row.STATION_FILE_PATH,parse_dates=True,
+                            index_col='date')
+        # if excel file, assume PyWeatherQaQc format
+        else:
+            try:
+                station_df = pd.read_excel(row.STATION_FILE_PATH,
+                                sheet_name='Corrected Data')
+            except (ValueError, KeyError):
+                print('Time series file for station: ', row.STATION_ID,
+                      'has no "Corrected Data" sheet, skipping.')
+                return
+    except FileNotFoundError:
+        print('Time series file for station: ', row.STATION_ID, 
+              'was not found, skipping.')
+        return
+
+    computed = [g for g, _ in var_pairs]
+    var_pairs = _station_var_pairs(
+        station_df, var_pairs, row.STATION_FILE_PATH, 
+        single=len(all_pairs) == 1
+    )
+    missing = [g for g in computed if not g in dict(var_pairs)]
+    if not var_pairs and cache_dir and cached is not None:
+        # remember the missing variables and use the stored sums
+        print('\nUsing stored monthly sums for station:', row.STATION_ID)
+        meta['vars'].update({g: s for g, s in all_pairs if g in computed})
+        meta['missing'] = [g for g in meta['missing'] if not g in computed]\
+            + missing
+        _write_monthly_sums(cache_dir, row.STATION_ID, cached, meta)
+        return _select_vars(cached, all_pairs, meta)
+    if not var_pairs:
+        print('Time series file for station: ', row.STATION_ID,
+              'has none of the requested variables, skipping.')
+        return
+    print(
+         '\nCalculating {v} bias ratios for station:'.format(
+             v=', '.join(g for g, _ in var_pairs)),
+         row.STATION_ID
+         )
+    gridmet_df = pd.read_csv(row.GRIDMET_FILE_PATH, parse_dates=True, 
+                             index_col='date')
+    monthly = _monthly_sums(station_df, gridmet_df, var_pairs)
+
+    if cache_dir:
+        # add new variables to stored sums, months only in one are empty
+        if cached is not None:
+            cached = cached[[c for c in cached.columns if 
+                not c[0].split('_', 1)[1] in computed]]
+            monthly = pd.concat([cached, monthly], axis=1, sort=True).fillna(0)
+            counts = [c for c in monthly.columns if c[1] == 'count']
+            monthly[counts] = monthly[counts].astype(int)
+        meta['vars'].update({g: s for g, s in all_pairs if g in computed})
+        meta['missing'] = [g for g in meta['missing'] if not g in computed]\
+            + missing
+        _write_monthly_sums(cache_dir, row.STATION_ID, monthly, meta)
+        return _select_vars(monthly, all_pairs, meta)
+
+    return monthly
+
+def _daily_index(df):
+    """
+    Helper function to index a daily time series by dates as datetime64
+    values at midnight for joining. Dates are taken from a "date" column,
+    the index, or "year", "month", and "day" columns, in that order, e.g.
+    for PyWeatherQaQc workbooks that are read without a date index.
+    """
+    if 'date' in df.columns:
+        dates = pd.to_datetime(df['date'])
+        df = df.drop(columns='date')
+    elif isinstance(df.index, pd.DatetimeIndex):
+        dates = df.index
+    elif {'year', 'month', 'day'}.issubset(df.columns) and \
+            pd.api.types.is_integer_dtype(df.index):
+        dates = pd.to_datetime(df[['year', 'month', 'day']])
+    else:
+        dates = pd.to_datetime(df.index)
+    dates = pd.DatetimeIndex(dates).normalize().rename('date')
+
+    return df.set_axis(dates, axis=0)
+
+def _monthly_sums(station_df, gridmet_df, var_pairs):
+    """
+    Join station and gridMET time series of a station and calculate 
+    monthly sums and day counts of each pair of variables with a single
+    grouped reduction. Days missing either variable of a pair are masked
+    for that pair.
+
+    Arguments:
+        station_df (:class:`pandas.DataFrame`): daily station time series
+            indexed by date or with dates in columns, see 
+            :func:`_daily_index`.
+        gridmet_df (:class:`pandas.DataFrame`): daily gridMET time series 
+            indexed by date.
+        var_pairs (list): list of (gridMET variable, station variable) 
+            name tuples, all in the time series.
+
+    Returns:
+        :class:`pandas.DataFrame` of monthly sums and day counts, see 
+        :func:`_station_monthly_sums`.
+    """
+    station_df = _daily_index(station_df)
+    gridmet_df = _daily_index(gridmet_df)
+    # align gridMET to station days on datetime64 dates once for all vars
+    result = station_df[list(dict.fromkeys(s for _, s in var_pairs))].copy()
+    gridmet_vars = list(dict.fromkeys(g for g, _ in var_pairs))
+    gridmet_df = gridmet_df.loc[
+        ~gridmet_df.index.duplicated(keep='last'), gridmet_vars
+    ].reindex(result.index)
+    for var in gridmet_vars:
+        result['gridmet_'+var] = gridmet_df[var].values
+    # mask days missing either variable of each pair, drop empty days
+    paired = pd.DataFrame(index=result.index)
+    for gridmet_var, station_var in var_pairs:
+        valid = result[station_var].notnull() &\
+            result['gridmet_'+gridmet_var].notnull()
+        paired['station_'+gridmet_var] = result[station_var].where(valid)
+        paired['gridmet_'+gridmet_var] = result['gridmet_'+gridmet_var].\
+            where(valid)
+    paired.dropna(how='all', inplace=True)
+
+    # monthly sums and day counts for each year of all variables
+    monthly = paired.groupby([paired.index.year, paired.index.month])\
+            .agg(['sum','count'])
+    monthly.index.set_names(['year', 'month'], inplace=True)
+
+    return monthly
+
+def _select_vars(monthly, var_pairs, meta):
+    """
+    Helper function to select the columns of variables in ``var_pairs``
+    from stored monthly sums of a station, skipping variables that were 
+    missing from the station file.
+    """
+    gridmet_vars = [g for g, _ in var_pairs if not g in meta['missing']]
+    cols = [c for c in monthly.columns if 
+            c[0].split('_', 1)[1] in gridmet_vars]
+    return monthly[cols]
+
+def _masked_std(values, mask, axis):
+    """
+    Helper function to calculate the population standard deviation of 
+    ``values`` where ``mask`` is True along ``axis``, as :func:`numpy.std`
+    of the masked values, i.e. NaN if any of them are NaN or none exist.
+    """
+    n = mask.sum(axis=axis)
+    mean = np.where(mask, values, 0).sum(axis=axis) / n
+    dev = np.where(mask, values - np.expand_dims(mean, axis), 0)
+
+    return np.sqrt((dev ** 2).sum(axis=axis) / n)
+
+# ignore np runtime warnings due to calcs with nans, div by 0
+@np.errstate(divide='ignore', invalid='ignore')
+def _panel_stats(station_sums, gridmet_sums, counts, years, day_limit):
+    """
+    Calculate bias ratio statistics for all stations at once from dense 
+    arrays of monthly sums and day counts with shape (station, year, month).
+    
+    Arguments:
+        station_sums (:class:`numpy.ndarray`): monthly sums of the station
+            variable.
+        gridmet_sums (:class:`numpy.ndarray`): monthly sums of the gridMET
+            variable.
+        counts (:class:`numpy.ndarray`): number of paired days in month.
+        years (:class:`numpy.ndarray`): year of each index along axis 1.
+        day_limit (int): months with fewer days of data are excluded.
+
+    Returns:
+        :class:`pandas.DataFrame` with one row per station and columns of 
+        mean monthly ratios, day counts, standard deviation, and coefficient
+        of variation for each month, followed by the same for the growing
+        season, summer, and annual periods, and start and end years. Values
+        are rounded to three decimals.
+    """
+    n_stations = station_sums.shape[0]
+    valid = (counts >= day_limit) & (counts > 0)
+    # ratio of monthly sums for each year
+    ratio = np.where(valid, station_sums / gridmet_sums, np.nan)
+    # means skip undefined (0/0) ratios whereas stdev includes them
+    has_ratio = valid & ~np.isnan(ratio)
+    n_valid = valid.sum(axis=1)
+
+    # mean of monthly ratios of all years, day counts, stdev, cv
+    month_mean = np.where(has_ratio, ratio, 0).sum(axis=1) /\
+        has_ratio.sum(axis=1)
+    month_count = np.where(valid, counts, 0).sum(axis=1).astype(float)
+    month_count[n_valid == 0] = np.nan
+    month_std = _masked_std(ratio, valid, axis=1)
+
+    # ratio of sums for periods and stdev of their monthly ratios
+    period_stats = {}
+    for name, months in _PERIODS:
+        in_period = valid & np.isin(np.arange(1,13), months)
+        mean = np.where(in_period, station_sums, 0).sum(axis=(1,2)) /\
+            np.where(in_period, gridmet_sums, 0).sum(axis=(1,2))
+        count = np.where(in_period, counts, 0).sum(axis=(1,2))
+        std = _masked_std(
+            ratio.reshape(n_stations, -1), 
+            in_period.reshape(n_stations, -1), 
+            axis=1
+        )
+        period_stats[name] = (mean, count, std)
+
+    # start and end years for interpreting annual CV, stdev...
+    has_year = valid.any(axis=2)
+    year_grid = np.broadcast_to(years.astype(float), has_year.shape)
+    start = year_grid.min(axis=1, where=has_year, initial=np.inf)
+    end = year_grid.max(axis=1, where=has_year, initial=-np.inf)
+    start = np.where(np.isinf(start), np.nan, start)
+    end = np.where(np.isinf(end), np.nan, end)
+
+    return _stats_table(
+        month_mean, month_count, month_std, period_stats, start, end
+    )
+
+# ignore np runtime warnings due to calcs with nans, div by 0
+@np.errstate(divide='ignore', invalid='ignore')
+def _window_stats(station_sums, gridmet_sums, counts, years, bounds, 
+        day_limit):
+    """
+    Calculate bias ratio statistics for all stations and multiple year 
+    windows at once. Sums needed for each statistic are accumulated along 
+    the year axis once so that each window is the difference of two 
+    cumulative sums, regardless of its length. 
+    
+    Arguments:
+        station_sums (:class:`numpy.ndarray`): monthly sums of the station
+            variable with shape (station, year, month).
+        gridmet_sums (:class:`numpy.ndarray`): monthly sums of the gridMET
+            variable.
+        counts (:class:`numpy.ndarray`): number of paired days in month.
+        years (:class:`numpy.ndarray`): year of each index along axis 1.
+        bounds (list): list of (start, end) index tuples along the year 
+            axis for each window, end is exclusive.
+        day_limit (int): months with fewer days of data are excluded.
+
+    Returns:
+        :class:`pandas.DataFrame` with the same columns as 
+        :func:`_panel_stats` and one row per window and station, ordered
+        by window.
+    """
+    n_stations, n_years, _ = station_sums.shape
+    valid = (counts >= day_limit) & (counts > 0)
+    ratio = np.where(valid, station_sums / gridmet_sums, np.nan)
+    finite = valid & np.isfinite(ratio)
+    # center ratios on station means so that variances from sums of 
+    # squares are not affected by cancellation
+    center = np.where(finite, ratio, 0).sum(axis=(1,2)) / finite.sum(axis=(1,2))
+    center = np.where(np.isfinite(center), center, 0)
+    dev = np.where(finite, ratio - center[:, None, None], 0)
+    # cumulative sums along years with a leading zero year
+    cum = {}
+    for name, values in (
+            ('valid', valid),
+            ('finite', finite),
+            ('nan', valid & np.isnan(ratio)),
+            ('pos_inf', valid & np.isposinf(ratio)),
+            ('neg_inf', valid & np.isneginf(ratio)),
+            ('dev', dev),
+            ('dev_sq', dev ** 2),
+            ('count', np.where(valid, counts, 0)),
+            ('station', np.where(valid, station_sums, 0)),
+            ('gridmet', np.where(valid, gridmet_sums, 0))):
+        cum[name] = np.concatenate([
+            np.zeros((n_stations, 1, 12)), 
+            np.cumsum(values, axis=1, dtype=float)
+        ], axis=1)
+    # nearest year with data at or after and at or before each year
+    has_year = valid.any(axis=2)
+    idx = np.arange(n_years)
+    next_year = np.minimum.accumulate(
+        np.where(has_year, idx, n_years)[:, ::-1], axis=1)[:, ::-1]
+    prev_year = np.maximum.accumulate(np.where(has_year, idx, -1), axis=1)
+
+    def _mean_std(w, center):
+        """mean and stdev of ratios from window sums like pandas/numpy"""
+        mean = center + w['dev'] / w['finite']
+        mean = np.where(w['pos_inf'] > 0, np.inf, mean)
+        mean = np.where(w['neg_inf'] > 0, -np.inf, mean)
+        mean = np.where((w['pos_inf'] > 0) & (w['neg_inf'] > 0), np.nan, mean)
+        var = w['dev_sq'] / w['valid'] - (w['dev'] / w['valid']) ** 2
+        std = np.sqrt(np.maximum(var, 0))
+        bad = w['nan'] + w['pos_inf'] + w['neg_inf']
+        std = np.where(bad > 0, np.nan, std)
+        return mean, std
+
+    tables = []
+    for start, end in bounds:
+        w = {name: values[:, end] - values[:, start] for name, values in 
+            cum.items()}
+        # monthly statistics
+        month_mean, month_std = _mean_std(w, center[:, None])
+        month_count = np.where(w['valid'] > 0, w['count'], np.nan)
+        # statistics of growing season, summer, annual periods
+        period_stats = {}
+        for name, months in _PERIODS:
+            p = {k: v[:, np.array(months) - 1].sum(axis=1) for k, v in 
+                w.items()}
+            _, p_std = _mean_std(p, center)
+            period_stats[name] = (
+                p['station'] / p['gridmet'], p['count'], p_std
+            )
+        # start and end years with data in window
+        start_year = np.full(n_stations, np.nan)
+        end_year = np.full(n_stations, np.nan)
+        if start < end:
+            first = next_year[:, start]
+            last = prev_year[:, end-1]
+            in_window = first < end
+            start_year[in_window] = years[first[in_window]]
+            end_year[in_window] = years[last[in_window]]
+
+        tables.append(_stats_table(
+            month_mean, month_count, month_std, period_stats, start_year, 
+            end_year
+        ))
+
+    return pd.concat(tables, ignore_index=True)
+
+def _stats_table(month_mean, month_count, month_std, period_stats, 
+        start_year, end_year):
+    """
+    Helper function to arrange monthly and period statistics of stations
+    as columns of a :class:`pandas.DataFrame` in the order of the summary
+    files, values are rounded to three decimals.
+    """
+    month_abbr = list(calendar.month_abbr)[1:]
+    stats = {}
+    for stat, values in (('mean', month_mean), ('count', month_count), 
+            ('stdev', month_std), ('cv', month_std / month_mean)):
+        for i, m in enumerate(month_abbr):
+            stats['{}_{}'.format(m, stat)] = values[:, i]
+    for i, stat in enumerate(('mean', 'count', 'stdev')):
+        for name, _ in _PERIODS:
+            stats['{}_{}'.format(name, stat)] = period_stats[name][i]
+    for name, _ in _PERIODS:
+        mean, _, std = period_stats[name]
+        stats['{}_cv'.format(name)] = std / mean
+    stats['start_year'] = start_year
+    stats['end_year'] = end_year
+
+    return pd.DataFrame(stats).astype(float).round(3)
+
+def _summary_tables(gridmet_var, station_data, day_limit, comp, 
+        windows=None):
+    """
+    Build short and comprehensive summary tables of bias ratios for one 
+    gridMET variable and all stations.
+
+    Arguments:
+        gridmet_var (str): gridMET variable name.
+        station_data (list): list of (input row, monthly sums) tuples for 
+            each station where monthly sums are from 
+            :func:`_station_monthly_sums` indexed by datetime. 
+        day_limit (int): months with fewer days of data are excluded.
+        comp (bool): if True also build the comprehensive summary.
+
+    Keyword Arguments:
+        windows (list): default None. List of (label, start year, end year)
+            tuples from :func:`_parse_windows`, if given statistics are 
+            calculated for each window in long format.
+
+    Returns:
+        tuple of the short summary and the comprehensive summary or 
+        ``comp`` if False, both indexed by STATION_ID, or by STATION_ID 
+        and WINDOW if ``windows`` is given.
+    """
+    # dense (station, year, month) arrays of monthly sums and counts
+    years = np.unique(np.concatenate(
+        [m.index.year.values for _, m in station_data]
+    )).astype(int)
+    shape = (len(station_data), len(years), 12)
+    station_sums = np.zeros(shape)
+    gridmet_sums = np.zeros(shape)
+    counts = np.zeros(shape, dtype=int)
+    for i, (_, monthly) in enumerate(station_data):
+        yi = np.searchsorted(years, monthly.index.year)
+        mi = monthly.index.month - 1
+        station_sums[i, yi, mi] = monthly['station_'+gridmet_var, 'sum']
+        gridmet_sums[i, yi, mi] = monthly['gridmet_'+gridmet_var, 'sum']
+        counts[i, yi, mi] = monthly['gridmet_'+gridmet_var, 'count']
+
+    rows = pd.concat([r for r, _ in station_data], sort=False)
+    if windows is None:
+        stats = _panel_stats(
+            station_sums, gridmet_sums, counts, years, day_limit
+        )
+        stats.index = pd.Index(rows.STATION_ID.values, name='STATION_ID')
+    else:
+        bounds = [
+            (np.searchsorted(years, start), 
+                np.searchsorted(years, end, side='right')) 
+            for _, start, end in windows
+        ]
+        stats = _window_stats(
+            station_sums, gridmet_sums, counts, years, bounds, day_limit
+        )
+        # long format, one row per window and station
+        rows = pd.concat([rows] * len(windows), sort=False)
+        stats.index = pd.MultiIndex.from_arrays([
+                rows.STATION_ID.values, 
+                np.repeat([w[0] for w in windows], len(station_data))
+            ], 
+            names=['STATION_ID', 'WINDOW']
+        )
+
+    out = stats.drop(
+        [c for c in stats.columns if c[:3] in calendar.month_abbr[1:] and 
+            not c.endswith('_mean')], axis=1
+    )
+    if not comp:
+        return out, comp
+
+    # comprehensive summary with input metadata of each station
+    comp_out = stats.reset_index(drop=True)
+    comp_out['GRIDMET_ID'] = rows.GRIDMET_ID.values
+    comp_out = pd.concat([
+        comp_out, rows.drop(columns='GRIDMET_ID').reset_index(drop=True)
+        ], axis=1)
+
+    # round numeric columns
+    comp_out = comp_out.round({
+        'LAT': 10,
+        'LON': 10,
+        'ELEV_M': 0,
+        'ELEV_FT': 0,
+        'STATION_LAT': 10,
+        'STATION_LON': 10,
+        'STATION_ELEV_M': 0
+    })
+
+    # check if day counts for non-monthly periods are too low, if assign na
+    thresholds = (
+        ('summer', 35, 'days in summer period'),
+        ('growseason', 65, 'days in growing season'),
+        ('annual', 125, 'days in annual period')
+    )
+    for period, thresh, msg in thresholds:
+        low = (comp_out['{}_count'.format(period)] < thresh).values
+        for station in stats.index[low]:
+            print('WARNING: less than:', thresh, msg,
+                 '\nfor station:', station if windows is None else 
+                 '{} in {}'.format(*station), 'assigning -999 for all stats')
+        cols = [col for col in comp_out.columns if 
+                '{}_'.format(period) in col and '_count' not in col]
+        comp_out.loc[low, cols] = np.nan
+
+    comp_out.set_index('STATION_ID', inplace=True)
+    comp_out.index = stats.index
+
+    return out, comp_out
+
+def _year_range(years):
+    """
+    Helper function to parse a single year or range of years, e.g. 2015 or
+    '2000-2010', as a tuple of the first and last year.
+
+    Raises:
+        ValueError: if ``years`` is not a single year or range of years.
+    """
+    try:
+        bounds = [int(y) for y in str(years).split('-')]
+        if not len(bounds) in (1, 2):
+            raise ValueError
+    except ValueError:
+        raise ValueError('{} is not a valid years option,\n'.format(years)+\
+            'use single or range e.g. 2015 or 2000-2010')
+    return bounds[0], bounds[-1]
+
+def _parse_windows(windows, rolling, years, data_years):
+    """
+    Helper function to get a list of (label, first year, last year) tuples
+    from the ``windows`` or ``rolling`` arguments of 
+    :func:`calc_bias_ratios`. Labels are formatted like the year suffix of
+    summary files, e.g. '2000_2009'. Rolling windows are every ``rolling``
+    consecutive years within ``years`` or within ``data_years`` if 
+    ``years`` is 'all'.
+
+    Raises:
+        ValueError: if a window is not a single year or range of years or 
+            no rolling window fits within the years.
+    """
+    if rolling:
+        rolling = int(rolling)
+        if years == 'all':
+            first, last = min(data_years), max(data_years)
+        else:
+            first, last = _year_range(years)
+        windows = [(y, y + rolling - 1) for y in 
+            range(first, last - rolling + 2)]
+        if not windows:
+            raise ValueError('No {} year windows within {} to {}'.format(
+                rolling, first, last))
+    else:
+        if isinstance(windows, str):
+            windows = windows.split(',')
+        windows = [_year_range(w) for w in windows]
+
+    return [
+        (str(start) if start == end else '{}_{}'.format(start, end), 
+            start, end) for start, end in windows
+    ]
+
+def _parse_gridmet_ids(gridmet_ID):
+    """
+    Helper function to get a list of integer gridMET IDs from the 
+    ``gridmet_ID`` argument of :func:`calc_bias_ratios` which may be a 
+    single ID, comma separated IDs, or a list of IDs.
+    """
+    if isinstance(gridmet_ID, str):
+        gridmet_ID = gridmet_ID.split(',')
+    elif not isinstance(gridmet_ID, (list, tuple, set, np.ndarray, pd.Series)):
+        gridmet_ID = [gridmet_ID]
+
+    return list(dict.fromkeys(int(g) for g in gridmet_ID))
+
+def _parse_var_pairs(gridmet_var, station_var=None):
+    """
+    Helper function to get a list of (gridMET variable, station variable)
+    name pairs from the ``gridmet_var`` and ``station_var`` arguments of 
+    :func:`calc_bias_ratios`. Station variables that are not given are 
+    looked up in :attr:`GRIDMET_STATION_VARS`.
+
+    Raises:
+        KeyError: if a gridMET variable is not in :attr:`GRIDMET_STATION_VARS`.
+        ValueError: if the number of station variables does not match the 
+            number of gridMET variables.
+    """
+    if gridmet_var == 'all':
+        gridmet_vars = list(GRIDMET_STATION_VARS.keys())
+    elif isinstance(gridmet_var, str):
+        gridmet_vars = gridmet_var.split(',')
+    else:
+        gridmet_vars = list(gridmet_var)
+
+    for var in gridmet_vars:
+        if not GRIDMET_STATION_VARS.get(var, None):
+            print(
+                'Valid gridMET variable names:\n',
+                '\n'.join([i for i in GRIDMET_STATION_VARS.keys()]),
+                '\n'
+            )
+            err_msg = 'Invalid gridMET variable name {}'.format(var)
+            raise KeyError(err_msg)
+
+    # get matching station variable names
+    if not station_var:
+        station_vars = [GRIDMET_STATION_VARS.get(v) for v in gridmet_vars]
+    elif isinstance(station_var, str):
+        # comma separated from command line if multiple gridMET variables
+        if len(gridmet_vars) > 1:
+            station_vars = station_var.split(',')
+        else:
+            station_vars = [station_var]
+    else:
+        station_vars = list(station_var)
+    if len(station_vars) != len(gridmet_vars):
+        raise ValueError('Give one station variable for each gridMET '+\
+            'variable or none to use defaults')
+
+    return list(zip(gridmet_vars, station_vars))
+
+def _bias_ratio_tables(station_sums, var_pairs, day_limit, years, comp,
+        windows, rolling):
+    """
+    Apply year filters to monthly sums of all stations and build summary
+    tables of each gridMET variable, shared by :func:`calc_bias_ratios` 
+    and :func:`calc_bias_ratio_tables`.
+
+    Arguments:
+        station_sums (list): list of (input row, monthly sums) tuples of
+            each station in input order, monthly sums are from 
+            :func:`_monthly_sums` or None if the station was skipped.
+        var_pairs (list): list of (gridMET variable, station variable) 
+            name tuples.
+        day_limit (int): months with fewer days of data are excluded.
+        years (int or str): years to use for calculations.
+        comp (bool): if True also build comprehensive summaries.
+        windows (list or str): year windows or None.
+        rolling (int): length of rolling year windows or None.
+
+    Returns:
+        tuple of a dictionary with gridMET variable names as keys and 
+        tuples of short and comprehensive summaries from 
+        :func:`_summary_tables` as values, and the string of years used.
+    """
+    # monthly sums of each variable and station in input order
+    station_data = {g: [] for g, _ in var_pairs}
+    years_str = None
+    for row_df, monthly in station_sums:
+        if monthly is None:
+            continue
+        monthly = monthly.copy()
+        monthly.index = pd.to_datetime(pd.DataFrame({
+            'year': monthly.index.get_level_values('year'),
+            'month': monthly.index.get_level_values('month'),
+            'day': 1
+        }))
+        # apply year filter to monthly sums, windows are applied later
+        if windows is None and not rolling:
+            monthly, years_str = parse_yr_filter(
+                monthly, years, row_df.STATION_ID.iloc[0]
+            )
+        for var in station_data:
+            if ('station_'+var, 'sum') in monthly.columns:
+                station_data[var].append((row_df, monthly))
+
+    window_list = None
+    if windows is not None or rolling:
+        data_years = [
+            y for data in station_data.values() for _, monthly in data 
+                for y in monthly.index.year.unique()
+        ]
+        window_list = _parse_windows(
+            windows, rolling, years, data_years) if data_years else []
+        if rolling:
+            years_str = 'rolling_{}yr'.format(int(rolling))
+        else:
+            years_str = 'windows'
+
+    # statistics of all stations at once for each variable
+    tables = {}
+    for var, data in station_data.items():
+        if not data:
+            continue
+        tables[var] = _summary_tables(
+            var, data, int(day_limit), comp, windows=window_list
+        )
+
+    return tables, years_str
+
+def calc_bias_ratio_tables(input_df, station_data, gridmet_data, 
+        gridmet_var='etr_mm', station_var=None, day_limit=10, years='all',
+        comp=True, windows=None, rolling=None):
+    """
+    Calculate the same bias ratio statistics as :func:`calc_bias_ratios`
+    from station and gridMET time series that are already in memory, 
+    nothing is read from or written to disk.
+
+    Arguments:
+        input_df (:class:`pandas.DataFrame`): station metadata with at 
+            least STATION_ID and GRIDMET_ID columns, e.g. the input table
+            created by :func:`gridwxcomp.prep_input`. Other columns are 
+            added to the comprehensive summary. 
+        station_data (dict or :class:`pandas.DataFrame`): daily station 
+            time series indexed by date in a dictionary with STATION_ID 
+            keys, or a single DataFrame if ``input_df`` has one station.
+        gridmet_data (dict or :class:`pandas.DataFrame`): daily gridMET 
+            time series indexed by date, like ``station_data``.
+
+    Keyword Arguments:
+        gridmet_var (str or list): default 'etr_mm'. GridMET variable(s), 
+            see :func:`calc_bias_ratios`.
+        station_var (str or list): default None. Station variable(s), see 
+            :func:`calc_bias_ratios`.
+        day_limit (int): default 10. Threshold number of days in month
+            of missing data, if less exclude month from calculations.
+        years (int or str): default 'all'. Years to use for calculations
+            e.g. 2000-2005 or 2011.
+        comp (bool): default True. Flag to also build the "comprehensive" 
+            summary with station metadata and statistics.
+        windows (list or str): default None. Year windows to calculate
+            statistics for in long format, see :func:`calc_bias_ratios`.
+        rolling (int): default None. Length in years of rolling windows, 
+            see :func:`calc_bias_ratios`.
+
+    Returns:
+        tables (dict): dictionary with gridMET variable names as keys and 
+            tuples of the short and comprehensive summary 
+            :class:`pandas.DataFrame` objects as values, indexed by 
+            STATION_ID (and WINDOW). The comprehensive summary is False if
+            ``comp`` is False. Stations missing from ``station_data`` or
+            ``gridmet_data`` are skipped.
+
+    Example:
+        With a dictionary of station and gridMET time series keyed by 
+        STATION_ID, e.g. loaded from a database,
+
+        >>> from gridwxcomp.calc_bias_ratios import calc_bias_ratio_tables
+        >>> tables = calc_bias_ratio_tables(
+        >>>     input_df, station_data, gridmet_data, gridmet_var='eto_mm')
+        >>> summary, comp_summary = tables['eto_mm']
+
+    Raises:
+        KeyError: if a single station variable is not found in the 
+            station time series or ``gridmet_var`` is invalid.
+        ValueError: if a list of station variables is given that does not
+            match the number of gridMET variables.
+    """
+    var_pairs = _parse_var_pairs(gridmet_var, station_var)
+    if isinstance(station_data, pd.DataFrame):
+        station_data = {input_df.STATION_ID.iloc[0]: station_data}
+    if isinstance(gridmet_data, pd.DataFrame):
+        gridmet_data = {input_df.STATION_ID.iloc[0]: gridmet_data}
+
+    station_sums = []
+    for i in range(len(input_df)):
+        row_df = input_df.iloc[[i]]
+        station_id = row_df.STATION_ID.iloc[0]
+        if not station_id in station_data or not station_id in gridmet_data:
+            print('Time series for station: ', station_id, 
+                  'was not found, skipping.')
+            continue
+        station_df = station_data[station_id]
+        pairs = _station_var_pairs(
+            station_df, var_pairs, 'station: {}'.format(station_id)
+        )
+        if not pairs:
+            print('Time series for station: ', station_id,
+                  'has none of the requested variables, skipping.')
+            continue
+        station_sums.append((row_df, 
+            _monthly_sums(station_df, gridmet_data[station_id], pairs)))
+
+    tables, _ = _bias_ratio_tables(
+        station_sums, var_pairs, day_limit, years, comp, windows, rolling
+    )
+
+    return tables
+
+def _station_var_pairs(station_df, var_pairs, source, single=None):
+    """
+    Helper function to get variable pairs whose station variable is in
+    the station time series, warns for those that are not found or raises
+    a KeyError if it is the only variable requested (``single``, default
+    if ``var_pairs`` has one pair). ``source`` describes the time series 
+    in messages.
+    """
+    if single is None:
+        single = len(var_pairs) == 1
+    for gridmet_var, station_var in var_pairs:
+        if not station_var in station_df.columns:
+            err_msg = '{v} not found in the station file: \n{p}'.\
+                           format(v=station_var, p=source)
+            if single:
+                raise KeyError(err_msg)
+            print('WARNING:', err_msg, '\nskipping', gridmet_var)
+
+    return [(g, s) for g, s in var_pairs if s in station_df.columns]
+
 def calc_bias_ratios(input_path, out_dir, gridmet_var='etr_mm', 
              station_var=None, gridmet_ID=None, day_limit=10, years='all',
-             comp=True):
+             comp=True, workers=1, cache_dir=None, windows=None, rolling=None,
+             checkpoint=None):
     """
     Read input CSV file and calculate mean monthly bias ratios between
     station to corresponding gridMET cells for all station and gridMET 
@@ -253,14 +1212,21 @@ def calc_bias_ratios(input_path, out_dir, gridmet_var='etr_mm',
             monthly bias ratios of etr.
             
     Keyword Arguments:
-        gridmet_var (str): default 'etr_mm'. GridMET climate variable
-            to calculate bias ratios.
-        station_var (str): default None. Climate station variable to use
-            to calculate bias ratios. If None, look up using ``gridmet_var`` 
-            as a key to :attr:`GRIDMET_STATION_VARS` dictionary found as a 
-            module attribute to :mod:`gridwxcomp.calc_bias_ratios`.
-        gridmet_ID (int): default None. GridMET ID (index) to only calculate 
-            bias ratios for a single gridMET cell.
+        gridmet_var (str or list): default 'etr_mm'. GridMET climate variable
+            to calculate bias ratios, list of variables, or 'all' for all 
+            variables in :attr:`GRIDMET_STATION_VARS`. Each station is read
+            once for all variables and one pair of summary files is saved 
+            for each variable.
+        station_var (str or list): default None. Climate station variable 
+            to use to calculate bias ratios, or list matching ``gridmet_var``.
+            If None, look up using ``gridmet_var`` as a key to 
+            :attr:`GRIDMET_STATION_VARS` dictionary found as a module 
+            attribute to :mod:`gridwxcomp.calc_bias_ratios`.
+        gridmet_ID (int or list): default None. GridMET ID (index) to only 
+            calculate bias ratios for a single gridMET cell, or list or 
+            comma separated string of IDs to calculate a batch of cells at 
+            once. Stations are looked up by GRIDMET_ID without scanning 
+            the input table and summary files are saved for each cell.
         day_limit (int): default 10. Threshold number of days in month
             of missing data, if less exclude month from calculations.
         years (int or str): default 'all'. Years to use for calculations
@@ -268,6 +1234,31 @@ def calc_bias_ratios(input_path, out_dir, gridmet_var='etr_mm',
         comp (bool): default True. Flag to save a "comprehensive" 
             summary output CSV file that contains station metadata and 
             statistics in addition to the mean monthly ratios.
+        workers (int): default 1. Number of processes used to calculate
+            ratios for stations in parallel. Results are gathered in the 
+            order of the input file so output files are the same as a 
+            serial run.
+        cache_dir (str): default None. Directory to store the monthly sums
+            and day counts of each station as "[STATION_ID]_monthly_sums.csv"
+            along with the size and modification time of its time series 
+            files. Later runs only read time series files of stations and
+            variables that were changed or not yet stored.
+        windows (list or str): default None. List of years or year ranges,
+            or comma separated string of them, e.g. '1980-1989,1990-1999'.
+            If given, statistics are calculated for each window from one 
+            read of the data and saved in long format with a WINDOW column
+            to files with the suffix "windows", ``years`` is not used.
+        rolling (int): default None. Length in years of rolling windows, 
+            e.g. 10 for every 10 consecutive years within ``years`` or 
+            within all years with data. Saved like ``windows`` to files 
+            with the suffix "rolling_[N]yr".
+        checkpoint (str): default None. Path to a checkpoint journal (JSON
+            lines) to resume long runs. Each station is appended with its 
+            time series file fingerprints, status, and monthly sums when 
+            it finishes, a station that fails is recorded and skipped 
+            instead of stopping the run. When the journal exists, stations
+            that are done with unchanged files and the same variables are 
+            not recalculated, failed and changed stations are.
                     
     Returns:
         None
@@ -291,6 +1282,32 @@ def calc_bias_ratios(input_path, out_dir, gridmet_var='etr_mm',
         This results in two CSV files in ``out_dir`` named 
         "prcp_mm_summary_all_yrs.csv" and "prcp_mm_summary_comp_all_yrs.csv". 
 
+        To calculate ratios of all variables in :attr:`GRIDMET_STATION_VARS`
+        while reading each station and gridMET time series only once,
+
+        >>> calc_bias_ratios(input_path, out_dir, gridmet_var='all')
+
+        Variables that are missing from a station file are skipped for 
+        that station.
+
+        To recalculate ratios quickly after new data is added for some
+        stations, store monthly sums in a directory, the first run reads
+        all time series files and later runs only those that changed,
+
+        >>> calc_bias_ratios(input_path, out_dir, cache_dir='monthly_sums')
+
+        To calculate ratios for every 10 year window from 1980 to 2019 in 
+        one pass, saved to "etr_mm_summary_rolling_10yr.csv" with one row 
+        per station and window,
+
+        >>> calc_bias_ratios(input_path, out_dir, years='1980-2019', 
+        >>>     rolling=10)
+
+        To resume a long run after a crash from where it stopped, give the
+        same checkpoint journal to both runs,
+
+        >>> calc_bias_ratios(input_path, out_dir, checkpoint='ratios.jsonl')
+
     Raises:
         FileNotFoundError: if input file is invalid or not found.
         KeyError: if the input file does not contain file paths to
@@ -299,6 +1316,8 @@ def calc_bias_ratios(input_path, out_dir, gridmet_var='etr_mm',
             the :mod:`gridwxcomp.download_gridmet_ee` scripts have not been 
             run first. Also raised if the given ``gridmet_var`` or 
             ``station_var`` kwargs are invalid.
+        ValueError: if a list of station variables is given that does not
+            match the number of gridMET variables.
     
     Note:
         If an existing summary file contains a climate station that is being 
@@ -314,20 +1333,7 @@ def calc_bias_ratios(input_path, out_dir, gridmet_var='etr_mm',
         variable names need to be explicitly passed as function arguments. 
         
     """
-    # ignore np runtime warnings due to calcs with nans, div by 0
-    np.seterr(divide='ignore', invalid='ignore')
-    # specific for standard deviation of nans
-    std_warning = "Degrees of freedom <= 0 for slice"
-    warnings.filterwarnings("ignore", message=std_warning)
-
-    if not GRIDMET_STATION_VARS.get(gridmet_var, None):
-        print(
-            'Valid gridMET variable names:\n',
-            '\n'.join([i for i in GRIDMET_STATION_VARS.keys()]),
-            '\n'
-        )
-        err_msg = 'Invalid gridMET variable name {}'.format(gridmet_var)
-        raise KeyError(err_msg)
+    var_pairs = _parse_var_pairs(gridmet_var, station_var)
 
     if not os.path.isdir(out_dir):
         print('{} does not exist, creating directory'.format(out_dir))
@@ -336,242 +1342,89 @@ def calc_bias_ratios(input_path, out_dir, gridmet_var='etr_mm',
         raise FileNotFoundError('Input CSV file given was invalid or not found')
 
     input_df = pd.read_csv(input_path)
-    # get matching station variable name
-    if not station_var:
-        station_var = GRIDMET_STATION_VARS.get(gridmet_var)
-    # If only calculating ratios for a single cell, change console message
+    # day limit may be a string from the command line
+    day_limit = int(day_limit)
+    # If only calculating ratios for some cells, change console message
     if gridmet_ID:
-        single_gridmet_cell_msg = \
-            'For gridmet cell ID: {g}\n'.format(g=gridmet_ID)
+        gridmet_IDs = _parse_gridmet_ids(gridmet_ID)
+        single_gridmet_cell_msg = 'For gridmet cell ID: {g}\n'.format(
+            g=', '.join(str(g) for g in gridmet_IDs))
     else:
         single_gridmet_cell_msg = ''
     print(
-        'Calculating bias ratios between climate station variable: ',
-        station_var,
+        'Calculating bias ratios between climate station variable(s): ',
+        ', '.join(s for _, s in var_pairs),
         '\n',
-        'and gridMET climate variable: ',
-        gridmet_var,
+        'and gridMET climate variable(s): ',
+        ', '.join(g for g, _ in var_pairs),
         '\n{g}'.format(g=single_gridmet_cell_msg)
     )
-    # loop through each station and calculate monthly ratio
-    for index, row in input_df.iterrows():
-        if not 'STATION_FILE_PATH' in row or not 'GRIDMET_FILE_PATH' in row:
-            raise KeyError('Missing station and/or gridMET file paths in '+\
-                           'input file. Run prep_input.py followed '+\
-                           'by download_gridmet_ee.py first.')
-        # if only doing a single gridMET cell check for matching ID
-        if gridmet_ID and int(gridmet_ID) != row.GRIDMET_ID:
-            continue
-
-        # load station and gridMET time series files
-        try:
-            # if time series not from PyWeatherQaQc, CSV with 'date' column
-            if not row.STATION_FILE_PATH.endswith('.xlsx'):
-                station_df = pd.read_csv(row.STATION_FILE_PATH,parse_dates=True,
-                                index_col='date')
-                station_df.index = station_df.index.date # for joining
-            # if excel file, assume PyWeatherQaQc format
-            else:
-                station_df = pd.read_excel(row.STATION_FILE_PATH,
-                                sheet_name='Corrected Data')
-        except:
-            print('Time series file for station: ', row.STATION_ID, 
-                  'was not found, skipping.')
-            continue
+    if not 'STATION_FILE_PATH' in input_df.columns or not \
+            'GRIDMET_FILE_PATH' in input_df.columns:
+        raise KeyError('Missing station and/or gridMET file paths in '+\
+                       'input file. Run prep_input.py followed '+\
+                       'by download_gridmet_ee.py first.')
+    # rows of stations in the given gridMET cells, in input order
+    if gridmet_ID:
+        cell_rows = input_df.groupby('GRIDMET_ID').indices
+        for g in gridmet_IDs:
+            if not g in cell_rows:
+                print('WARNING: no stations found for gridMET ID:', g)
+        positions = sorted(
+            i for g in gridmet_IDs for i in cell_rows.get(g, [])
+        )
+    else:
+        positions = range(len(input_df))
+    # collect arguments to calc monthly sums of each station
+    tasks = [
+        (input_df.iloc[[i]], var_pairs, cache_dir) for i in positions
+    ]
 
-        if not station_var in station_df.columns:
-            raise KeyError('{v} not found in the station file: \n{p}'.\
-                           format(v=station_var, p=row.STATION_FILE_PATH))
-        print(
-             '\nCalculating {v} bias ratios for station:'.format(v=gridmet_var),
-             row.STATION_ID
-             )
-        gridmet_df = pd.read_csv(row.GRIDMET_FILE_PATH, parse_dates=True, 
-                                 index_col='date')
-        # merge both datasets drop missing days
-        result = pd.concat([station_df[station_var], 
-                            gridmet_df[gridmet_var]], axis=1, 
-                           join_axes=[station_df.index])
-        result.dropna(inplace=True)
-        # make datetime index
-        result.index = pd.to_datetime(result.index)
-        # apply year filter
-        result, years_str = parse_yr_filter(result, years, row.STATION_ID)
-    
-        # monthly sums and day counts for each year
-        result = result.groupby([result.index.year, result.index.month])\
-                .agg(['sum','count'])
-        result.index.set_names(['year', 'month'], inplace=True)
-        # remove totals with less than XX days
-        result = result[result[gridmet_var,'count']>=day_limit]
-        # calc mean growing season and June to August ratios with month sums
-        grow_season = result.loc[
-            result.index.get_level_values('month').isin([4,5,6,7,8,9]),\
-                    (station_var)]['sum'].sum() / result.loc[
-                result.index.get_level_values('month').isin([4,5,6,7,8,9]),\
-                        (gridmet_var)]['sum'].sum()
-        june_to_aug = result.loc[
-            result.index.get_level_values('month').isin([6,7,8]), (station_var)
-            ]['sum'].sum() / result.loc[result.index.get_level_values('month')\
-                    .isin([6,7,8]), (gridmet_var)]['sum'].sum()
-        ann_months = list(range(1,13))
-        annual = result.loc[
-            result.index.get_level_values('month').isin(ann_months),\
-                    (station_var)]['sum'].sum() / result.loc[
-                result.index.get_level_values('month').isin(ann_months),\
-                        (gridmet_var)]['sum'].sum()
-        
-        ratio = pd.DataFrame(columns = ['ratio', 'count'])
-        # ratio of monthly sums for each year
-        ratio['ratio'] = (result[station_var,'sum'])/(result[gridmet_var,'sum'])
-        # monthly counts and stddev
-        ratio['count'] = result.loc[:,(gridmet_var,'count')]
-
-        # rebuild Index DateTime
-        ratio['year'] = ratio.index.get_level_values(0).values.astype(int)
-        ratio['month'] = ratio.index.get_level_values(1).values.astype(int)
-        ratio.index = pd.to_datetime(
-                ratio.year*10000+ratio.month*100+15,format='%Y%m%d'
-                )
-        # useful to know how many years were used in addition to day counts
-        start_year = ratio.year.min()
-        end_year = ratio.year.max()
-        counts = ratio.groupby(ratio.index.month).sum()['count']
-        # get standard deviation of each years' monthly mean ratio
-        stdev = {month: np.std(
-            ratio.loc[ratio.month.isin([month]), 'ratio'].values)
-                 for month in ann_months}
-        stdev = pd.Series(stdev, name='stdev')
-
-        # mean of monthly means of all years, can change to median or other meth
-        final_ratio = ratio.groupby(ratio.index.month).mean()
-        final_ratio.drop(['year', 'month'], axis=1, inplace=True)
-        final_ratio['count'] = counts
-        final_ratio['stdev'] = stdev
-        final_ratio['cv'] = stdev / final_ratio['ratio']
-        # calc mean growing season, June through August, ann stdev
-        grow_season_std = np.std(ratio.loc[ratio.month.isin([4,5,6,7,8,9]),\
-                'ratio'].values)
-        june_to_aug_std = np.std(ratio.loc[ratio.month.isin([6,7,8]),\
-                'ratio'].values)
-        annual_std = np.std(ratio.loc[ratio.month.isin(ann_months),\
-                'ratio'].values)
-        # get month abbreviations in a column and drop index values
-        for m in final_ratio.index:
-            final_ratio.loc[m,'month'] = calendar.month_abbr[m]
-        # restructure as a row with station index
-        months = final_ratio.month.values
-        final_ratio = final_ratio.T
-        final_ratio.columns = months
-        final_ratio.drop('month', inplace=True)
-        # add monthy means and counts into single row dataframe
-        ratio_cols = [c + '_mean' for c in final_ratio.columns]
-        count_cols = [c + '_count' for c in final_ratio.columns]
-        stddev_cols = [c + '_stdev' for c in final_ratio.columns]
-        coef_var_cols = [c + '_cv' for c in final_ratio.columns]
-        # combine all monthly stats
-        out_cols = ratio_cols + count_cols + stddev_cols + coef_var_cols
-        final_ratio = pd.concat([
-            final_ratio.loc['ratio'], 
-            final_ratio.loc['count'],
-            final_ratio.loc['stdev'],
-            final_ratio.loc['cv']
-        ])
-        final_ratio.index = out_cols
-        # transpose so that each station is one row in final output
-        final_ratio = final_ratio.to_frame().T
-        # assign non-monthly stats, growing season, annual, june-aug
-        final_ratio['growseason_mean'] = grow_season
-        final_ratio['summer_mean'] = june_to_aug
-        final_ratio['annual_mean'] = annual
-        # day counts for all years in non monthly periods
-        final_ratio['growseason_count'] =\
-            counts.loc[counts.index.isin([4,5,6,7,8,9])].sum()
-        final_ratio['summer_count'] =\
-            counts.loc[counts.index.isin([6,7,8])].sum()
-        final_ratio['annual_count'] =\
-            counts.loc[counts.index.isin(ann_months)].sum()
-        # assign stdev, coef. var. 
-        final_ratio['growseason_stdev'] = grow_season_std
-        final_ratio['summer_stdev'] = june_to_aug_std
-        final_ratio['annual_stdev'] = annual_std
-        # coefficient of variation
-        final_ratio['growseason_cv'] = grow_season_std / grow_season
-        final_ratio['summer_cv'] = june_to_aug_std / june_to_aug
-        final_ratio['annual_cv'] = annual_std / annual
-        # start and end years for interpreting annual CV, stdev...
-        final_ratio['start_year'] = start_year
-        final_ratio['end_year'] = end_year
-
-        # round numerical data before adding string metadata
-        for v in final_ratio:
-            if '_mean' or '_stdev' or '_cv' in v:
-                final_ratio[v] = final_ratio[v].astype(float).round(3)
-            else:
-                final_ratio[v] = final_ratio[v].astype(float).round(0)
-        # set station ID as index
-        final_ratio['STATION_ID'] = row.STATION_ID
-        final_ratio.set_index('STATION_ID', inplace=True)
-
-        out = final_ratio.copy()
-        out.drop(count_cols+stddev_cols+coef_var_cols, axis=1, inplace=True)
-
-        # save GRIDMET_ID for merging with input table
-        final_ratio['GRIDMET_ID'] = row.GRIDMET_ID    
-        final_ratio = final_ratio.merge(input_df, on='GRIDMET_ID')
-
-        # round numeric columns
-        final_ratio = final_ratio.round({
-            'LAT': 10,
-            'LON': 10,
-            'ELEV_M': 0,
-            'ELEV_FT': 0,
-            'STATION_LAT': 10,
-            'STATION_LON': 10,
-            'STATION_ELEV_M': 0
-        })
-
-        # check if day counts for non-monthly periods are too low, if assign na
-        grow_thresh = 65
-        sum_thresh = 35
-        ann_thresh = 125
-        
-        if final_ratio.at[0,'summer_count'] < sum_thresh:
-            print('WARNING: less than:', sum_thresh, 'days in summer period',
-                 '\nfor station:',row.STATION_ID,'assigning -999 for all stats')
-            cols = [col for col in final_ratio.columns if 
-                    'summer_' in col and '_count' not in col]
-            final_ratio.loc[:,cols] = np.nan
-        
-        if final_ratio.at[0,'growseason_count'] < grow_thresh:
-            print('WARNING: less than:',grow_thresh,'days in growing season',
-                 '\nfor station:',row.STATION_ID,'assigning -999 for all stats')
-            cols = [col for col in final_ratio.columns if 
-                    'growseason_' in col and '_count' not in col]
-            final_ratio.loc[:,cols] = np.nan
-            
-        if final_ratio.at[0,'annual_count'] < ann_thresh:
-            print('WARNING: less than:',ann_thresh,'days in annual period',
-                 '\nfor station:',row.STATION_ID,'assigning -999 for all stats')
-            cols = [col for col in final_ratio.columns if 
-                    'annual_' in col and '_count' not in col]
-            final_ratio.loc[:,cols] = np.nan
-
-        if comp:
-            out['GRIDMET_ID'] = row.GRIDMET_ID
-            out['GRIDMET_ID'] = final_ratio.GRIDMET_ID.unique()
-            # build comprehensive output summary 
-            comp_out = final_ratio
-            comp_out.set_index('STATION_ID', inplace=True)
-
-            # no longer need GRIDMET_ID in short summary 
-            out.drop(columns='GRIDMET_ID', inplace=True)
-        # if comp False
-        else:
-            comp_out = comp
+    # stations are independent, optionally run in parallel processes
+    if not checkpoint:
+        results = map_workers(_station_monthly_sums, tasks, workers=workers)
+    else:
+        # resume stations that finished in a previous run
+        journal = _read_checkpoint(checkpoint)
+        results = [
+            _checkpoint_result(
+                journal.get(str(row_df.STATION_ID.iloc[0])), 
+                row_df.iloc[0], 
+                var_pairs
+            ) for row_df, _, _ in tasks
+        ]
+        remaining = [i for i, r in enumerate(results) if r is None]
+        print('\nResuming from checkpoint: {} of {} stations done'.format(
+            len(tasks) - len(remaining), len(tasks)))
+        remaining_results = map_workers(
+            _checkpoint_monthly_sums, 
+            [tasks[i] + (checkpoint,) for i in remaining], 
+            workers=workers
+        )
+        for i, monthly in zip(remaining, remaining_results):
+            results[i] = monthly
+    tables, years_str = _bias_ratio_tables(
+        [(row_df, monthly) for (row_df, _, _), monthly in zip(tasks, results)],
+        var_pairs, day_limit, years, comp, windows, rolling
+    )
+    station_cells = dict(zip(input_df.STATION_ID, input_df.GRIDMET_ID))
 
-        # save output depending on options
-        _save_output(out, comp_out, out_dir, gridmet_ID, gridmet_var, years_str)
+    # files are written once per variable
+    for var, (out, comp_out) in tables.items():
+        if not gridmet_ID:
+            _save_output(out, comp_out, out_dir, gridmet_ID, var, years_str)
+            continue
+        # save files of each gridMET cell as if it was run alone
+        cells = out.index.get_level_values('STATION_ID').map(station_cells)
+        for g in gridmet_IDs:
+            in_cell = (cells == g)
+            if not in_cell.any():
+                continue
+            _save_output(
+                out[in_cell], 
+                comp_out[in_cell] if comp else comp, 
+                out_dir, g, var, years_str
+            )
 
     print(
         '\nSummary file(s) for bias ratios saved to: \n', 
@@ -603,14 +1456,15 @@ def arg_parse():
         help='Years to use, single or range e.g. 2018 or 1995-2010')
     optional.add_argument(
         '-gv', '--gridmet-var', metavar='', required=False, default='etr_mm',
-        help='GridMET variable name for bias ratio calculation')
+        help='GridMET variable name for bias ratio calculation, comma '+\
+            'separated names, or all')
     optional.add_argument(
         '-sv', '--station-var', metavar='', required=False, default=None,
         help='Station variable name for bias ratio calculation')
     optional.add_argument(
         '-id', '--gridmet-id', metavar='', required=False, default=None,
         help='Optional gridMET ID to calculate bias ratios for a single '+\
-             'gridMET cell')
+             'gridMET cell, or comma separated IDs')
     optional.add_argument('-d', '--day-limit', metavar='', required=False, 
         default=10, help='Number of days of valid data per month to '+\
               'include it in bias correction calculation.')
@@ -618,6 +1472,21 @@ def arg_parse():
         default=True, action='store_false', dest='comprehensive', 
         help='Flag, if given, to NOT save comprehensive summary file with '+\
              'extra metadata and statistics with the suffix "_comp"')
+    optional.add_argument('-j', '--jobs', metavar='', required=False, 
+        default=1, type=int, help='Number of processes to calculate '+\
+            'station ratios in parallel')
+    optional.add_argument('--cache-dir', metavar='PATH', required=False, 
+        default=None, help='Directory to store monthly sums of stations '+\
+            'and reuse them if their time series files have not changed')
+    optional.add_argument('--windows', metavar='', required=False, 
+        default=None, help='Comma separated years or year ranges to '+\
+            'calculate ratios for each, e.g. 1980-1989,1990-1999')
+    optional.add_argument('--rolling', metavar='', required=False, 
+        default=None, type=int, help='Length in years of rolling windows '+\
+            'within years to calculate ratios for each')
+    optional.add_argument('--checkpoint', metavar='PATH', required=False, 
+        default=None, help='Checkpoint journal file to resume a run, '+\
+            'stations that finished are skipped')
 #    parser.add_argument(
 #        '--debug', default=logging.INFO, const=logging.DEBUG,
 #        help='Debug level logging', action="store_const", dest="loglevel")
@@ -631,4 +1500,6 @@ if __name__ == '__main__':
     main(input_file_path=args.input, out_dir=args.out,
          gridmet_var=args.gridmet_var, station_var=args.station_var,
          gridmet_id=args.gridmet_id, day_limit=args.day_limit,
-         years=args.years, comp=args.comprehensive)
+         years=args.years, comp=args.comprehensive, workers=args.jobs,
+         cache_dir=args.cache_dir, windows=args.windows, 
+         rolling=args.rolling, checkpoint=args.checkpoint)
@@ -8,18 +8,51 @@ import argparse
 import logging
 import os
 import sys
+import threading
 import timeit
 import datetime as dt
 from time import sleep
 
 import ee
 import refet
+import numpy as np
 import pandas as pd
 
-# for connection to Earth Engine
-ee.Initialize() 
+from .util import map_workers, CircuitBreaker, TokenBucket
 
-def download_gridmet_ee(input_csv, out_folder, year_filter='', year_update=''): 
+# Earth Engine is initialized on the first download, not on import
+_EE_INITIALIZED = False
+
+def _initialize_ee():
+    """
+    Initialize the Earth Engine API once per process, before the first 
+    request for data. Deferred from import so that importing 
+    :mod:`gridwxcomp` does not require credentials or a network connection.
+    """
+    global _EE_INITIALIZED
+    if not _EE_INITIALIZED:
+        ee.Initialize()
+        _EE_INITIALIZED = True
+
+# maximum number of features returned by a single getInfo request
+_EE_MAX_ELEMENTS = 5000
+
+# List of ee GRIDMET varibles to retrieve
+# https://explorer.earthengine.google.com/#detail/IDAHO_EPSCOR%2FGRIDMET
+_MET_BANDS = ['tmmx', 'tmmn', 'srad', 'vs', 'sph', 'rmin', 'rmax',
+              'pr', 'etr', 'eto']
+
+# Rename GRIDMET variables during ee export
+_MET_NAMES = ['tmax', 'tmin', 'srad_wm2', 'u10_ms', 'q_kgkg', 'rh_min',
+              'rh_max', 'prcp_mm', 'etr_mm', 'eto_mm']
+
+# Specify column order for output .csv Variables:
+_OUTPUT_ORDER = ['date', 'year', 'month', 'day', 'centroid_lat',
+                 'centroid_lon', 'elev_m', 'u2_ms', 'tmin_c', 'tmax_c',
+                 'srad_wm2', 'ea_kpa', 'prcp_mm', 'etr_mm', 'eto_mm']
+
+def download_gridmet_ee(input_csv, out_folder, year_filter='', year_update='',
+        batch=False, workers=1, rate_limit=None, client=None): 
     """
     Download gridMET time series data for multiple climate variables for 
     select gridMET cells as listed in ``input_csv``.
@@ -33,6 +66,22 @@ def download_gridmet_ee(input_csv, out_folder, year_filter='', year_update=''):
             to download.
         year_update (str): default ''. Re-download existing data for year or
             range, YYYY or YYYY-YYYY.
+        batch (bool): default False. If True, extract data for all gridMET 
+            cells with missing data together using ``reduceRegions`` over a
+            FeatureCollection of the cells, each request holds as many 
+            cell-days as the 5000 element limit of Earth Engine allows. 
+            Results are then split into CSV files for each cell. Otherwise
+            each cell is requested separately by year.
+        workers (int): default 1. Number of threads making requests to 
+            Earth Engine, cells are downloaded in parallel or in batch mode
+            the requests of date ranges.
+        rate_limit (float): default None. Maximum requests per second shared
+            by all threads, if None requests are not rate limited. 
+            Regardless, all threads pause together after repeated failed 
+            requests, e.g. when Earth Engine throttles requests.
+        client (module): default None. Earth Engine API to use instead of
+            the ``ee`` package, e.g. a local fake for testing, it is not
+            initialized.
 
     Returns:
         None
@@ -63,9 +112,23 @@ def download_gridmet_ee(input_csv, out_folder, year_filter='', year_update=''):
         >>> from gridwxcomp import download_gridmet_ee
         >>> download_gridmet_ee('merged_input.csv', 'gridmet_data', '2016-2018')
 
+        For many stations, requesting all cells together is much faster 
+        than one cell at a time,
+
+        >>> download_gridmet_ee('merged_input.csv', 'gridmet_data', batch=True)
+
+        Or download 4 cells at a time with at most 2 requests per second,
+
+        >>> download_gridmet_ee('merged_input.csv', 'gridmet_data', 
+        ...     workers=4, rate_limit=2)
+
         Running :func:`download_gridmet_ee` also updates the CSV file
         produced from :mod:`gridwxcomp.prep_input` to include file paths to 
         gridMET time series files that are paired with climate stations. 
+
+    Note:
+        The Earth Engine API is initialized when this function is first 
+        called rather than when :mod:`gridwxcomp` is imported.
     """
     if not os.path.exists(out_folder):
         logging.info('\nCreating output folder: {}'.format(out_folder))
@@ -74,20 +137,6 @@ def download_gridmet_ee(input_csv, out_folder, year_filter='', year_update=''):
     # Input .csv containing GRIDMET_ID, LAT, LON
     input_df = pd.read_csv(input_csv)
 
-    # List of ee GRIDMET varibles to retrieve
-    # https://explorer.earthengine.google.com/#detail/IDAHO_EPSCOR%2FGRIDMET
-    met_bands = ['tmmx', 'tmmn', 'srad', 'vs', 'sph', 'rmin', 'rmax',
-                 'pr', 'etr', 'eto']
-
-    # Rename GRIDMET variables during ee export
-    met_names = ['tmax', 'tmin', 'srad_wm2', 'u10_ms', 'q_kgkg', 'rh_min',
-                 'rh_max', 'prcp_mm', 'etr_mm', 'eto_mm']
-
-    # Specify column order for output .csv Variables:
-    output_order = ['date', 'year', 'month', 'day', 'centroid_lat',
-                    'centroid_lon', 'elev_m', 'u2_ms', 'tmin_c', 'tmax_c',
-                    'srad_wm2', 'ea_kpa', 'prcp_mm', 'etr_mm', 'eto_mm']
-
     # Year Filter
     if year_filter:
             year_list = sorted(list(_parse_int_set(year_filter)))
@@ -102,9 +151,7 @@ def download_gridmet_ee(input_csv, out_folder, year_filter='', year_update=''):
         logging.info('\nDownloading full historical record (1979-present).')
         # Create List of all dates
         # determine end date of data collection
-        current_date = dt.datetime.today()
-        end_date = dt.date(current_date.year, current_date.month,
-                           current_date.day - 1)
+        end_date = pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
         date_list = pd.date_range(dt.datetime.strptime('1979-01-01',
                                                        '%Y-%m-%d'), end_date)
 
@@ -119,28 +166,25 @@ def download_gridmet_ee(input_csv, out_folder, year_filter='', year_update=''):
         #     dt.datetime.strptime('{}-12-31'.format(max(year_list)),
         #                          '%Y-%m-%d'))
 
-    # Exponential getinfo call from ee-tools/utils.py
-    def ee_getinfo(ee_obj, n=30):
-        """Make an exponential backoff getInfo call on the EarthEngine object"""
-        output = None
-        for i in range(1, n):
-            try:
-                output = ee_obj.getInfo()
-            except Exception as e:
-                print('    Resending query ({}/{})'.format(i, n))
-                print('    {}'.format(e))
-                sleep(i ** 2)
-            if output:
-                break
-        return output
-
-    # Loop through dataframe row by row and grab desired met data from
-    # GRID collections based on Lat/Lon and Start/End dates
-    for index, row in input_df.iterrows():
-        start_time = timeit.default_timer()
+    # for connection to Earth Engine, unless another client is given
+    if client is None:
+        _initialize_ee()
+        client = ee
+
+    # cells with missing data, extracted after all cells are checked
+    pending = {}
+    # file paths of gridMET cells, added to all stations in the cell
+    cell_files = {}
+    # Loop through unique gridMET cells and find dates with missing data,
+    # stations in the same cell share one time series file
+    cells_df = input_df.drop_duplicates('GRIDMET_ID')
+    logging.info('\n{} stations in {} gridMET cells'.format(
+        len(input_df), len(cells_df)))
+    for index, row in cells_df.iterrows():
         # Reset original_df
         original_df = None
-        export_df = None
+        # if rows are removed from existing data rewrite the whole file
+        rewrite = False
 
         GRIDMET_ID_str = str(row.GRIDMET_ID)
         logging.info('\nProcessing GRIDMET ID: {}'.format(GRIDMET_ID_str))
@@ -154,11 +198,13 @@ def download_gridmet_ee(input_csv, out_folder, year_filter='', year_update=''):
             original_df = pd.read_csv(output_file, parse_dates=True)
             # Apply update filter (remove original data based on year)
             if year_update:
+                n_rows = len(original_df)
                 original_df = original_df[~original_df['year']
                     .isin(update_list)]
+                rewrite = len(original_df) < n_rows
 
-            missing_dates = list(set(date_list) - set(pd.to_datetime(
-                original_df['date'])))
+            missing_ranges = _missing_ranges(
+                date_list, pd.to_datetime(original_df['date']))
             original_df.date = pd.to_datetime(original_df.date.astype(str),
                                               format='%Y-%m-%d')
             original_df['date'] = original_df.date.apply(lambda x: x.strftime(
@@ -166,164 +212,532 @@ def download_gridmet_ee(input_csv, out_folder, year_filter='', year_update=''):
         else:
             logging.info('{} does not exists. Creating file.'.format(
                 output_name))
-            missing_dates = list(set(date_list))
-        if not missing_dates:
+            missing_ranges = _missing_ranges(date_list)
+        if not missing_ranges:
             logging.info('No missing data found. Skipping')
             # Add gridMET file path to input table if not already there
-            input_df.loc[input_df.GRIDMET_ID == row.GRIDMET_ID,\
-                'GRIDMET_FILE_PATH'] = os.path.abspath(output_file)
-            input_df.to_csv(input_csv, index=False)
+            cell_files[row.GRIDMET_ID] = os.path.abspath(output_file)
             continue
 
-        # Min and Max of Missing Dates (Start: Inclusive; End: Exclusive)
-        start_date = min(missing_dates)
-        end_date = max(missing_dates)
-
-        missing_years = []
-        for date in missing_dates:
-            missing_years = missing_years + [date.year]
-        missing_years = sorted(list(set(missing_years)))
-
-        # Add check to verify lat/lon fall within the gridmet extent
-        # -124.78749996666667 25.04583333333334
-        # -67.03749996666667 49.42083333333334
-        # Create ee point from lat and lon
-        point = ee.Geometry.Point(row.LON, row.LAT)
-
-        # gridmet elevation image:
-        # ee.Image('projects/climate-engine/gridmet/elevation')
-        elev = ee.Image('projects/climate-engine/gridmet/elevation') \
-            .reduceRegion(reducer=ee.Reducer.mean(), geometry=point,
-                          scale=4000)
-        elev = ee_getinfo(elev)['b1']
-
-        # Calculate out grid cell centroid
-        # gridMET elevation asset lower left corner coordinates
-        gridmet_lon = -124.78749996666667
-        gridmet_lat = 25.04583333333334
-        gridmet_cs = 0.041666666666666664
-        gridcell_lat = int(
-            abs(row.LAT - gridmet_lat) / gridmet_cs) * gridmet_cs +\
-            gridmet_lat + gridmet_cs/2
-        gridcell_lon = int(
-            abs(row.LON - gridmet_lon) / gridmet_cs) * gridmet_cs +\
-            gridmet_lon + gridmet_cs/2
-
-        # Loop through ee pull by year (max 5000 records for getInfo())
-        # Append each new year on end of dataframe
-        # Process dataframe units and output after
-        start_date_yr = start_date.year
-
-        for iter_year in missing_years:
-            logging.info(iter_year)
-        # Filter Collection by start/end date and lat/lon Point
-        # Only include 'permanent' data
-            gridmet_coll = ee.ImageCollection('IDAHO_EPSCOR/GRIDMET') \
-                .filterDate(start_date, end_date+1) \
-                .filter(ee.Filter.calendarRange(iter_year, iter_year, 'year')) \
-                .filter(ee.Filter.eq('status', 'permanent')) \
-                .select(met_bands, met_names)
-
-            # Check if collection is empty
-            image_count = ee.Number(gridmet_coll.limit(1)
-                                    .reduceColumns('count', ['system:index'])
-                                    .get('count'))
-            empty = ee.Algorithms.If(image_count.eq(1), False, True)
-
-            if ee_getinfo(empty):
-                logging.info('No new "permanent" data found. Skipping.')
-                export_df = None
+        logging.info('Missing {} days in {} date ranges'.format(
+            sum((end - start).days for start, end in missing_ranges),
+            len(missing_ranges)))
+        pending[row.GRIDMET_ID] = (row, output_file, original_df, 
+            missing_ranges, rewrite)
+
+    if pending:
+        cell_files.update(
+            _download_pending(pending, batch, workers, rate_limit, client))
+
+    # Add gridMET file paths of all stations to input table in one update
+    if cell_files:
+        file_paths = input_df.GRIDMET_ID.map(cell_files)
+        if 'GRIDMET_FILE_PATH' in input_df.columns:
+            file_paths = file_paths.fillna(input_df.GRIDMET_FILE_PATH)
+        input_df['GRIDMET_FILE_PATH'] = file_paths
+        input_df.to_csv(input_csv, index=False)
+
+
+def _download_pending(pending, batch, workers, rate_limit, client):
+    """
+    Download gridMET data of cells with missing data, all cells together
+    in batch mode or each cell separately in parallel threads.
+
+    Arguments:
+        pending (dict): GRIDMET_ID keys with (row, output file, existing 
+            data, missing date ranges, rewrite) tuples.
+        batch (bool): if True use :func:`_batch_extract`.
+        workers (int): number of threads making requests.
+        rate_limit (float or None): maximum requests per second.
+        client: Earth Engine API module or a fake of it.
+
+    Returns:
+        dict: GRIDMET_ID keys with absolute paths of the cell files that 
+        new data was saved to.
+    """
+    # rate limiter and circuit breaker shared by all download threads
+    session = _RequestSession(rate_limit=rate_limit)
+    start_time = timeit.default_timer()
+    if batch:
+        # extract all cells with missing data together and split by cell
+        logging.info('\nExtracting {} gridMET cells in batch mode'.format(
+            len(pending)))
+        exports, elevs = _batch_extract(
+            [(row.GRIDMET_ID, row.LON, row.LAT, missing_ranges) for 
+                row, _, _, missing_ranges, _ in pending.values()],
+            client, session, workers=workers
+        )
+        saved = []
+        for row, output_file, original_df, _, rewrite in pending.values():
+            export_df = exports.get(row.GRIDMET_ID)
+            if export_df is None or export_df.empty:
+                logging.info('No new "permanent" data found for GRIDMET ID: '+\
+                    '{}. Skipping.'.format(row.GRIDMET_ID))
+                saved.append(False)
                 continue
+            _save_gridmet(export_df, original_df, output_file, 
+                elevs.get(int(row.GRIDMET_ID)), row, rewrite=rewrite)
+            saved.append(True)
+    else:
+        # download each cell separately, cells in parallel threads
+        saved = map_workers(
+            _download_cell, 
+            [v + (client, session) for v in pending.values()],
+            workers=workers, threads=True
+        )
+
+    elapsed = timeit.default_timer() - start_time
+    logging.info('\nDownload Time: {}'.format(elapsed))
+    logging.info('Requests: {}, retries: {}'.format(
+        session.requests, session.retries))
+
+    return {
+        g: os.path.abspath(output_file) 
+        for (g, (_, output_file, _, _, _)), cell_saved 
+        in zip(pending.items(), saved) if cell_saved
+    }
+
+
+class _RequestSession(object):
+    """
+    Make getInfo requests to Earth Engine with exponential backoff, shared
+    by all download threads. Requests wait on a shared token bucket rate 
+    limiter and circuit breaker so that threads back off together when the
+    service throttles requests. Latency of each request is logged at debug
+    level and retries at info level.
+
+    Keyword Arguments:
+        rate_limit (float): default None. Maximum requests per second of all
+            threads, if None requests are not rate limited.
+        n (int): default 30. Maximum attempts per request.
+    """
+    def __init__(self, rate_limit=None, n=30):
+        self.limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.breaker = CircuitBreaker()
+        self.n = n
+        self.requests = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def getinfo(self, ee_obj, label='getInfo'):
+        """
+        Make an exponential backoff getInfo call on the EarthEngine object,
+        from ee-tools/utils.py.
+
+        Arguments:
+            ee_obj: Earth Engine object to compute.
+
+        Keyword Arguments:
+            label (str): default 'getInfo'. Description of the request for
+                logging.
+
+        Returns:
+            output: result of ``ee_obj.getInfo()`` or None if all attempts
+            failed.
+        """
+        n = self.n
+        for i in range(1, n):
+            self.breaker.wait()
+            if self.limiter:
+                self.limiter.acquire()
+            start_time = timeit.default_timer()
+            try:
+                output = ee_obj.getInfo()
+            except Exception as e:
+                self.breaker.failure()
+                with self._lock:
+                    self.retries += 1
+                logging.info('    Resending query {} ({}/{})'.format(
+                    label, i, n))
+                logging.info('    {}'.format(e))
+                sleep(i ** 2)
+                continue
+            self.breaker.success()
+            with self._lock:
+                self.requests += 1
+            logging.debug('    {}: {:.2f} seconds, {} retries'.format(
+                label, timeit.default_timer() - start_time, i - 1))
+            if i > 1:
+                logging.info('    {} succeeded after {} retries'.format(
+                    label, i - 1))
+            return output
+        logging.warning('    {} failed after {} attempts'.format(label, n - 1))
+        return None
+
+
+def _gridmet_collection(client, start_date, end_date):
+    """
+    Get the gridMET image collection between ``start_date`` (inclusive) 
+    and ``end_date`` (exclusive) with only 'permanent' data and bands 
+    renamed for export.
+    """
+    return client.ImageCollection('IDAHO_EPSCOR/GRIDMET') \
+        .filterDate(start_date, end_date) \
+        .filter(client.Filter.eq('status', 'permanent')) \
+        .select(_MET_BANDS, _MET_NAMES)
+
+
+def _download_cell(row, output_file, original_df, missing_ranges, rewrite,
+        client, session):
+    """
+    Download gridMET data of one cell for missing date ranges, split by 
+    year, and save it with :func:`_save_gridmet`.
+
+    Arguments:
+        row (:class:`pandas.Series`): row of the input table of the cell.
+        output_file (str): path to CSV file of the cell.
+        original_df (:class:`pandas.DataFrame` or None): existing data of
+            the cell.
+        missing_ranges (list): (start, end) date ranges to download from
+            :func:`_missing_ranges`.
+        rewrite (bool): if True rewrite the whole file, see 
+            :func:`_save_gridmet`.
+        client: Earth Engine API module or a fake of it.
+        session (:class:`_RequestSession`): makes the getInfo requests.
+
+    Returns:
+        bool: True if new data was saved.
+    """
+    GRIDMET_ID_str = str(row.GRIDMET_ID)
+
+    # Add check to verify lat/lon fall within the gridmet extent
+    # -124.78749996666667 25.04583333333334
+    # -67.03749996666667 49.42083333333334
+    # Create ee point from lat and lon
+    point = client.Geometry.Point(row.LON, row.LAT)
+
+    # gridmet elevation image:
+    # ee.Image('projects/climate-engine/gridmet/elevation')
+    elev = client.Image('projects/climate-engine/gridmet/elevation') \
+        .reduceRegion(reducer=client.Reducer.mean(), geometry=point,
+                      scale=4000)
+    elev = session.getinfo(
+        elev, 'GRIDMET ID {} elevation'.format(GRIDMET_ID_str))['b1']
+
+    def get_values(image):
+        # Pull out date from Image
+        datestr = image.date()
+        datenum = client.Image.constant(client.Number.parse(
+            datestr.format("YYYYMMdd"))).rename(['date'])
+        # Add dateNum Band to Image
+        image = image.addBands([datenum])
+        # Reduce image taking mean of all pixels in geometry (4km res)
+        input_mean = client.Image(image) \
+            .reduceRegion(
+                    reducer=client.Reducer.mean(), geometry=point,
+                    scale=4000)
+        return client.Feature(None, input_mean)
+
+    # Loop through ee pull by missing date range within each year (max 5000
+    # records for getInfo()), append each range on end of dataframe
+    # Process dataframe units and output after
+    export_dfs = []
+    for start_date, end_date in _split_ranges(missing_ranges, by_year=True):
+        label = 'GRIDMET ID {} {} to {}'.format(GRIDMET_ID_str, 
+            start_date.date(), (end_date - pd.Timedelta(days=1)).date())
+        logging.info(label)
+        # Filter Collection by start (inclusive) and end (exclusive) dates
+        # Only include 'permanent' data
+        gridmet_coll = _gridmet_collection(client, start_date, end_date)
+
+        # Check if collection is empty
+        image_count = client.Number(gridmet_coll.limit(1)
+                                .reduceColumns('count', ['system:index'])
+                                .get('count'))
+        empty = client.Algorithms.If(image_count.eq(1), False, True)
 
-            def get_values(image):
-                # Pull out date from Image
-                datestr = image.date()
-                datenum = ee.Image.constant(ee.Number.parse(
-                    datestr.format("YYYYMMdd"))).rename(['date'])
-                # Add dateNum Band to Image
-                image = image.addBands([datenum])
-                # Reduce image taking mean of all pixels in geometry (4km res)
-                input_mean = ee.Image(image) \
-                    .reduceRegion(
-                            reducer=ee.Reducer.mean(), geometry=point,
-                            scale=4000)
-                return ee.Feature(None, input_mean)
-            # Run get_values function over all images in gridmet collection
-            data = gridmet_coll.map(get_values)
-
-            # Export dictionary to pandas dataframe using exponential getInfo
-            if iter_year == start_date_yr:
-                    export_df = pd.DataFrame([
-                            ftr['properties']
-                            for ftr in ee_getinfo(data)['features']])
-            else:
-                    export_df2 = pd.DataFrame([
-                        ftr['properties']
-                        for ftr in ee_getinfo(data)['features']])
-                    export_df = export_df.append(export_df2)
-        # If export_df is None (skip to next ID)
-        if export_df is None:
+        if session.getinfo(empty, label + ' count'):
+            logging.info('No new "permanent" data found. Skipping.')
             continue
-        # Reset Index
-        export_df = export_df.reset_index(drop=False)
 
-        # Convert dateNum to datetime and create Year, Month, Day, DOY variables
-        export_df.date = pd.to_datetime(export_df.date.astype(str),
-                                        format='%Y%m%d')
-        export_df['year'] = export_df['date'].dt.year
-        export_df['month'] = export_df['date'].dt.month
-        export_df['day'] = export_df['date'].dt.day
-        # export_df['DOY'] = export_df['Date'].dt.dayofyear
-        # Format Date for export
-        export_df['date'] = export_df.date.apply(lambda x: x.strftime(
-            '%Y-%m-%d'))
-
-        # Remove all negative Prcp values (GRIDMET Bug)
-        export_df.prcp_mm = export_df.prcp_mm.clip(lower=0)
-
-        # Convert 10m windspeed to 2m (ASCE Eqn. 33)
-        zw = 10
-        export_df['u2_ms'] = refet.calcs._wind_height_adjust(
-            export_df.u10_ms, zw)
-        # elevation from gridMET elevation layer
-        export_df['elev_m'] = elev
-        export_df['centroid_lat'] = gridcell_lat
-        export_df['centroid_lon'] = gridcell_lon
-
-        # air pressure from gridmet elevation using refet module
-        export_df['pair_kpa'] = refet.calcs._air_pressure(export_df.elev_m,
-                                                          method='asce')
-
-        # actual vapor pressure (kg/kg) using refet module
-        export_df['ea_kpa'] = refet.calcs._actual_vapor_pressure(
-            export_df.q_kgkg, export_df.pair_kpa)
-
-        # Unit Conversions
-        export_df.tmax = export_df.tmax-273.15  # K to C
-        export_df.tmin = export_df.tmin-273.15  # K to C
-        export_df.rename(columns={'tmax': 'tmax_c', 'tmin': 'tmin_c'},
-                         inplace=True)
-        # export_df['Tavg_C'] = (export_df.Tmax_C + export_df.Tmin_C)/2
-
-        # Relative Humidity from gridMET min and max
-        # export_df['RH_avg'] = (export_df.RH_max + export_df.RH_min)/2
-
-        # Add new data to original dataframe, remove duplicates
-        export_df = pd.concat([original_df, export_df], ignore_index=True,
-                              sort=True)
-        export_df = export_df[output_order].drop_duplicates('date')
-        export_df = export_df.sort_values(by=['year', 'month', 'day'])
-        export_df = export_df.dropna()
-
-        # Add gridMET file path to input table
-        input_df.loc[input_df.GRIDMET_ID == row.GRIDMET_ID,\
-                'GRIDMET_FILE_PATH'] = os.path.abspath(output_file)
-        input_df.to_csv(input_csv, index=False)
+        # Run get_values function over all images in gridmet collection
+        data = gridmet_coll.map(get_values)
+
+        # Export dictionary to pandas dataframe using exponential getInfo
+        export_dfs.append(pd.DataFrame([
+            ftr['properties'] 
+            for ftr in session.getinfo(data, label)['features']]))
+
+    # If no new data (skip to next ID)
+    if not export_dfs:
+        return False
+
+    _save_gridmet(pd.concat(export_dfs), original_df, output_file, elev, row,
+        rewrite=rewrite)
+    return True
+
+
+def _batch_extract(cells, client, session, workers=1,
+        max_elements=_EE_MAX_ELEMENTS):
+    """
+    Extract gridMET data for multiple cells together with ``reduceRegions``
+    over a FeatureCollection of cell points. The missing date ranges of 
+    the cells are split by :func:`_range_groups` into ranges that the same
+    cells are missing, so each request only includes the cells missing its
+    dates. Cells of a range are split into groups of at most 
+    ``max_elements`` and the range into requests of as many days as fit in
+    ``max_elements`` features (cell-days).
+
+    Arguments:
+        cells (list): list of (GRIDMET_ID, lon, lat, missing date ranges) 
+            tuples, ranges as returned by :func:`_missing_ranges`.
+        client: Earth Engine API module or a fake of it.
+        session (:class:`_RequestSession`): makes the getInfo requests.
 
-        # Write csv files to working directory
-        export_df.to_csv(output_file, columns=output_order, index=False)
-        elapsed = timeit.default_timer() - start_time
-        logging.info('\nDownload Time: {}'.format(elapsed))
+    Keyword Arguments:
+        workers (int): default 1. Number of threads making requests.
+        max_elements (int): default 5000. Maximum number of features per 
+            getInfo request.
+
+    Returns:
+        tuple of dictionaries with GRIDMET_ID keys, the first of DataFrames 
+        of the extracted properties of each cell for its missing dates, the
+        second of elevations of the cells.
+    """
+    def _points(group):
+        return client.FeatureCollection([
+            client.Feature(
+                client.Geometry.Point(lon, lat), {'GRIDMET_ID': int(g)})
+            for g, lon, lat, _ in group
+        ])
+
+    def _values(points):
+        def get_values(image):
+            # reduce image to each cell point, add date to the features
+            datenum = client.Number.parse(image.date().format("YYYYMMdd"))
+            return image.reduceRegions(
+                    collection=points, reducer=client.Reducer.mean(), 
+                    scale=4000
+                ).map(lambda ftr: ftr.set('date', datenum))
+        return get_values
+
+    exports = {}
+    elevs = {}
+    # elevation of up to max elements cells per request
+    elev_image = client.Image('projects/climate-engine/gridmet/elevation')
+    for i in range(0, len(cells), max_elements):
+        elev = elev_image.reduceRegions(
+            collection=_points(cells[i:i+max_elements]), 
+            reducer=client.Reducer.mean(), scale=4000)
+        for ftr in session.getinfo(elev, 'elevation')['features']:
+            elevs[ftr['properties']['GRIDMET_ID']] =\
+                ftr['properties'].get('mean')
+
+    requests = []
+    for start_date, end_date, range_cells in _range_groups(cells):
+        for i in range(0, len(range_cells), max_elements):
+            group = range_cells[i:i+max_elements]
+            get_values = _values(_points(group))
+            # days per request so that days x cells <= max elements
+            n_days = max(1, max_elements // len(group))
+            for start, end in _split_ranges([(start_date, end_date)], n_days):
+                label = '{} cells {} to {}'.format(len(group), start.date(), 
+                    (end - pd.Timedelta(days=1)).date())
+                data = _gridmet_collection(client, start, end)\
+                    .map(get_values).flatten()
+                requests.append((data, label))
+    results = map_workers(
+        session.getinfo, requests, workers=workers, threads=True)
+    features = [
+        ftr['properties'] for result in results if result 
+        for ftr in result['features']
+    ]
+    if not features:
+        return exports, elevs
+
+    # split features by cell
+    batch_df = pd.DataFrame(features)
+    batch_df['date'] = pd.to_datetime(
+        batch_df.date.astype(int).astype(str), format='%Y%m%d')
+    for g, cell_df in batch_df.groupby('GRIDMET_ID'):
+        exports[g] = cell_df.drop(columns='GRIDMET_ID')
+
+    return exports, elevs
+
+
+def _missing_ranges(date_list, existing_dates=None):
+    """
+    Find dates in ``date_list`` that are not in ``existing_dates`` and run
+    length encode them into contiguous date ranges.
+
+    Arguments:
+        date_list (:class:`pandas.DatetimeIndex`): all dates wanted.
+
+    Keyword Arguments:
+        existing_dates (array-like): default None. Dates that already have 
+            data.
+
+    Returns:
+        list of (start, end) :class:`pandas.Timestamp` tuples, start 
+        inclusive and end exclusive.
+
+    Example:
+        >>> dates = pd.date_range('2000-01-01', '2000-01-10')
+        >>> _missing_ranges(dates, dates[2:5])
+        [(Timestamp('2000-01-01 00:00:00'), Timestamp('2000-01-03 00:00:00')), 
+         (Timestamp('2000-01-06 00:00:00'), Timestamp('2000-01-11 00:00:00'))]
+    """
+    dates = np.unique(np.asarray(date_list, dtype='datetime64[D]'))
+    if existing_dates is not None:
+        dates = dates[~np.isin(
+            dates, np.asarray(existing_dates, dtype='datetime64[D]'))]
+    if not dates.size:
+        return []
+    one_day = np.timedelta64(1, 'D')
+    # a new range starts wherever consecutive dates are not one day apart
+    breaks = np.flatnonzero(np.diff(dates) != one_day) + 1
+    starts = dates[np.r_[0, breaks]]
+    ends = dates[np.r_[breaks - 1, dates.size - 1]] + one_day
+    return list(zip(pd.to_datetime(starts), pd.to_datetime(ends)))
+
+
+def _range_groups(cells):
+    """
+    Split the missing date ranges of multiple cells at the start and end 
+    of every range into sorted, disjoint (start, end, cells) tuples of the
+    cells that are missing all dates from start to end. Adjacent ranges 
+    missing in the same cells are joined. ``cells`` are (GRIDMET_ID, lon,
+    lat, missing date ranges) tuples as used by :func:`_batch_extract`.
+    """
+    bounds = sorted({d for cell in cells for r in cell[3] for d in r})
+    bound_idx = {d: i for i, d in enumerate(bounds)}
+    # indices of the cells missing each range between consecutive bounds
+    members = [[] for _ in bounds[1:]]
+    for i, cell in enumerate(cells):
+        for start, end in cell[3]:
+            for j in range(bound_idx[start], bound_idx[end]):
+                members[j].append(i)
+    groups = []
+    for start, end, idx in zip(bounds[:-1], bounds[1:], members):
+        if not idx:
+            continue
+        if groups and groups[-1][1] == start and groups[-1][2] == idx:
+            groups[-1] = (groups[-1][0], end, idx)
+        else:
+            groups.append((start, end, idx))
+
+    return [(start, end, [cells[i] for i in idx]) 
+        for start, end, idx in groups]
+
+
+def _split_ranges(ranges, max_days=None, by_year=False):
+    """
+    Split (start, end) date ranges into ranges of at most ``max_days`` days
+    and, if ``by_year``, ranges that do not cross the start of a year.
+    """
+    split = []
+    for start, end in ranges:
+        while start < end:
+            stop = end
+            if max_days:
+                stop = min(stop, start + pd.Timedelta(days=max_days))
+            if by_year:
+                stop = min(stop, pd.Timestamp(start.year + 1, 1, 1))
+            split.append((start, stop))
+            start = stop
+    return split
+
+
+def _save_gridmet(export_df, original_df, output_file, elev, row, 
+        rewrite=False):
+    """
+    Convert units of gridMET data extracted from Earth Engine for one cell,
+    add derived variables and cell metadata and save to the cell's CSV 
+    file. Only the new rows are written, appended to the end of the file 
+    if they are all after the existing data, otherwise they are merged
+    with the existing data and the file is rewritten in date order.
+
+    Arguments:
+        export_df (:class:`pandas.DataFrame`): extracted properties with 
+            dates as YYYYMMDD numbers or datetimes.
+        original_df (:class:`pandas.DataFrame` or None): existing data of
+            the cell.
+        output_file (str): path to CSV file of the cell.
+        elev (float): elevation of the gridMET cell in meters.
+        row (:class:`pandas.Series`): row of the input table of the cell.
+
+    Keyword Arguments:
+        rewrite (bool): default False. If True always rewrite the file 
+            with ``original_df`` and the new data, e.g. when rows were 
+            removed from the existing data to update them.
+
+    Returns:
+        None
+    """
+    # Reset Index
+    export_df = export_df.reset_index(drop=False)
+
+    # Convert dateNum to datetime and create Year, Month, Day, DOY variables
+    if not pd.api.types.is_datetime64_any_dtype(export_df.date):
+        export_df.date = pd.to_datetime(export_df.date.astype(int).astype(str),
+                                        format='%Y%m%d')
+    export_df['year'] = export_df['date'].dt.year
+    export_df['month'] = export_df['date'].dt.month
+    export_df['day'] = export_df['date'].dt.day
+    # export_df['DOY'] = export_df['Date'].dt.dayofyear
+    # Format Date for export
+    export_df['date'] = export_df.date.apply(lambda x: x.strftime(
+        '%Y-%m-%d'))
+
+    # Remove all negative Prcp values (GRIDMET Bug)
+    export_df.prcp_mm = export_df.prcp_mm.clip(lower=0)
+
+    # Convert 10m windspeed to 2m (ASCE Eqn. 33)
+    zw = 10
+    export_df['u2_ms'] = refet.calcs._wind_height_adjust(
+        export_df.u10_ms, zw)
+    # elevation from gridMET elevation layer
+    export_df['elev_m'] = elev
+
+    # Calculate out grid cell centroid
+    # gridMET elevation asset lower left corner coordinates
+    gridmet_lon = -124.78749996666667
+    gridmet_lat = 25.04583333333334
+    gridmet_cs = 0.041666666666666664
+    export_df['centroid_lat'] = int(
+        abs(row.LAT - gridmet_lat) / gridmet_cs) * gridmet_cs +\
+        gridmet_lat + gridmet_cs/2
+    export_df['centroid_lon'] = int(
+        abs(row.LON - gridmet_lon) / gridmet_cs) * gridmet_cs +\
+        gridmet_lon + gridmet_cs/2
+
+    # air pressure from gridmet elevation using refet module
+    export_df['pair_kpa'] = refet.calcs._air_pressure(export_df.elev_m,
+                                                      method='asce')
+
+    # actual vapor pressure (kg/kg) using refet module
+    export_df['ea_kpa'] = refet.calcs._actual_vapor_pressure(
+        export_df.q_kgkg, export_df.pair_kpa)
+
+    # Unit Conversions
+    export_df.tmax = export_df.tmax-273.15  # K to C
+    export_df.tmin = export_df.tmin-273.15  # K to C
+    export_df.rename(columns={'tmax': 'tmax_c', 'tmin': 'tmin_c'},
+                     inplace=True)
+    # export_df['Tavg_C'] = (export_df.Tmax_C + export_df.Tmin_C)/2
+
+    # Relative Humidity from gridMET min and max
+    # export_df['RH_avg'] = (export_df.RH_max + export_df.RH_min)/2
+
+    export_df = export_df[_OUTPUT_ORDER].drop_duplicates('date')
+    export_df = export_df.sort_values(by=['year', 'month', 'day'])
+    export_df = export_df.dropna()
+
+    # Append new rows if they all follow the existing data in the file
+    if original_df is not None and not original_df.empty and not rewrite\
+            and export_df.date.min() > original_df.date.max():
+        export_df.to_csv(output_file, columns=_OUTPUT_ORDER, index=False,
+                         mode='a', header=False)
+        return
+
+    # Add new data to original dataframe, remove duplicates
+    export_df = pd.concat([original_df, export_df], ignore_index=True,
+                          sort=True)
+    export_df = export_df[_OUTPUT_ORDER].drop_duplicates('date')
+    export_df = export_df.sort_values(by=['year', 'month', 'day'])
+
+    # Write csv files to working directory
+    export_df.to_csv(output_file, columns=_OUTPUT_ORDER, index=False)
 
 
 def _parse_int_set(nputstr=""):
@@ -384,6 +798,15 @@ def arg_parse():
     optional.add_argument(
         '-u', '--update', metavar='', default=None, type=str,
         help='Year(s) to update, single year (YYYY) or range (YYYY-YYYY)')
+    optional.add_argument(
+        '-b', '--batch', required=False, default=False, action='store_true',
+        help='Extract all gridMET cells together with reduceRegions')
+    optional.add_argument(
+        '-j', '--jobs', metavar='', required=False, default=1, type=int,
+        help='Number of threads making requests to Earth Engine')
+    optional.add_argument(
+        '-r', '--rate-limit', metavar='', required=False, default=None, 
+        type=float, help='Maximum Earth Engine requests per second')
     optional.add_argument(
         '--debug', default=logging.INFO, const=logging.DEBUG,
         help='Debug level logging', action="store_const", dest="loglevel")
@@ -404,7 +827,8 @@ if __name__ == '__main__':
         'Script:', os.path.basename(sys.argv[0])))
 
     download_gridmet_ee(input_csv=args.input, out_folder=args.out_dir,
-         year_filter=args.years, year_update=args.update)
+         year_filter=args.years, year_update=args.update, batch=args.batch,
+         workers=args.jobs, rate_limit=args.rate_limit)
 
     # Saturated vapor pressure
     # export_df['esat_min_kPa'] =
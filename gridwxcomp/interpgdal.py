@@ -5,6 +5,7 @@ used for spatial interpolation of scattered point data.
 """
 import os
 import subprocess
+import time
 import xml.etree.cElementTree as ET
 from copy import copy
 from pathlib import Path
@@ -12,14 +13,16 @@ from xml.dom import minidom
 
 import numpy as np
 import pandas as pd
-from .spatial import get_subgrid_bounds, gridmet_zonal_stats, calc_pt_error
+from osgeo import gdal, ogr, osr
+from .spatial import get_subgrid_bounds, _layer_results, _save_layer_results
+from .util import map_workers
 
 
 class InterpGdal(object):
     """
-    Usage of gdal command line tools within ``gridwxcomp``, currently
-    utilizes the `gdal_grid <https://www.gdal.org/gdal_grid.html>`_ 
-    command line tool. 
+    Usage of gdal tools within ``gridwxcomp``, currently utilizes 
+    `gdal_grid <https://www.gdal.org/gdal_grid.html>`_ through the gdal
+    Python bindings or the command line tool. 
     
     Arguments:
         summary_csv_path (str): path to [var]_summary_comp CSV file created 
@@ -50,6 +53,9 @@ class InterpGdal(object):
         params (dict or None): default None. After :meth:`InterpGdal.gdal_grid`
             ``params`` is updated with the last used interpolation parameters
             in the form of a dictionary with parameter names as keys.
+        timings (dict): empty dictionary that is updated with the run time
+            of gdal_grid in seconds for each layer name after using 
+            :meth:`InterpGdal.gdal_grid`.
             
     Example:
         The :class:`InterpGdal` class is useful for experimenting with multiple 
@@ -165,13 +171,16 @@ class InterpGdal(object):
         self.interp_meth = 'invdist'
         self.interped_rasters = [] # appended with Path objects
         self.params = None # to hold last used interp. parameters as dict
+        self.timings = {} # gdal_grid seconds per layer from last run
         
         
     def _make_pt_vrt(self, layer_name, out_dir):
         """
         Make a vrt file for station point ratios in summary CSV for a 
         specific layer or field name. Save to out_dir. Used for gdal_grid 
-        interpolation commands of scatter point data.
+        interpolation commands of scatter point data. The temporary point 
+        CSV is named after the layer so that layers can run in parallel, 
+        returns its name without extension which is the vrt layer name.
         """
         if not Path(out_dir).is_dir():
             os.makedirs(out_dir)
@@ -179,7 +188,7 @@ class InterpGdal(object):
         #summary_file = Path(self.summary_csv_path).name
         
         point_data = Path(self.summary_csv_path).name.replace(
-                '.csv', '_tmp.csv')
+                '.csv', '_{}_tmp.csv'.format(layer_name))
 
         # make tmp point data csv for given layer, drop missing values
         df = pd.read_csv(self.summary_csv_path)
@@ -223,6 +232,8 @@ class InterpGdal(object):
         out_path = os.path.join(out_dir, out_file)
         with open(out_path, 'w') as outf:
             outf.write(out_xml_str)
+
+        return point_data.replace('.csv', '')
         
     def _str_to_params(self, param_str):
         """ 
@@ -253,9 +264,11 @@ class InterpGdal(object):
 
     def gdal_grid(self, layer='all', out_dir='', interp_meth='invdist', 
                   params=None, bounds=None, nx_cells=None, ny_cells=None, 
-                  scale_factor=0.1, zonal_stats=True, options=None):
+                  scale_factor=0.1, zonal_stats=True, options=None, 
+                  workers=1, backend='python'):
         """
-        Run gdal_grid command line tool to interpolate point ratios.
+        Run gdal_grid to interpolate point ratios, in process with 
+        :func:`osgeo.gdal.Grid` by default or with the command line tool.
         
         For further information on theinterpolation algorithms including 
         their function, parameters, and options see 
@@ -290,6 +303,13 @@ class InterpGdal(object):
                 the interpolated raster file(s).
             options (str or None): default None. Extra command line options for
                 gdal_grid spatial interpolation.
+            workers (int): default 1. Number of processes used to run layers
+                in parallel, the summary CSV, point shapefile, and zonal 
+                stats CSV are written once after all layers are finished.
+            backend (str): default 'python'. Run gdal_grid in process with
+                :func:`osgeo.gdal.Grid` on an in-memory point layer 
+                ('python') or call the gdal_grid command line tool on 
+                temporary point files ('cli').
                 
         Returns:
             None
@@ -383,20 +403,19 @@ class InterpGdal(object):
         Raises:
             KeyError: if interp_meth is not a valid gdal_grid interpolation
                 algorithm name. 
+            ValueError: if backend is not 'python' or 'cli'.
         """
         
-        cwd = os.getcwd()
-        
         out_dir = Path(self.summary_csv_path).parent / Path(out_dir).resolve()
         if not out_dir.is_dir():
             out_dir.mkdir(parents=True, exist_ok=True)
     
-        source_file = Path(self.summary_csv_path).name
-        source = source_file.replace('.csv', '_tmp')
-        
         if interp_meth not in InterpGdal.interp_methods:
             raise KeyError('{} not a valid interpolation method'.format(
                 interp_meth))
+        if backend not in ('python', 'cli'):
+            raise ValueError('{} not a valid gdal_grid backend, use "python"'\
+                ' or "cli"'.format(backend))
         self.interp_meth = interp_meth
             
         # look up default parameters for interpolation method
@@ -411,7 +430,7 @@ class InterpGdal(object):
         # update instance parameters for later reference
         self.params = params
         # parameters to command line input str :name=value:name=value ...
-        param_str = ':'+':'.join('{!s}={!r}'.format(key,val) 
+        param_str = ':'+':'.join('{!s}={!s}'.format(key,val) 
                                  for (key,val) in params.items()) 
         # get boundary info and update instance attribute
         if not bounds and not self.grid_bounds:
@@ -435,71 +454,139 @@ class InterpGdal(object):
         if not options:
             options = ''
                 
-        def _run_gdal_grid(layer):
-            """reuse if running multiple layers"""
-            existing_layers = pd.read_csv(self.summary_csv_path).columns
-            if not layer in existing_layers:
+        # run interpolation and zonal statistics depending on layer kwarg
+        if layer == 'all':
+            layers = self.layers
+        # run single field
+        elif isinstance(layer, str):
+            layers = [layer]
+        # run select list or tuple of layers
+        elif isinstance(layer, (list, tuple)):
+            layers = layer
+        existing_layers = pd.read_csv(self.summary_csv_path).columns
+        tasks = []
+        for l in layers:
+            if not l in existing_layers:
                 print('column {} does not exist in input CSV:\n {}'.format(
-                   layer, self.summary_csv_path),
+                   l, self.summary_csv_path),
                      '\nSkipping interpolation.'
                )
-                return
-            
-            # move to out_dir to run gdal command
-            os.chdir(out_dir)
-            # build vrt files in out_dir 
-            self._make_pt_vrt(layer, out_dir)
-            
-            vrt_file = '{}.vrt'.format(layer)
-            tiff_file = '{}.tiff'.format(layer)
-            # add raster path to instance if not already there (overwritten)
-            out_file = out_dir.joinpath(tiff_file)
-            # print message to console/logging about interpolation
-            grid_var = Path(self.summary_csv_path).name.split('_summ')[0]
-            # recalculate raster resolution from bounds
-            n4km_xcells = int(round(np.abs(xmin - xmax) / InterpGdal.CELL_SIZE))
-            scale_factor = n4km_xcells / nx_cells
-            res = round(4 * scale_factor * 1000)
-            _interp_msg(grid_var, layer, self.interp_meth, res, out_file) 
-            # build command line arguments
-            cmd = (r'gdal_grid -a {meth}{p} -txe {xmin} {xmax} -tye {ymax}' 
-                  ' {ymin} -outsize {nx} {ny} -of GTiff -ot Float64 -l {source}'
-                  ' {vrt} {out} {options}'.format(meth=interp_meth, p=param_str,
-                      xmin=xmin, xmax=xmax, ymin=ymin, ymax=ymax, nx=nx_cells, 
-                      ny=ny_cells, source=source, vrt=vrt_file, out=tiff_file, 
-                      options=options))
-            # run gdal_grid with arguments, x-platform
-            p = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
-                                 stderr=subprocess.PIPE)
-            out, err = p.communicate()
-            if err:
-                print(err)
-            else:
-                if not out_file in self.interped_rasters:
-                    self.interped_rasters.append(out_file)
+                continue
+            tasks.append((l, out_dir, param_str, nx_cells, ny_cells, options,
+                zonal_stats, backend))
+        # independent layers may run in parallel processes
+        results = []
+        for l, (result, run_time) in zip([t[0] for t in tasks], 
+                map_workers(self._gdal_grid_layer, tasks, workers=workers)):
+            self.timings[l] = run_time
+            results.append(result)
+        # residuals to point shapefile and summary CSV, zonal means to 
+        # gridMET_stats.csv, files are written once for all layers
+        grid_var = Path(self.summary_csv_path).name.split('_summ')[0]
+        rasters = _save_layer_results(
+            str(self.summary_csv_path), out_dir, grid_var, results,
+            [t[0] for t in tasks]
+        )
+        # add raster paths to instance if not already there (overwritten)
+        for out_file in rasters:
+            if not out_file in self.interped_rasters:
+                self.interped_rasters.append(out_file)
 
-            p.stdout.close()
-            p.stderr.close()    
-         
-            os.chdir(cwd)
+    def _gdal_grid_layer(self, layer, out_dir, param_str, nx_cells, ny_cells,
+            options, zonal_stats, backend='python'):
+        """
+        Run gdal_grid for a single layer, used by :meth:`InterpGdal.gdal_grid`
+        possibly in a worker process. Returns the interpolated raster, point 
+        estimates, and zonal means without writing them to the summary CSV
+        or "gridMET_stats.csv", and the run time of gdal_grid in seconds.
+        """
+        xmin,xmax,ymin,ymax = self.grid_bounds
+        tiff_file = '{}.tiff'.format(layer)
+        out_file = out_dir.joinpath(tiff_file)
+        # print message to console/logging about interpolation
+        grid_var = Path(self.summary_csv_path).name.split('_summ')[0]
+        # recalculate raster resolution from bounds
+        n4km_xcells = int(round(np.abs(xmin - xmax) / InterpGdal.CELL_SIZE))
+        scale_factor = n4km_xcells / nx_cells
+        res = round(4 * scale_factor * 1000)
+        _interp_msg(grid_var, layer, self.interp_meth, res, out_file) 
+        # gdal_grid arguments shared by both backends
+        grid_args = ('-a {meth}{p} -txe {xmin} {xmax} -tye {ymax} {ymin}'
+              ' -outsize {nx} {ny} -of GTiff -ot Float64 {options}'.format(
+                  meth=self.interp_meth, p=param_str, xmin=xmin, xmax=xmax, 
+                  ymin=ymin, ymax=ymax, nx=nx_cells, ny=ny_cells, 
+                  options=options))
 
-            # calculate interpolated values and error at stations
-            calc_pt_error(self.summary_csv_path, out_dir, layer, grid_var)
-            if zonal_stats:
-                gridmet_zonal_stats(self.summary_csv_path, out_file)
+        start_time = time.perf_counter()
+        if backend == 'cli':
+            err = self._run_gdal_grid_cli(layer, out_dir, grid_args)
+        else:
+            err = self._run_gdal_grid_python(layer, out_file, grid_args)
+        run_time = time.perf_counter() - start_time
 
-            
-        # run interpolation and zonal statistics depending on layer kwarg
-        if layer == 'all': # potential for multiprocessing 
-            for l in self.layers:
-                _run_gdal_grid(l)
-        # run single field
-        elif isinstance(layer, str):
-            _run_gdal_grid(layer)
-        # run select list or tuple of layers
-        elif isinstance(layer, (list, tuple)):
-            for l in layer:
-                _run_gdal_grid(l)
+        rasters = []
+        if err:
+            print(err)
+        else:
+            print('gdal_grid run time for {}: {:.2f} s'.format(layer, run_time))
+            rasters.append(out_file)
+        # calculate interpolated values and error at stations, zonal means
+        results = _layer_results(
+            str(self.summary_csv_path), out_dir, rasters, zonal_stats
+        )
+
+        return results, run_time
+
+    def _run_gdal_grid_python(self, layer, out_file, grid_args):
+        """
+        Run :func:`osgeo.gdal.Grid` in process on an in-memory point layer
+        of station ratios, no temporary files are written. Returns the gdal 
+        error message if interpolation failed.
+        """
+        df = pd.read_csv(self.summary_csv_path, na_values=[-999])
+        df = df.loc[df[layer].notnull(), ['STATION_LON','STATION_LAT',layer]]
+        # point layer with ratios as Z values, SRS WGS84 
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(4326)
+        src_ds = ogr.GetDriverByName('Memory').CreateDataSource(layer)
+        src_layer = src_ds.CreateLayer(layer, srs, ogr.wkbPoint25D)
+        for x, y, z in df.values:
+            feature = ogr.Feature(src_layer.GetLayerDefn())
+            point = ogr.Geometry(ogr.wkbPoint25D)
+            point.AddPoint(float(x), float(y), float(z))
+            feature.SetGeometry(point)
+            src_layer.CreateFeature(feature)
+
+        out_ds = gdal.Grid(str(out_file), src_ds, options=grid_args)
+        if out_ds is None:
+            return gdal.GetLastErrorMsg() or 'gdal.Grid failed for {}'.format(
+                layer)
+        # close to flush raster to disk
+        out_ds = None
+        src_ds = None
+
+    def _run_gdal_grid_cli(self, layer, out_dir, grid_args):
+        """
+        Run the gdal_grid command line tool in ``out_dir`` on a vrt of a 
+        temporary point CSV. Returns stderr if interpolation failed.
+        """
+        # build vrt files in out_dir, tmp point CSV is unique for layer
+        source = self._make_pt_vrt(layer, out_dir)
+        cmd = 'gdal_grid {args} -l {source} {vrt} {out}'.format(
+            args=grid_args, source=source, vrt='{}.vrt'.format(layer), 
+            out='{}.tiff'.format(layer))
+        # run gdal_grid with arguments in out_dir, x-platform
+        p = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE, cwd=str(out_dir))
+        out, err = p.communicate()
+        p.stdout.close()
+        p.stderr.close()    
+        # delete tmp point CSV used by vrt
+        tmp_csv = Path(self.summary_csv_path).parent/'{}.csv'.format(source)
+        if tmp_csv.is_file():
+            tmp_csv.unlink()
+
+        return err
                 
                 
 def _prettify(elem):
@@ -6,13 +6,8 @@ import click
 import os
 import logging
 
-from gridwxcomp.calc_bias_ratios import calc_bias_ratios as calc_ratios
-from gridwxcomp.daily_comparison import daily_comparison as daily_comp
-from gridwxcomp.monthly_comparison import monthly_comparison as monthly_comp
-from gridwxcomp.download_gridmet_ee import download_gridmet_ee as download
-from gridwxcomp.prep_input import prep_input as prep
-from gridwxcomp.spatial import main as interp 
-
+# gridwxcomp submodules are imported by each command so that a command 
+# only loads its own dependencies, e.g. Earth Engine, GDAL, or bokeh
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
 
@@ -88,6 +83,7 @@ def prep_input(station_meta_path, out_path, gridmet_meta, quiet):
         logging.getLogger().setLevel(logging.ERROR)
     else:
         logging.getLogger().setLevel(logging.INFO)
+    from gridwxcomp.prep_input import prep_input as prep
     # calling gridwxcomp.prep_input 
     prep(
             station_meta_path, 
@@ -103,9 +99,16 @@ def prep_input(station_meta_path, out_path, gridmet_meta, quiet):
         help='Year(s) to download, single year (YYYY) or range (YYYY-YYYY)')
 @click.option('--update-years', '-u', nargs=1, type=str, default=None,
         help='Year(s) to redownload or update, YYYY or YYYY-YYYY')
+@click.option('--batch', '-b', default=False, is_flag=True,
+        help='Extract all gridMET cells together with reduceRegions')
+@click.option('--jobs', '-j', nargs=1, type=int, default=1,
+        help='Number of threads making requests to Earth Engine')
+@click.option('--rate-limit', '-r', nargs=1, type=float, default=None,
+        help='Maximum Earth Engine requests per second')
 @click.option('--quiet', default=False, is_flag=True, 
         help='Supress command line output')
-def download_gridmet_ee(input_csv, out_dir, years, update_years, quiet):
+def download_gridmet_ee(input_csv, out_dir, years, update_years, batch, jobs,
+        rate_limit, quiet):
     """
     Download gridMET climate time series.
 
@@ -115,14 +118,19 @@ def download_gridmet_ee(input_csv, out_dir, years, update_years, quiet):
     also possible to redownload data for specified year(s). Uses the Google 
     Earth Engine Python API. If ``--out-dir`` is not specified, gridMET time 
     series CSVs are saved to a new directory named "gridmet_data" within the
-    current working directory.
+    current working directory. The ``--batch`` option requests data for all 
+    cells together which is much faster for many stations. Use ``--jobs`` to 
+    make requests in parallel threads and ``--rate-limit`` to limit the 
+    requests per second of all threads.
     """
     if quiet:
         logging.getLogger().setLevel(logging.ERROR)
     else:
         logging.getLogger().setLevel(logging.INFO)
+    from gridwxcomp.download_gridmet_ee import download_gridmet_ee as download
     # call gridwxcomp.download_gridmet_ee
-    download(input_csv, out_dir, year_filter=years, year_update=update_years)
+    download(input_csv, out_dir, year_filter=years, year_update=update_years,
+        batch=batch, workers=jobs, rate_limit=rate_limit)
 
 
 @gridwxcomp.command()
@@ -130,21 +138,35 @@ def download_gridmet_ee(input_csv, out_dir, years, update_years, quiet):
 @click.option('--out-dir', '-o', nargs=1, type=str, default='monthly_ratios',
         help='Folder to save correction ratio summary CSV files')
 @click.option('--gridmet-var', '-gv', nargs=1, type=str, default='etr_mm',
-        help='Name of gridMET climatic variable, e.g. etr_mm')
+        help='Name of gridMET climatic variable, e.g. etr_mm, comma '+\
+            'separated names, or all')
 @click.option('--station-var', '-sv', nargs=1, type=str, default=None,
-        help='Name of station climatic variable')
+        help='Name of station climatic variable, comma separated if '+\
+            'multiple gridMET variables')
 @click.option('--gridmet-id', '-id', nargs=1, type=str, default=None,
-        help='gridMET ID for calculating ratios only for stations in that cell')
+        help='gridMET ID for calculating ratios only for stations in that '+\
+            'cell, or comma separated IDs')
 @click.option('--day-limit', '-d', nargs=1, type=str, default=10,
         help='Monthly day threshold, if missing more exclude month from calc')
 @click.option('--years', '-y', nargs=1, type=str, default='all',
         help='Year(s) to use, e.g. 2010 or 2000-2010')
 @click.option('--comp', '-c', default=True, is_flag=True,
         help='Flag to NOT save comprehensive output CSV')
+@click.option('--jobs', '-j', nargs=1, type=int, default=1,
+        help='Number of processes to calculate station ratios in parallel')
+@click.option('--cache-dir', nargs=1, type=str, default=None,
+        help='Folder to store monthly sums of stations for reuse in later runs')
+@click.option('--windows', nargs=1, type=str, default=None,
+        help='Comma separated year ranges, e.g. 1980-1989,1990-1999')
+@click.option('--rolling', nargs=1, type=int, default=None,
+        help='Length in years of rolling windows within --years')
+@click.option('--checkpoint', nargs=1, type=str, default=None,
+        help='Checkpoint journal file to resume a run')
 @click.option('--quiet', default=False, is_flag=True, 
         help='Supress command line output')
 def calc_bias_ratios(input_csv, out_dir, gridmet_var, station_var, 
-        gridmet_id, day_limit, years, comp, quiet):
+        gridmet_id, day_limit, years, comp, jobs, cache_dir, windows, 
+        rolling, checkpoint, quiet):
     """
     Bias ratio statistics of station-to-gridMET. 
 
@@ -171,11 +193,21 @@ def calc_bias_ratios(input_csv, out_dir, gridmet_var, station_var,
     If ``--station-var`` is given from the default options, the corresponding
     default gridMET variable will be used, otherwise you may assign these based
     on the variable names in your station or gridMET time series files. 
+    Multiple gridMET variables may be given comma separated, or ``all``, in
+    which case each station file is read once and a pair of summary CSV
+    files is saved for each variable. With ``--cache-dir`` monthly sums of
+    each station are stored and only stations whose time series files 
+    changed are read again in later runs. ``--windows`` or ``--rolling`` 
+    calculate statistics for multiple year windows from one read of the
+    data, saved in long format with a WINDOW column. With ``--checkpoint``
+    each finished station is recorded so that a failed or interrupted run
+    resumes without recalculating those stations.
     """
     if quiet:
         logging.getLogger().setLevel(logging.ERROR)
     else:
         logging.getLogger().setLevel(logging.INFO)
+    from gridwxcomp.calc_bias_ratios import calc_bias_ratios as calc_ratios
     # call gridwxcomp.calc_bias_ratios
     calc_ratios(
         input_csv, 
@@ -185,7 +217,12 @@ def calc_bias_ratios(input_csv, out_dir, gridmet_var, station_var,
         gridmet_ID=gridmet_id, 
         day_limit=day_limit,
         years=years,
-        comp=comp
+        comp=comp,
+        workers=jobs,
+        cache_dir=cache_dir,
+        windows=windows,
+        rolling=rolling,
+        checkpoint=checkpoint
     ) 
 
 
@@ -203,6 +240,9 @@ def calc_bias_ratios(input_csv, out_dir, gridmet_var, station_var,
         help='Algorithm name for spatial interpolation')
 @click.option('--smooth', nargs=1, type=float, default=0, is_flag=False,
         help='Smoothing parameter for radial basis funciton interpolation')
+@click.option('--neighbors', nargs=1, type=int, default=None, is_flag=False,
+        help='Number of nearest stations for radial basis function '+\
+            'interpolation, default all')
 @click.option('--params', '-p', nargs=1, type=str, default=None, is_flag=False,
         help='Parameters for gdal_grid interpolation e.g. :power=2:smooth=0')
 @click.option('--no-zonal-stats', '-z', default=True, is_flag=True,
@@ -213,10 +253,16 @@ def calc_bias_ratios(input_csv, out_dir, gridmet_var, station_var,
         help='Extra command line arguments for gdal_grid interpolation')
 @click.option('--gridmet-meta', '-g', nargs=1, type=str, default=None,
               help='file path to gridmet_cell_data.csv metadata')
+@click.option('--grid-format', nargs=1, type=click.Choice(['shp','tiff','both']),
+        default='shp', help='Fishnet format, polygons (shp) or gridMET ID '+\
+            'raster (tiff)')
+@click.option('--jobs', '-j', nargs=1, type=int, default=1,
+        help='Number of processes to interpolate layers in parallel')
 @click.option('--quiet', default=False, is_flag=True, 
         help='Supress command line output')
 def spatial(summary_comp_csv, layer, out, buffer, scale, function, smooth, 
-        params, no_zonal_stats, overwrite_grid, options, gridmet_meta, quiet):
+        neighbors, params, no_zonal_stats, overwrite_grid, options, gridmet_meta, 
+        grid_format, jobs, quiet):
     """
     Spatially interpolate ratio statistics. 
 
@@ -224,9 +270,10 @@ def spatial(summary_comp_csv, layer, out, buffer, scale, function, smooth,
     ``SUMMARY_COMP_CSV`` file created by ``gridwxcomp calc-bias-ratios``. 
     Interpolation algorithms include those provided by `gdal_grid <https://www.gdal.org/gdal_grid.html>`_:
     'invdist' (default), 'invdistnn', 'linear', 'average', and 'nearest' 
-    and :class:`scipy.interpolate.Rbf`: 'multiquadric', 'inverse', 'gaussian', 'linear_rbf', 'cubic', 'quintic', and 'thin_plate'. Parameters for gdal 
+    and :class:`scipy.interpolate.RBFInterpolator`: 'multiquadric', 'inverse', 'gaussian', 'linear_rbf', 'cubic', 'quintic', and 'thin_plate'. Parameters for gdal 
     algorithms are set using ``--params`` whereas the ``--smooth`` parameter 
-    (default 0) is used by scipy radial basis functions. Default parameters 
+    (default 0) and ``--neighbors`` (default all stations) are used by scipy 
+    radial basis functions. Default parameters 
     for gdal are stored in :attr:`gridwxcomp.InterpGdal.default_params`. 
     Interpolation resampling resolution can be down- or up-scaled using 
     ``--scale-factor`` (default 0.1) which is applied to gridMET resolution of 
@@ -242,6 +289,9 @@ def spatial(summary_comp_csv, layer, out, buffer, scale, function, smooth,
     shapefiles, fishnet grid for zonal stats, and CSVs of bias ratios and zonal
     statistics are all created and stored in a file structure that is explained
     in :func:`gridwxcomp.spatial.make_grid`. and :func:`gridwxcomp.spatial.interpolate`.
+    Use ``--grid-format tiff`` to save the fishnet as a raster of gridMET IDs
+    instead of polygons for large extents. Use ``--jobs`` to interpolate 
+    layers in parallel processes.
     """
     if quiet:
         logging.getLogger().setLevel(logging.ERROR)
@@ -253,6 +303,7 @@ def spatial(summary_comp_csv, layer, out, buffer, scale, function, smooth,
     if len(layer) == 1:
         layer = layer[0] # get single layer as string
 
+    from gridwxcomp.spatial import main as interp 
     # call gridwxcomp.spatial.main
     interp(
         summary_comp_csv, 
@@ -266,7 +317,10 @@ def spatial(summary_comp_csv, layer, out, buffer, scale, function, smooth,
         zonal_stats=no_zonal_stats,
         overwrite=overwrite_grid,
         options=options,
-        gridmet_meta_path=gridmet_meta
+        gridmet_meta_path=gridmet_meta,
+        grid_format=grid_format,
+        neighbors=neighbors,
+        workers=jobs
     )
 
 @gridwxcomp.command()
@@ -305,12 +359,15 @@ def plot(input_csv, freq, out_dir, year, quiet):
         )
         return
     elif freq == 'daily':
+        from gridwxcomp.daily_comparison import daily_comparison as daily_comp
         # call gridwxcomp.daily_comparison
         daily_comp(input_csv, out_dir, year_filter=year)
     elif freq == 'monthly':
         if year:
             click.echo('\nWarning: the --year, -y option is not used for'+\
                 ' creating monthly avg. plots, all years will be used.')
+        from gridwxcomp.monthly_comparison import monthly_comparison as \
+            monthly_comp
         monthly_comp(input_csv, out_dir)
 
 
@@ -7,6 +7,10 @@ created by :mod:`gridwxcomp.calc_bias_ratios`.
 Attributes:
     CELL_SIZE (float): constant gridMET cell size in decimal degrees,
         value = 0.041666666666666664.
+    GRIDMET_LON (float): longitude of the western edge of the full gridMET
+        fishnet in decimal degrees, value = -124.78749996666667.
+    GRIDMET_LAT (float): latitude of the southern edge of the full gridMET
+        fishnet in decimal degrees, value = 25.04583333333334.
 
 Note:
     All spatial files, i.e. vector and raster files, utilize the
@@ -20,8 +24,9 @@ Todo:
 import os
 import re
 import argparse
-import copy
+import warnings
 import pkg_resources
+from functools import lru_cache
 from math import ceil, pow, sqrt
 from pathlib import Path
 from shutil import move
@@ -30,21 +35,52 @@ import fiona
 import numpy as np
 import pandas as pd
 import rasterio
-from scipy.interpolate import Rbf
-from shapely.geometry import Point, Polygon, mapping
+from scipy.interpolate import RBFInterpolator
+from shapely.geometry import Point, mapping
 from fiona import collection
 from fiona.crs import from_epsg
 from osgeo import gdal, osr, ogr
 from rasterstats import zonal_stats
 
+from gridwxcomp.util import block_means, map_workers
+
 # constant gridmet resolution in decimal degrees
 CELL_SIZE = 0.041666666666666664
+# lower left (southwest) corner of the full gridMET fishnet
+GRIDMET_LON = -124.78749996666667
+GRIDMET_LAT = 25.04583333333334
+# radial basis function options to scipy.interpolate.RBFInterpolator kernels
+_RBF_KERNELS = {
+    'multiquadric': 'multiquadric',
+    'inverse': 'inverse_multiquadric',
+    'gaussian': 'gaussian',
+    'linear_rbf': 'linear',
+    'cubic': 'cubic',
+    'quintic': 'quintic',
+    'thin_plate': 'thin_plate_spline'
+}
+# sign of each kernel relative to the scipy.interpolate.Rbf function, Rbf
+# subtracts smooth from the kernel diagonal, RBFInterpolator adds smoothing
+_RBF_KERNEL_SIGN = {
+    'multiquadric': -1,
+    'inverse_multiquadric': 1,
+    'gaussian': 1,
+    'linear': -1,
+    'cubic': 1,
+    'quintic': -1,
+    'thin_plate_spline': 1
+}
+# kernels scaled by the shape parameter in scipy.interpolate.Rbf
+_RBF_SCALED_KERNELS = ('multiquadric', 'inverse_multiquadric', 'gaussian')
+# max number of kernel matrix elements evaluated at once for rbf rasters
+_RBF_CHUNK_SIZE = 2**22
 
 OPJ = os.path.join
    
 def main(input_file_path, layer='all', out=None, buffer=25, scale_factor=0.1, 
          function='invdist', smooth=0, params=None, zonal_stats=True,
-         overwrite=False, options=None, gridmet_meta_path=None):
+         overwrite=False, options=None, gridmet_meta_path=None, 
+         grid_format='shp', neighbors=None, workers=1):
     """
     Create point shapefile of monthly mean bias ratios from comprehensive
     CSV file created by :mod:`gridwxcomp.calc_bias_ratios`. Build fishnet grid 
@@ -78,8 +114,8 @@ def main(input_file_path, layer='all', out=None, buffer=25, scale_factor=0.1,
             * 'average'
             * 'nearest'
             see `gdal_grid <https://www.gdal.org/gdal_grid.html>`_.
-            Radial basis functions, see :class:`scipy.interpolate.Rbf`, 
-            include
+            Radial basis functions, see 
+            :class:`scipy.interpolate.RBFInterpolator`, include
             * 'multiquadric'
             * 'inverse'
             * 'gaussian'
@@ -88,10 +124,18 @@ def main(input_file_path, layer='all', out=None, buffer=25, scale_factor=0.1,
             * 'quintic'
             * 'thin_plate'
         smooth (float): default 0. Smooth parameter for Rbf functions.
+        neighbors (int or None): default None. Number of nearest stations
+            used to interpolate each pixel with Rbf functions, if None all
+            stations are used.
+        workers (int): default 1. Number of processes used to interpolate
+            layers in parallel, see :func:`interpolate`.
         params (dict, str, or None): default None. Parameters for interpolation
             using gdal, see defaults in :class:`gridwxcomp.InterpGdal`.
         overwrite (bool): default False. If True overwrite the grid 
             shapefile that already exists.
+        grid_format (str): default 'shp'. Format of the fishnet grid, 
+            'shp' for a polygon shapefile, 'tiff' for a GeoTIFF raster of
+            gridMET IDs, or 'both'. See :func:`make_grid`.
         zonal_stats (bool): default True. Calculate zonal means of interpolated
             surface to gridMET cells in fishnet and save to a CSV file. 
             The CSV file will be saved to the same directory as the interpolated
@@ -196,7 +240,8 @@ def main(input_file_path, layer='all', out=None, buffer=25, scale_factor=0.1,
     make_grid(input_file_path, 
               gridmet_meta_path=gridmet_meta_path, 
               buffer=buffer, 
-              overwrite=overwrite)
+              overwrite=overwrite,
+              grid_format=grid_format)
     
     # run spatial interpolation depending on options
     interpolate(
@@ -210,7 +255,9 @@ def main(input_file_path, layer='all', out=None, buffer=25, scale_factor=0.1,
         buffer=buffer,
         zonal_stats=zonal_stats,
         options=options,
-        gridmet_meta_path=gridmet_meta_path) 
+        gridmet_meta_path=gridmet_meta_path,
+        neighbors=neighbors,
+        workers=workers) 
 
 def make_points_file(in_path):
     """
@@ -481,7 +528,7 @@ def get_subgrid_bounds(in_path, buffer):
     return bounds
 
 def make_grid(in_path, bounds=None, buffer=25, overwrite=False, 
-        gridmet_meta_path=None):
+        gridmet_meta_path=None, grid_format='shp'):
     """
     Make fishnet grid (vector file of polygon geometry) for 
     select gridMET cells based on bounding coordinates. 
@@ -489,7 +536,9 @@ def make_grid(in_path, bounds=None, buffer=25, overwrite=False,
     Add gridMET ID values to each cell based on their centroid 
     lookup in ``gridwxcomp/gridmet_cell_data.csv``. Assigns the 
     WGS84 reference coordinate system. The grid is later used to 
-    spatially interpolate point data. Modified from the 
+    spatially interpolate point data. Cell corners for the full grid are
+    calculated as arrays and the polygons and their gridMET IDs are written
+    in a single pass, based on the fishnet from the 
     `Python GDAL/OGR Cookbook <https://pcjericks.github.io/py-gdalogr-cookbook/vector_layers.html#create-fishnet-grid>`_.
     
     Arguments:
@@ -513,6 +562,10 @@ def make_grid(in_path, bounds=None, buffer=25, overwrite=False,
             States. If None it is looked for at the install directory of 
             gridwxcomp (i.e. with pip install) or within the current directory
             as "gridmet_cell_data.csv".
+        grid_format (str): default 'shp'. Format of the fishnet grid, 'shp'
+            saves the polygon shapefile "grid.shp", 'tiff' saves a GeoTIFF 
+            raster "grid.tiff" of integer gridMET IDs aligned to the gridMET
+            cells, and 'both' saves both files.
 
     Returns:
         None
@@ -553,8 +606,18 @@ def make_grid(in_path, bounds=None, buffer=25, overwrite=False,
         
         >>> spatial.make_grid(summary_file, overwrite=True, buffer=5)       
             
+        For large extents the gridMET IDs can be saved as a raster instead
+        of polygons, "grid.tiff" holds one pixel per gridMET cell with the
+        gridMET ID as its value (-999 is no data). Zonal statistics and 
+        gridMET ID lookups (see :func:`get_cell_IDs`) can use either file,
+        
+        >>> spatial.make_grid(summary_file, grid_format='tiff')
+            
     Raises:
-        FileNotFoundError: if input summary CSV file is not found. 
+        FileNotFoundError: if input summary CSV file is not found or if 
+            ``gridmet_meta_path`` is not given and "gridmet_cell_data.csv" 
+            is not found in the gridwxcomp install or current directory. 
+        ValueError: if ``grid_format`` is not 'shp', 'tiff', or 'both'.
         
     Note:
         If cells in the fishnet grid lie outside of the gridMET master 
@@ -566,26 +629,48 @@ def make_grid(in_path, bounds=None, buffer=25, overwrite=False,
     if not os.path.isfile(in_path):
         raise FileNotFoundError('Input summary CSV file given'+\
                                 ' was invalid or not found')
+    if grid_format not in ('shp', 'tiff', 'both'):
+        raise ValueError('{} is not a valid grid format, use "shp", "tiff" '\
+                'or "both"'.format(grid_format))
     # save grid to "spatial" subdirectory of in_path
     path_root = os.path.split(in_path)[0]
     out_dir = OPJ(path_root, 'spatial')
     out_path = OPJ(out_dir, 'grid.shp')
+    raster_path = OPJ(out_dir, 'grid.tiff')
+    out_paths = {
+        'shp': [out_path], 
+        'tiff': [raster_path], 
+        'both': [out_path, raster_path]
+    }.get(grid_format)
     
-    # skip building grid if already exists
-    if os.path.isfile(out_path) and not overwrite:
+    # skip building grid files that already exist
+    existing = [f for f in out_paths if os.path.isfile(f)]
+    if existing and not overwrite:
         print(
             '\nFishnet grid already exists at: \n',
-            out_path,
+            '\n'.join(existing),
             '\nnot overwriting.\n'
         )
-        return
+        out_paths = [f for f in out_paths if not f in existing]
+        if not out_paths:
+            return
     # print message if overwriting existing grid
-    elif os.path.isfile(out_path) and overwrite:
+    elif existing and overwrite:
         print(
             '\nOverwriting fishnet grid at: \n',
-            out_path,
+            '\n'.join(existing),
             '\n'
         )
+        # remove grid of the other format so it can not be used with
+        # different bounds than the new grid
+        if grid_format == 'shp' and os.path.isfile(raster_path):
+            print('Removing grid with old bounds at: \n', raster_path)
+            os.remove(raster_path)
+        elif grid_format == 'tiff' and os.path.isfile(out_path):
+            print('Removing grid with old bounds at: \n', out_path)
+            for f in Path(out_dir).glob('grid.*'):
+                if f.suffix not in ('.tiff', '.tif'):
+                    f.unlink()
     # create output directory if does not exist
     if not os.path.isdir(out_dir):
         print(
@@ -617,58 +702,91 @@ def make_grid(in_path, bounds=None, buffer=25, overwrite=False,
     # get n columns
     cols = ceil((xmax-xmin) / CELL_SIZE)
 
-    # start grid cell envelope
-    ringXleftOrigin = xmin
-    ringXrightOrigin = xmin + CELL_SIZE
-    ringYtopOrigin = ymax
-    ringYbottomOrigin = ymax - CELL_SIZE
-    
-    # add spatial reference system WGS 84, add argument to CreateLayer
-    #dest_srs = ogr.osr.SpatialReference()
-    #dest_srs.ImportFromEPSG(4326)
-    
+    # cell envelopes ordered column by column starting at the northwest 
+    # corner of the grid, each column from north to south
+    col_idx, row_idx = np.meshgrid(
+        np.arange(cols), np.arange(rows), indexing='ij'
+    )
+    left = (xmin + col_idx * CELL_SIZE).ravel()
+    right = left + CELL_SIZE
+    top = (ymax - row_idx * CELL_SIZE).ravel()
+    bottom = top - CELL_SIZE
+
+    # lookup gridMET IDs for all cells from their centroids
+    gridmet_ids = get_cell_IDs(
+        left + CELL_SIZE / 2, 
+        bottom + CELL_SIZE / 2, 
+        gridmet_meta_path=gridmet_meta_path
+    )
+    n_outside = int((gridmet_ids == -999).sum())
+    if n_outside > 0:
+        print(
+            '\n', n_outside, 'cell(s) fall outside of the gridMET dataset, ',
+            'assigning GRIDMET_ID attribute -999'
+        )
+
+    # save gridMET IDs as raster, cells are ordered column by column
+    if raster_path in out_paths:
+        _write_id_raster(
+            raster_path, 
+            gridmet_ids.reshape(cols, rows).T, 
+            xmin, 
+            ymax
+        )
+        print(
+            '\nFishnet raster of gridMET IDs successfully saved to: \n',
+            os.path.abspath(raster_path),
+            '\n'
+        )
+        if not out_path in out_paths:
+            return
+
+    # well-known binary polygons for all cells, one closed ring each
+    wkb = np.zeros(left.size, dtype=[
+        ('byte_order', 'u1'), 
+        ('geom_type', '<u4'), 
+        ('n_rings', '<u4'), 
+        ('n_points', '<u4'), 
+        ('ring', '<f8', (5, 2))
+    ])
+    wkb['byte_order'] = 1 # little endian
+    wkb['geom_type'] = ogr.wkbPolygon
+    wkb['n_rings'] = 1
+    wkb['n_points'] = 5
+    wkb['ring'][:,:,0] = np.column_stack([left, right, right, left, left])
+    wkb['ring'][:,:,1] = np.column_stack([top, top, bottom, bottom, top])
+    wkb_size = wkb.dtype.itemsize
+    wkb = wkb.tobytes()
+
+    # WGS 84 projection
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(4326)
+
     # create output file
     outDriver = ogr.GetDriverByName('ESRI Shapefile')
     if os.path.exists(out_path):
-        os.remove(out_path)
+        outDriver.DeleteDataSource(out_path)
     outDataSource = outDriver.CreateDataSource(out_path)
-    outLayer = outDataSource.CreateLayer(out_path,geom_type=ogr.wkbPolygon )
+    outLayer = outDataSource.CreateLayer(
+        'grid', 
+        srs=srs, 
+        geom_type=ogr.wkbPolygon,
+        options=['ENCODING=UTF-8']
+    )
+    outLayer.CreateField(ogr.FieldDefn('GRIDMET_ID', ogr.OFTInteger))
     featureDefn = outLayer.GetLayerDefn()
 
-    # create grid cells
-    countcols = 0
-    while countcols < cols:
-        countcols += 1
-
-        # reset envelope for rows
-        ringYtop = ringYtopOrigin
-        ringYbottom = ringYbottomOrigin
-        countrows = 0
-
-        while countrows < rows:
-            countrows += 1
-            ring = ogr.Geometry(ogr.wkbLinearRing)
-            ring.AddPoint(ringXleftOrigin, ringYtop)
-            ring.AddPoint(ringXrightOrigin, ringYtop)
-            ring.AddPoint(ringXrightOrigin, ringYbottom)
-            ring.AddPoint(ringXleftOrigin, ringYbottom)
-            ring.AddPoint(ringXleftOrigin, ringYtop)
-            poly = ogr.Geometry(ogr.wkbPolygon)
-            poly.AddGeometry(ring)
-
-            # add new geom to layer
-            outFeature = ogr.Feature(featureDefn)
-            outFeature.SetGeometry(poly)
-            outLayer.CreateFeature(outFeature)
-            outFeature = None
-
-            # new envelope for next poly
-            ringYtop = ringYtop - CELL_SIZE
-            ringYbottom = ringYbottom - CELL_SIZE
-
-        # new envelope for next poly
-        ringXleftOrigin = ringXleftOrigin + CELL_SIZE
-        ringXrightOrigin = ringXrightOrigin + CELL_SIZE
+    # write all grid cells in one transaction
+    outLayer.StartTransaction()
+    for i, gridmet_id in enumerate(gridmet_ids.tolist()):
+        outFeature = ogr.Feature(featureDefn)
+        outFeature.SetGeometryDirectly(
+            ogr.CreateGeometryFromWkb(wkb[i*wkb_size:(i+1)*wkb_size])
+        )
+        outFeature.SetField('GRIDMET_ID', gridmet_id)
+        outLayer.CreateFeature(outFeature)
+        outFeature = None
+    outLayer.CommitTransaction()
 
     # Save and close DataSources
     outDataSource = None
@@ -678,82 +796,146 @@ def make_grid(in_path, bounds=None, buffer=25, overwrite=False,
         os.path.abspath(out_path),
         '\n'
     )
-    # reopen grid and assign gridMET attribute and coord. ref.
-    _update_subgrid(out_path, gridmet_meta_path=gridmet_meta_path)
 
-def get_cell_ID(coords, cell_data):
+def _write_id_raster(out_path, gridmet_ids, xmin, ymax):
     """
-    Helper function that calculates the gridMET ID for gridMET cells using
-    the coordinates of a cell in the fishnet grid. Uses the
-    :class:`Fiona.geometry.Polygon` object to calculate centroids for
-    gridMET cells, then lookup gridMET ID from gridmet_cells_data.csv
-    
+    Helper function to save a 2-D array of gridMET IDs as an integer GeoTIFF 
+    with WGS 84 projection and gridMET resolution. ``xmin`` and ``ymax`` 
+    are the coordinates of the upper left corner of the array.
+    """
+    n_rows, n_cols = gridmet_ids.shape
+    driver = gdal.GetDriverByName('GTiff')
+    ds = driver.Create(
+        out_path,
+        n_cols, 
+        n_rows, 
+        1, 
+        gdal.GDT_Int32,
+        options=['COMPRESS=DEFLATE']
+    )
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(4326)
+    ds.SetProjection(srs.ExportToWkt())
+    ds.SetGeoTransform([xmin, CELL_SIZE, 0, ymax, 0, -CELL_SIZE])
+    outband = ds.GetRasterBand(1)
+    outband.SetNoDataValue(-999)
+    outband.WriteArray(gridmet_ids.astype(np.int32))
+    ds = None
+
+def _read_id_raster(grid_raster):
+    """
+    Helper function to read a gridMET ID raster created by :func:`make_grid`.
+    Returns the 2-D integer array of gridMET IDs and the longitude and 
+    latitude of its upper left corner.
+    """
+    with rasterio.open(grid_raster) as src:
+        gridmet_ids = src.read(1)
+        xmin, ymax = src.transform.c, src.transform.f
+
+    return gridmet_ids, xmin, ymax
+
+def gridmet_row_col(lons, lats):
+    """
+    Calculate row and column indices of the gridMET cells that contain 
+    coordinates. Indices are relative to the southwest corner of the full 
+    gridMET fishnet, i.e. rows increase to the north and columns to the 
+    east, the same reference used by :func:`gridwxcomp.prep_input.gridMET_centroid`.
+
     Arguments:
-        coords (list): list of coordinates that constitute a polygon for a 
-            gridMET cell. Coordinates must be acceptable as arguments to
-            :class:`fiona.geometry.Polygon`.
-        cell_data (:obj:`pandas.DataFrame`): pandas dataframe of the 
-            gridMET metadata CSV file "gridmet_cell_data.csv".
-        
+        lons (float or array-like): decimal degree longitude(s).
+        lats (float or array-like): decimal degree latitude(s).
+
     Returns:
-        gridmet_id (int): gridMET ID value for gridMET cell that is defined
-            by the bounding polygon defined by ``coords``.
-            
+        rows, cols (tuple): tuple of :obj:`numpy.ndarray` integer row and 
+            column indices for each coordinate pair.
+
     """
-    poly = Polygon(coords)
-    lon_c = poly.bounds[0] + CELL_SIZE / 2
-    lat_c = poly.bounds[1] + CELL_SIZE / 2
-    
-    # use centroid of cell and centroid coords in cell_data
-    row = cell_data.loc[
-            (np.isclose(cell_data.LON, lon_c)) & (np.isclose(cell_data.LAT, lat_c))
-            ]
-    
-    # if cell falls outside of master gridMET fishnet assign -999 id
-    if len(row.GRIDMET_ID.values) == 1:
-        gridmet_id = int(row.GRIDMET_ID.values[0])
-    else:
-        print(
-            'Cell centroid (lat, long): {:9.4f}, {:9.4f}'.format(lat_c, lon_c),
-            '\nfalls outside of the gridMET dataset, ',
-            'assigning GRIDMET_ID attribute -999'
-        )
-        gridmet_id = -999
-    
-    return gridmet_id
+    lons = np.asarray(lons, dtype=float)
+    lats = np.asarray(lats, dtype=float)
+    cols = np.floor((lons - GRIDMET_LON) / CELL_SIZE).astype(int)
+    rows = np.floor((lats - GRIDMET_LAT) / CELL_SIZE).astype(int)
+
+    return rows, cols
 
-def _update_subgrid(grid_path, gridmet_meta_path=None):
+def get_cell_IDs(lons, lats, gridmet_meta_path=None, grid_raster=None):
     """
-    Helper function to assign gridMET ID values and EPSG WGS 84 
-    projection to fishnet grid.
+    Vectorized lookup of gridMET ID values for the gridMET cells that 
+    contain coordinates, e.g. cell centroids of a fishnet grid. 
     
+    Instead of searching "gridmet_cell_data.csv" for each coordinate 
+    the metadata is indexed once into a (row, col) array of gridMET IDs 
+    and IDs are found by their row and column in the gridMET fishnet, see
+    :func:`gridmet_row_col`.
+
     Arguments:
-        grid_path (str): path to fishnet grid shapefile for subset of
-            gridMET cells which contain climate stations.
-            
+        lons (float or array-like): decimal degree longitude(s).
+        lats (float or array-like): decimal degree latitude(s).
+
     Keyword Arguments:
         gridmet_meta_path (str): default None. Path to metadata CSV file 
             that contains all gridMET cells for the contiguous United 
             States. If None it is looked for at the install directory of 
             gridwxcomp (i.e. with pip install) or within the current directory
             as "gridmet_cell_data.csv".
+        grid_raster (str): default None. Path to a raster of gridMET IDs 
+            created by :func:`make_grid` with ``grid_format`` 'tiff' or 
+            'both', e.g. "spatial/grid.tiff". If given, IDs are indexed from
+            the raster and ``gridmet_meta_path`` is not used.
 
     Returns:
-        None
-        
-    Raises:
-        FileNotFoundError: if ``grid_path`` or ``gridmet_meta_path`` 
-        are not found. If ``gridmet_meta_path`` is not passed as a 
-        command line argument and is not found in the gridwxcomp install
-        directory and it is not in the current working directory
-        and named "gridmet_cell_data.csv".    
-        
+        gridmet_ids (:obj:`numpy.ndarray`): integer gridMET IDs, coordinates
+            that fall outside of the gridMET dataset (or ``grid_raster``) 
+            are assigned -999.
+
+    Example:
+        >>> from gridwxcomp import spatial
+        >>> spatial.get_cell_IDs([-111.7250, -111.6833], [40.4417, 40.4417])
+        array([511747, 511748])
+
+    """
+    if grid_raster:
+        lookup, xmin, ymax = _read_id_raster(grid_raster)
+        # raster rows are ordered from north to south
+        lons = np.asarray(lons, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        cols = np.floor((lons - xmin) / CELL_SIZE).astype(int)
+        rows = np.floor((ymax - lats) / CELL_SIZE).astype(int)
+    else:
+        gridmet_meta_path = _get_gridmet_meta_path(gridmet_meta_path)
+        lookup = _gridmet_id_lookup(os.path.abspath(gridmet_meta_path))
+        rows, cols = gridmet_row_col(lons, lats)
+
+    inside = (rows >= 0) & (rows < lookup.shape[0]) &\
+        (cols >= 0) & (cols < lookup.shape[1])
+    gridmet_ids = np.full(rows.shape, -999, dtype=int)
+    gridmet_ids[inside] = lookup[rows[inside], cols[inside]]
+
+    return gridmet_ids
+
+@lru_cache(maxsize=4)
+def _gridmet_id_lookup(gridmet_meta_path):
     """
+    Helper function that builds a 2-D array of gridMET IDs indexed by the 
+    (row, col) of each cell in the full gridMET fishnet from the gridMET 
+    metadata CSV. Cells that are not in the metadata are assigned -999.
+    Cached so that the metadata CSV is only read once per path.
+    """
+    cell_data = pd.read_csv(
+        gridmet_meta_path, 
+        usecols=['GRIDMET_ID', 'LAT', 'LON']
+    )
+    # centroids are offset half a cell from the cell edges
+    rows, cols = gridmet_row_col(cell_data.LON.values, cell_data.LAT.values)
+    lookup = np.full((rows.max() + 1, cols.max() + 1), -999, dtype=int)
+    lookup[rows, cols] = cell_data.GRIDMET_ID.values
 
-    if not os.path.isfile(grid_path):
-        raise FileNotFoundError('The file path for the gridMET fishnet '\
-                               +'was invalid or does not exist. ')
-    # look for pacakged gridmet_cell_data.csv if path not given
+    return lookup
+
+def _get_gridmet_meta_path(gridmet_meta_path=None):
+    """
+    Helper function to look for packaged gridmet_cell_data.csv if path not 
+    given, raise FileNotFoundError if it is not found.
+    """
     if not gridmet_meta_path:
         try:
             if pkg_resources.resource_exists('gridwxcomp', 
@@ -763,64 +945,21 @@ def _update_subgrid(grid_path, gridmet_meta_path=None):
                     "gridmet_cell_data.csv"
                     )
         except:
-            gridmet_meta_path = 'gridmet_cell_data.csv'
+            gridmet_meta_path = None
+    if not gridmet_meta_path:
+        gridmet_meta_path = 'gridmet_cell_data.csv'
     if not os.path.exists(gridmet_meta_path):
         raise FileNotFoundError('GridMET file path was not given and '+\
                 'gridmet_cell_data.csv was not found in the gridwxcomp '+\
                 'install directory. Please assign the path or put '+\
                 '"gridmet_cell_data.csv" in the current working directory.\n')
-      
-    tmp_out = grid_path.replace('.shp', '_tmp.shp')
-
-    # load gridMET metadata file for looking up gridMET IDs
-    gridmet_meta_df = pd.read_csv(gridmet_meta_path)
-    # WGS 84 projection
-    crs = from_epsg(4326) 
 
-    # overwrite fishnet grid with updated GRIDMET_ID field
-    with fiona.open(grid_path, 'r') as source:
-        print(
-            'Adding gridMET IDs to fishnet grid, saving to: \n',
-             os.path.abspath(grid_path), '\n'
-        )
-        
-        n_cells = len([f for f in source])
-        print(
-            'Looking up and assigning values for ', n_cells, 
-            ' gridcells.\n'
-        )        
-        
-        # Copy the source schema and add GRIDMET_ID property.
-        sink_schema = source.schema
-        sink_schema['properties']['GRIDMET_ID'] = 'int'
-        # overwrite file add spatial reference
-        with fiona.open(
-                tmp_out, 
-                'w', 
-                crs=crs, 
-                driver=source.driver, 
-                schema=sink_schema
-            ) as sink:
-            # add GRIDMET_ID feature to outfile
-            for feature in source:
-                coords = feature['geometry']['coordinates'][0]
-                gridmet_id = get_cell_ID(coords, gridmet_meta_df)
-                feature['properties']['GRIDMET_ID'] = gridmet_id
-                sink.write(feature)
-    # cannot open same file and write to it on Windows, overwrite temp
-    root_dir = os.path.split(grid_path)[0]
-    for f in os.listdir(root_dir):
-        if '_tmp' in f:
-            move(OPJ(root_dir, f), OPJ(root_dir, f.replace('_tmp', '')))
-    print(
-        'Completed assigning gridMET IDs to fishnet. \n'
-    )
+    return gridmet_meta_path
 
-    
 def interpolate(in_path, layer='all', out=None, scale_factor=0.1, 
                 function='invdist', smooth=0, params=None, bounds=None, 
                 buffer=25, zonal_stats=True, options=None, 
-                gridmet_meta_path=None):
+                gridmet_meta_path=None, neighbors=None, workers=1):
     """
     Use various methods to interpolate a 2-dimensional surface of
     calculated bias ratios or other statistics for station/gridMET
@@ -848,9 +987,10 @@ def interpolate(in_path, layer='all', out=None, scale_factor=0.1,
         function (str): default 'invdist'. Interpolation method, gdal 
             methods include: 'invdist', 'indistnn', 'linear', 'average',
             and 'nearest' see `gdal_grid <https://www.gdal.org/gdal_grid.html>`_.
-            Radial basis functions, see :class:`scipy.interpolate.Rbf`, 
-            include: 'multiquadric', 'inverse', 'gaussian', 'linear_rbf',
-            'cubic', 'quintic', and 'thin_plate'.
+            Radial basis functions, see 
+            :class:`scipy.interpolate.RBFInterpolator`, include: 
+            'multiquadric', 'inverse', 'gaussian', 'linear_rbf', 'cubic', 
+            'quintic', and 'thin_plate'.
         smooth (float): default 0. Smooth parameter for Rbf functions.
         params (dict, str, or None): default None. Parameters for interpolation
             using gdal, see defaults in :class:`gridwxcomp.InterpGdal`.
@@ -873,6 +1013,14 @@ def interpolate(in_path, layer='all', out=None, scale_factor=0.1,
             States. If None it is looked for at the install directory of 
             gridwxcomp (e.g. after pip install gridwxcomp) or within the 
             current directory as 'gridmet_cell_data.csv'.
+        neighbors (int or None): default None. Number of nearest stations
+            used to interpolate each pixel with Rbf functions, if None all
+            stations are used. Local neighborhoods scale to many stations
+            and large or fine resolution extents.
+        workers (int): default 1. Number of processes used to interpolate
+            layers in parallel, including point errors and zonal means. 
+            The summary CSV, point shapefile, and "gridMET_stats.csv" are 
+            written once after all layers are finished.
 
     Returns:
         None
@@ -999,21 +1147,7 @@ def interpolate(in_path, layer='all', out=None, scale_factor=0.1,
         raise FileNotFoundError('Input summary CSV file given'+\
                                 ' was invalid or not found')
     # look for packaged gridmet_cell_data.csv if path not given
-    if not gridmet_meta_path:
-        try:
-            if pkg_resources.resource_exists('gridwxcomp', 
-                    "gridmet_cell_data.csv"):
-                gridmet_meta_path = pkg_resources.resource_filename(
-                    'gridwxcomp', 
-                    "gridmet_cell_data.csv"
-                    )
-        except:
-            gridmet_meta_path = 'gridmet_cell_data.csv'
-    if not os.path.exists(gridmet_meta_path):
-        raise FileNotFoundError('GridMET file path was not given and '+\
-                'gridmet_cell_data.csv was not found in the gridwxcomp '+\
-                'install directory. Please assign the path or put '+\
-                '"gridmet_cell_data.csv" in the current working directory.\n')
+    gridmet_meta_path = _get_gridmet_meta_path(gridmet_meta_path)
     # calc raster resolution in meters (as frac of 4 km)
     res = int(4 * scale_factor * 1000)
     # path to save raster of interpolated grid scaled by scale_factor
@@ -1041,142 +1175,6 @@ def interpolate(in_path, layer='all', out=None, scale_factor=0.1,
         Path(out_dir).mkdir(parents=True, exist_ok=True)
     
     
-    def _run_rbf_interpolation(layer, bounds, function, smooth):
-        """Workflow for running scipy Rbf interpolation of scatter points"""
-        out_file = OPJ(
-            out_dir, 
-            '{time_agg}.tiff'.format(time_agg=layer)
-        )
-        print(
-            '\nInterpolating {g} point bias ratios for: {t}\n'.\
-                format(g=grid_var, t=layer),
-            'Using the "{}" method\n'.format(function),
-            'Resolution (pixel size) of output raster: {} m'.format(res)
-        )
-        print(            
-            'GeoTIFF raster will be saved to: \n',
-            os.path.abspath(out_file)
-        )
-        # get grid extent based on station locations in CSV
-        if not bounds:
-            bounds = get_subgrid_bounds(in_path, buffer=buffer) 
-        lon_min, lon_max, lat_min, lat_max = bounds
-        # check if layer is in summary CSV 
-        existing_layers = pd.read_csv(in_path).columns
-        if not layer in existing_layers:
-            print('column {} does not exist in input CSV:\n {}'.format(
-               layer, in_path),
-                 '\nSkipping interpolation.'
-            )
-            return
-        
-        # get point station data from summary CSV
-        in_df = pd.read_csv(in_path, na_values=[-999])
-        lon_pts, lat_pts = in_df.STATION_LON.values, in_df.STATION_LAT.values
-        values = in_df[layer].values
-    
-        # mask out stations with missing data
-        if in_df[layer].isnull().sum() > 0:
-            mask = in_df[layer].notnull()
-            n_missing = in_df[layer].isna().sum()
-            # if one point or less data points exists exit
-            if len(mask) == n_missing or len(mask) == 1:
-                print('Missing sufficient bias ratios for variable: {} {}'.\
-                        format(grid_var, layer),
-                        '\nNeed at least two stations with data, skipping.')
-                return
-            print('Warning:\n',
-                    'Data missing for {} of {} stations for variable: {} {}'.\
-                    format(n_missing, len(values), grid_var, layer),
-                    '\nproceeding with interpolation.')
-            # get locations where ratio is not nan
-            values = values[mask]
-            lon_pts = lon_pts[mask]
-            lat_pts = lat_pts[mask]
-
-        nx_cells = int(np.round(np.abs((lon_min - lon_max) / CELL_SIZE)))
-        ny_cells = int(np.round(np.abs((lat_min - lat_max) / CELL_SIZE)))
-        # rbf requires uniform grid (n X n) so 
-        # extend short dimension and clip later 
-        nx_cells_out = copy.copy(nx_cells)
-        ny_cells_out = copy.copy(ny_cells)
-        # gdal requires "upper left" corner coordinates
-        lat_max_out = copy.copy(lat_max)
-        lon_max_out = copy.copy(lon_max)
-        # extend short dimension to make square grid
-        if not nx_cells == ny_cells:
-            diff = np.abs(nx_cells - ny_cells)
-            if nx_cells > ny_cells:
-                lat_max += diff * CELL_SIZE
-                ny_cells += diff
-            else:
-                lon_max += diff * CELL_SIZE
-                nx_cells += diff
-
-        # make finer/coarse grid by scale factor
-        lons = np.linspace(lon_min, lon_max, 
-                int(np.round(nx_cells/scale_factor))+1)
-        lats = np.linspace(lat_min, lat_max, 
-                int(np.round(ny_cells/scale_factor))+1)
-        # extent for original created by spatial.build_subgrid
-        # add one to make sure raster covers full extent
-        lons_out = np.linspace(lon_min, lon_max_out, 
-                int(np.round(nx_cells_out/scale_factor))+1)
-        lats_out = np.linspace(lat_min, lat_max_out, 
-                int(np.round(ny_cells_out/scale_factor))+1)
-
-        # if function was 'linear_rbf' 
-        function = function.replace('_rbf', '')
-        # make sampling square grid
-        XI, YI = np.meshgrid(lons, lats)
-        # apply rbf interpolation
-        rbf = Rbf(lon_pts, lat_pts, values, function=function, smooth=smooth)
-        ZI = rbf(XI, YI)
-        # clip to original extent, rbf array flips axes, and row order... 
-        ZI_out = ZI[0:len(lats_out),0:len(lons_out)]
-        ZI_out = np.flip(ZI_out,axis=0)
-
-        #### save scipy interpolated data as raster 
-        pixel_size = CELL_SIZE * scale_factor
-        # number of pixels in each direction
-        x_size = len(lons_out)
-        y_size = len(lats_out)
-        # set geotransform info
-        gt = [
-                lon_min,
-                pixel_size,
-                0,
-                lat_max_out,
-                0,
-                -pixel_size
-        ]
-        # make geotiff raster
-        driver = gdal.GetDriverByName('GTiff')
-        ds = driver.Create(
-            out_file,
-            x_size, 
-            y_size, 
-            1, 
-            gdal.GDT_Float32, 
-        )
-        # set projection geographic lat/lon WGS 84
-        srs = osr.SpatialReference()
-        srs.ImportFromEPSG(4326)
-        ds.SetProjection(srs.ExportToWkt())
-        # assign spatial dimensions 
-        ds.SetGeoTransform(gt)
-        outband = ds.GetRasterBand(1)
-        # save rbf interpolated array as geotiff raster close
-        outband.WriteArray(ZI_out)
-        ds = None
-
-        # calc residuals add to shapefile and in_path CSV, move shape to out_dir
-        calc_pt_error(in_path, out_dir, layer, grid_var)
-        # calculate zonal statistics save means for each gridMET cell
-        if zonal_stats:
-            gridmet_zonal_stats(in_path, out_file)
-
-        
     # run gdal_grid interpolation 
     if function in InterpGdal.interp_methods:
         if not bounds:
@@ -1185,33 +1183,277 @@ def interpolate(in_path, layer='all', out=None, scale_factor=0.1,
         gg = InterpGdal(in_path)
         gg.gdal_grid(layer=layer, out_dir=out_dir, interp_meth=function,
                     params=params, bounds=bounds, scale_factor=scale_factor,
-                    zonal_stats=zonal_stats, options=options)
+                    zonal_stats=zonal_stats, options=options, workers=workers)
         
     # scipy radial basis function interpolation for now
     # run interpolation and zonal statistics depending on layer kwarg
     else: 
-        if layer == 'all': # potential for multiprocessing
-            for l in InterpGdal.default_layers:
-                _run_rbf_interpolation(l, bounds, function, smooth)
+        if layer == 'all':
+            layers = InterpGdal.default_layers
         # single layer option
         elif isinstance(layer, str):
-            _run_rbf_interpolation(layer, bounds, function, smooth)
+            layers = [layer]
         # run select list or tuple of layers
         elif isinstance(layer, (list, tuple)):
-            for l in layer:
-                _run_rbf_interpolation(l, bounds, function, smooth)
+            layers = layer
+        # get grid extent based on station locations in CSV
+        if not bounds:
+            bounds = get_subgrid_bounds(in_path, buffer=buffer) 
+        # layers with the same stations are solved together, split groups
+        # of layers between workers
+        tasks = []
+        for mask, group in _rbf_layer_groups(in_path, layers, grid_var):
+            n_split = min(max(int(workers), 1), len(group))
+            for sub_group in np.array_split(np.array(group), n_split):
+                tasks.append((in_path, out_dir, list(sub_group), mask, bounds, 
+                    scale_factor, function, smooth, neighbors, zonal_stats))
+        results = map_workers(_rbf_interpolation_task, tasks, workers=workers)
+        # residuals to point shapefile and in_path CSV, zonal means to 
+        # gridMET_stats.csv, files are written once for all layers
+        _save_layer_results(in_path, out_dir, grid_var, results, layers)
+
+def _rbf_layer_groups(in_path, layers, grid_var):
+    """
+    Helper function to check layers for Rbf interpolation in summary CSV
+    ``in_path`` and group them by the stations that have data. Returns a
+    list of (mask, layers) tuples where mask is a boolean array of stations
+    with data, layers missing from the CSV or with less than two stations
+    are skipped.
+    """
+    in_df = pd.read_csv(in_path, na_values=[-999])
+    groups = {}
+    for layer in layers:
+        # check if layer is in summary CSV 
+        if not layer in in_df.columns:
+            print('column {} does not exist in input CSV:\n {}'.format(
+               layer, in_path),
+                 '\nSkipping interpolation.'
+            )
+            continue
+        # mask out stations with missing data
+        mask = in_df[layer].notnull().values
+        n_missing = (~mask).sum()
+        # if one point or less data points exists skip
+        if mask.sum() < 2:
+            print('Missing sufficient bias ratios for variable: {} {}'.\
+                    format(grid_var, layer),
+                    '\nNeed at least two stations with data, skipping.')
+            continue
+        if n_missing > 0:
+            print('Warning:\n',
+                    'Data missing for {} of {} stations for variable: {} {}'.\
+                    format(n_missing, len(mask), grid_var, layer),
+                    '\nproceeding with interpolation.')
+        groups.setdefault(mask.tobytes(), (mask, []))[1].append(layer)
+
+    return list(groups.values())
+
+def _rbf_interpolation_task(in_path, out_dir, layers, mask, bounds, 
+        scale_factor, function, smooth, neighbors, zonal_stats):
+    """
+    Workflow for running scipy Rbf interpolation of scatter points for 
+    layers that share stations with data (``mask``), run in a worker 
+    process by :func:`interpolate`. Rasters are saved to ``out_dir``, 
+    point estimates and zonal means are returned to be saved once for 
+    all layers by :func:`_save_layer_results`.
+    """
+    grid_var = Path(in_path).name.split('_summ')[0]
+    res = int(4 * scale_factor * 1000)
+    lon_min, lon_max, lat_min, lat_max = bounds
+    # get point station data from summary CSV
+    in_df = pd.read_csv(in_path, na_values=[-999])
+    lon_pts, lat_pts = in_df.STATION_LON.values, in_df.STATION_LAT.values
+
+    nx_cells = int(np.round(np.abs((lon_min - lon_max) / CELL_SIZE)))
+    ny_cells = int(np.round(np.abs((lat_min - lat_max) / CELL_SIZE)))
+    pixel_size = CELL_SIZE * scale_factor
+    # pixel coordinates of the rectangular extent created by make_grid,
+    # add one to make sure raster covers full extent, rows north to south
+    nx_out = int(np.round(nx_cells/scale_factor)) + 1
+    ny_out = int(np.round(ny_cells/scale_factor)) + 1
+    lons_out = lon_min + np.arange(nx_out) * pixel_size
+    lats_out = lat_min + np.arange(ny_out)[::-1] * pixel_size
+    # set geotransform info, gdal requires "upper left" corner
+    gt = [
+            lon_min,
+            pixel_size,
+            0,
+            lat_max,
+            0,
+            -pixel_size
+    ]
+
+    # apply rbf interpolation to all layers at once
+    ZI = _rbf_interpolate(lon_pts[mask], lat_pts[mask], 
+        in_df.loc[mask, layers].values, lons_out, lats_out, 
+        function=function, smooth=smooth, neighbors=neighbors)
+
+    out_files = []
+    for i, layer in enumerate(layers):
+        out_file = OPJ(
+            out_dir, 
+            '{time_agg}.tiff'.format(time_agg=layer)
+        )
+        print(
+            '\nInterpolating {g} point bias ratios for: {t}\n'.\
+                format(g=grid_var, t=layer),
+            'Using the "{}" method\n'.format(function),
+            'Resolution (pixel size) of output raster: {} m'.format(res)
+        )
+        print(            
+            'GeoTIFF raster will be saved to: \n',
+            os.path.abspath(out_file)
+        )
+        _write_rbf_raster(out_file, ZI[:, :, i], gt)
+        out_files.append(out_file)
+
+    return _layer_results(in_path, out_dir, out_files, zonal_stats)
+
+def _layer_results(in_path, out_dir, rasters, zonal_stats=True):
+    """
+    Helper function to calculate point estimates and residuals and, if 
+    ``zonal_stats``, zonal means for interpolated ``rasters`` without 
+    writing any files. Returns a tuple (rasters, point errors, zonal 
+    means or None) to be saved by :func:`_save_layer_results`.
+    """
+    pt_err = _calc_pt_estimates(
+        in_path, out_dir, [Path(r).stem for r in rasters]
+    )
+    zonal_df = None
+    if zonal_stats and rasters:
+        zonal_df, _ = _gridmet_zonal_means(in_path, rasters)
+
+    return rasters, pt_err, zonal_df
+
+def _save_layer_results(in_path, out_dir, grid_var, results, layers=None):
+    """
+    Helper function to merge results of :func:`_layer_results` for 
+    multiple layers and to save point errors to the summary CSV and point
+    shapefile and zonal means to "gridMET_stats.csv" once. Columns are
+    ordered by ``layers`` if given, otherwise in the order of ``results``.
+    Returns the list of all interpolated rasters.
+    """
+    rasters = [r for result in results for r in result[0]]
+    if not rasters:
+        return rasters
+
+    pt_err = pd.concat([result[1] for result in results], axis=1)
+    if layers is not None:
+        pt_cols = [c for l in layers for c in _pt_field_names(l)]
+        pt_err = pt_err[[c for c in pt_cols if c in pt_err.columns]]
+    _save_pt_error(in_path, out_dir, grid_var, pt_err)
+
+    zonal_dfs = [result[2] for result in results if result[2] is not None]
+    if zonal_dfs:
+        out_df = pd.concat(
+            [df.set_index('GRIDMET_ID') for df in zonal_dfs], axis=1
+        )
+        if layers is not None:
+            out_df = out_df[[l for l in layers if l in out_df.columns]]
+        out_df = out_df.reset_index()
+        out_file = OPJ(os.path.split(str(rasters[0]))[0], 'gridMET_stats.csv')
+        _save_zonal_stats(out_df, out_file)
+
+    return rasters
+
+def _write_rbf_raster(out_file, array, gt):
+    """
+    Helper function to save a 2-D array interpolated by 
+    :func:`_rbf_interpolate` as a single band GeoTIFF raster with 
+    geotransform ``gt`` in geographic lat/lon WGS 84.
+    """
+    # make geotiff raster
+    driver = gdal.GetDriverByName('GTiff')
+    ds = driver.Create(
+        out_file,
+        array.shape[1], 
+        array.shape[0], 
+        1, 
+        gdal.GDT_Float32, 
+    )
+    # set projection geographic lat/lon WGS 84
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(4326)
+    ds.SetProjection(srs.ExportToWkt())
+    # assign spatial dimensions 
+    ds.SetGeoTransform(gt)
+    outband = ds.GetRasterBand(1)
+    # save rbf interpolated array as geotiff raster close
+    outband.WriteArray(array)
+    ds = None
+
+def _rbf_interpolate(x, y, values, xi, yi, function='multiquadric', smooth=0,
+        neighbors=None):
+    """
+    Helper function to interpolate scattered points (``x``, ``y``, 
+    ``values``) to the regular grid of pixel coordinates given by 1-D 
+    arrays ``xi`` (columns) and ``yi`` (rows) using 
+    :class:`scipy.interpolate.RBFInterpolator`. ``values`` may be 2-D 
+    with one column per layer, in which case the kernel system is 
+    factored once and solved for all layers together.
+    
+    Rbf function names of :func:`interpolate` are mapped to kernels that
+    give the same surface as :class:`scipy.interpolate.Rbf`, i.e. without 
+    a polynomial term, the Rbf shape parameter (average distance between 
+    points), and ``smooth`` subtracted from the diagonal of the Rbf kernel
+    matrix, which is the ``smoothing`` of :class:`RBFInterpolator` with the
+    sign of the kernel flipped. If ``neighbors`` is given only that many 
+    nearest stations are used for each pixel. The grid is evaluated in 
+    chunks of rows to limit memory. Returns an array with shape (len(yi), len(xi)) or, for 2-D ``values``,
+    (len(yi), len(xi), n_layers).
+    """
+    kernel = _RBF_KERNELS.get(function)
+    if kernel is None:
+        raise ValueError('{} is not a valid radial basis function, use one'\
+            ' of: {}'.format(function, ', '.join(_RBF_KERNELS)))
+
+    points = np.column_stack((x, y))
+    values = np.asarray(values, dtype=float)
+    n_pts = len(points)
+    if neighbors is not None:
+        neighbors = min(int(neighbors), n_pts)
+    # shape parameter as default in scipy.interpolate.Rbf 
+    edges = points.max(axis=0) - points.min(axis=0)
+    edges = edges[edges > 0]
+    if edges.size and kernel in _RBF_SCALED_KERNELS:
+        epsilon = 1 / np.power(np.prod(edges) / n_pts, 1 / edges.size)
+    else:
+        epsilon = 1.
+
+    # Rbf has no polynomial term, RBFInterpolator warns that conditionally
+    # positive definite kernels may then give a singular system, as in Rbf
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        rbf = RBFInterpolator(points, values, neighbors=neighbors, 
+            smoothing=-_RBF_KERNEL_SIGN[kernel] * smooth, kernel=kernel, 
+            epsilon=epsilon, degree=-1)
+
+    out = np.empty((len(yi), len(xi)) + values.shape[1:])
+    n_rows = max(1, _RBF_CHUNK_SIZE // (len(xi) * (neighbors or n_pts)))
+    for i in range(0, len(yi), n_rows):
+        XI, YI = np.meshgrid(xi, yi[i:i+n_rows])
+        out[i:i+n_rows] = rbf(
+            np.column_stack((XI.ravel(), YI.ravel()))
+        ).reshape(XI.shape + values.shape[1:])
+
+    return out
 
 def calc_pt_error(in_path, out_dir, layer, grid_var):
     """
     Calculate point ratio estimates from interpolated raster, residuals,
     and add to output summary CSV and point shapefile. Make copies of
     updated files and saves to directory with interpolated rasters.
+
+    All layers given are sampled and the summary CSV files and point 
+    shapefile are written once, i.e. pass the list of all interpolated 
+    layers after an interpolation run instead of calling once per layer.
     
     Arguments:
         in_path (str): path to comprehensive summary CSV created by 
             :mod:`gridwxcomp.calc_bias_ratios`
         out_dir (str): path to dir that contains interpolated raster
-        layer (str): layer to calculate error e.g. "annual_mean"
+        layer (str or list): layer to calculate error e.g. "annual_mean"
+            or list of layers.
         grid_var (str): name of gridMET variable e.g. "etr_mm"
 
     Returns:
@@ -1221,44 +1463,96 @@ def calc_pt_error(in_path, out_dir, layer, grid_var):
         This function should be run **after** :func:`make_points_file`
         because it copies data from the shapefile it created.
     """
-    raster = str(Path(out_dir)/'{}.tiff'.format(layer))
-    pt_shp = '{}_summary_pts.shp'.format(grid_var)
-    pt_shp = str(Path(in_path).parent/'spatial'/pt_shp)
+    if isinstance(layer, str):
+        layers = [layer]
+    else:
+        layers = list(layer)
 
-    if not Path(pt_shp).is_file():
-        make_points_file(in_path)
+    pt_err = _calc_pt_estimates(in_path, out_dir, layers)
+    _save_pt_error(in_path, out_dir, grid_var, pt_err)
 
-    pt_shp_out = str(Path(out_dir)/'{}_summary_pts.shp'.format(grid_var))
+
+def _pt_field_names(layer):
+    """
+    Helper function to get names of point estimate and residual fields
+    for a layer, e.g. ("Jan_est", "Jan_res") for "Jan_mean".
+    """
     # mean fields in point shapefile does not include '_mean'
     pt_layer = layer.replace('_mean', '')
     if pt_layer == 'growseason':
         pt_layer = 'grow'
-    # names of new fields for estimated and residual e.g. Jan_est, Jan_res
-    pt_est = '{}_est'.format(pt_layer)
-    pt_res = '{}_res'.format(pt_layer)
-    
-    print('\nExtracting interpolated data at station locations and \n',
-        'calculating residuals for layer:', layer)
-    pt_err = pd.DataFrame(columns=[pt_est, pt_res])
-    # read raster for layer and get interpolated data for each point
-    with fiona.open(pt_shp) as shp:
-        for feature in shp:
-            STATION_ID = feature['properties']['STATION_ID']
-            coords = feature['geometry']['coordinates']
-            # Read pixel value at the given coordinates using Rasterio
-            # sample() returns an iterable of ndarrays.
-            with rasterio.open(raster) as src:
-                value = [v for v in src.sample([coords])][0][0]
-            # store interpolated point estimates of ratios 
-            pt_err.loc[STATION_ID, pt_est] = value
-
-    # merge estimated point data with observed to calc residual
-    pt_err['STATION_ID'] = pt_err.index
+
+    return '{}_est'.format(pt_layer), '{}_res'.format(pt_layer)
+
+
+def _calc_pt_estimates(in_path, out_dir, layers):
+    """
+    Helper function to sample interpolated rasters "[layer].tiff" in 
+    ``out_dir`` at all station locations in ``in_path`` and calculate 
+    residuals (estimated minus observed). Each raster is opened once and
+    all stations are sampled by array indexing of pixels. Returns a 
+    DataFrame indexed by STATION_ID with estimate and residual columns 
+    for each layer, stations outside of a raster extent are NaN.
+    """
+    in_df = pd.read_csv(in_path, index_col='STATION_ID', na_values=[-999])
+    xs = in_df.STATION_LON.values
+    ys = in_df.STATION_LAT.values
+    pt_err = pd.DataFrame(index=in_df.index)
+
+    for layer in layers:
+        raster = Path(out_dir)/'{}.tiff'.format(layer)
+        if not raster.is_file():
+            print('\nRaster for layer {} was not found in:\n {}'.format(
+                layer, out_dir), '\nSkipping point error calculation.')
+            continue
+        pt_est, pt_res = _pt_field_names(layer)
+        print('\nExtracting interpolated data at station locations and \n',
+            'calculating residuals for layer:', layer)
+
+        with rasterio.open(str(raster)) as src:
+            values = src.read(1).astype(float)
+            nodata = src.nodata
+            cols, rows = ~src.transform * (xs, ys)
+        if nodata is not None:
+            values[values == nodata] = np.nan
+        rows = np.floor(rows).astype(int)
+        cols = np.floor(cols).astype(int)
+        inside = (rows >= 0) & (rows < values.shape[0]) &\
+            (cols >= 0) & (cols < values.shape[1])
+        est = np.full(len(in_df), np.nan)
+        est[inside] = values[rows[inside], cols[inside]]
+
+        pt_err[pt_est] = est
+        # calculate residual estimated minus observed
+        if layer in in_df.columns:
+            pt_err[pt_res] = est - in_df[layer].values
+        else:
+            pt_err[pt_res] = np.nan
+
+    return pt_err
+
+
+def _save_pt_error(in_path, out_dir, grid_var, pt_err):
+    """
+    Helper function to save point estimates and residuals, created by
+    :func:`_calc_pt_estimates`, to the summary CSV at ``in_path``, to its
+    copy in ``out_dir``, and to the point shapefile in ``out_dir``. Each
+    file is written once for all layers.
+    """
+    fields = list(pt_err.columns)
+    if not fields:
+        return
+
+    pt_shp = '{}_summary_pts.shp'.format(grid_var)
+    pt_shp = str(Path(in_path).parent/'spatial'/pt_shp)
+    if not Path(pt_shp).is_file():
+        make_points_file(in_path)
+    pt_shp_out = str(Path(out_dir)/'{}_summary_pts.shp'.format(grid_var))
+
     # read summary CSV with observed ratios
     in_df = pd.read_csv(in_path, index_col='STATION_ID', na_values=[-999])
-    in_df.loc[pt_err.index, pt_est] = pt_err.loc[:, pt_est]
-    # calculate residual estimated minus observed
-    in_df.loc[:,pt_res] = in_df.loc[:,pt_est] - in_df.loc[:,layer]
+    for f in fields:
+        in_df[f] = pt_err[f]
     # save/overwrite error to input CSV for future interpolation 
     in_df.to_csv(in_path, index=True, na_rep=-999)
 
@@ -1268,48 +1562,35 @@ def calc_pt_error(in_path, out_dir, layer, grid_var):
         in_df.to_csv(str(out_summary_csv), index=True, na_rep=-999)
     else:
         out_df = pd.read_csv(str(out_summary_csv), index_col='STATION_ID')
-        out_df.loc[pt_err.index, pt_est] = pt_err.loc[:, pt_est]
-        out_df.loc[pt_err.index, pt_res] = in_df.loc[pt_err.index, pt_res]
+        for f in fields:
+            out_df.loc[pt_err.index, f] = pt_err[f]
         out_df.to_csv(out_summary_csv, index=True, na_rep=-999)
     
-    # error info to new point shapefile in raster directory
-    if not Path(pt_shp_out).is_file():
-        with fiona.open(pt_shp, 'r') as inf:
-            schema = inf.schema.copy()
-            input_crs = inf.crs
-            # add attributes for point estimate and residual to output points
-            schema['properties'][pt_est] = 'float'
-            schema['properties'][pt_res] = 'float'
-            with fiona.open(pt_shp_out, 'w', 'ESRI Shapefile', 
-                    schema, input_crs) as outf:
-                for feat in inf:
-                    STATION_ID = feat['properties']['STATION_ID']
-                    feat['properties'][pt_est] =\
-                            in_df.loc[STATION_ID, pt_est].astype(float)
-                    feat['properties'][pt_res] =\
-                            in_df.loc[STATION_ID, pt_res].astype(float)
-                    outf.write(feat)
-    # if already exists update point shapefile
-    else:
-        tmp_out = pt_shp_out.replace('.shp', '_tmp.shp')
-        with fiona.open(pt_shp_out, 'r') as inf:
-            schema = inf.schema.copy()
-            input_crs = inf.crs
-            # add attributes for point estimate and residual to output points
-            schema['properties'][pt_est] = 'float'
-            schema['properties'][pt_res] = 'float'
-            with fiona.open(tmp_out, 'w', 
-                    'ESRI Shapefile', schema, input_crs) as outf:
-                for feat in inf:
-                    STATION_ID = feat['properties']['STATION_ID']
-                    feat['properties'][pt_est] =\
-                            in_df.loc[STATION_ID, pt_est].astype(float)
-                    feat['properties'][pt_res] =\
-                            in_df.loc[STATION_ID, pt_res].astype(float)
-                    outf.write(feat)
-        # keep tmp point file with new data and remove old version
+    # error info to point shapefile in raster directory, if it already 
+    # exists update it using a tmp file 
+    update = Path(pt_shp_out).is_file()
+    src_shp = pt_shp_out if update else pt_shp
+    dst_shp = pt_shp_out.replace('.shp', '_tmp.shp') if update else pt_shp_out
+    with fiona.open(src_shp, 'r') as inf:
+        schema = inf.schema.copy()
+        input_crs = inf.crs
+        # add attributes for point estimates and residuals to output points
+        for f in fields:
+            schema['properties'][f] = 'float'
+        with fiona.open(dst_shp, 'w', 'ESRI Shapefile', 
+                schema, input_crs) as outf:
+            for feat in inf:
+                STATION_ID = feat['properties']['STATION_ID']
+                for f in fields:
+                    value = in_df.loc[STATION_ID, f]
+                    feat['properties'][f] =\
+                        None if pd.isnull(value) else float(value)
+                outf.write(feat)
+    # keep tmp point file with new data and remove old version
+    if update:
+        tmp_stem = Path(dst_shp).stem
         for f in os.listdir(out_dir):
-            if '_tmp.' in f:
+            if Path(f).stem == tmp_stem:
                 move(OPJ(out_dir, f), OPJ(out_dir, f.replace('_tmp', '')))
 
     # remove point shapefile from "spatial" directory and tmp files
@@ -1319,13 +1600,8 @@ def calc_pt_error(in_path, out_dir, layer, grid_var):
             # delete temp point shapefile
             (Path(in_path).parent/'spatial'/f).resolve().unlink()
 
-    # delete tmp summary csv used in interpgdal _make_pt_vrt method 
-    tmp_csv = str(in_path).replace('.csv','_tmp.csv')
-    if Path(tmp_csv).resolve().is_file():
-        Path(tmp_csv).resolve().unlink()
-
 
-def gridmet_zonal_stats(in_path, raster):
+def gridmet_zonal_stats(in_path, raster, all_touched=True):
     """
     Calculate zonal means from interpolated surface of etr bias ratios
     created by :func:`interpolate` using the fishnet grid created by 
@@ -1336,8 +1612,15 @@ def gridmet_zonal_stats(in_path, raster):
         in_path (str): path to [var]_summary_comp_[years].csv file containing 
             monthly bias ratios, lat, long, and other data. Created by 
             :mod:`gridwxcomp.calc_bias_ratios`. 
-        raster (str): path to interpolated raster of bias ratios to
-            be used for zonal stats. First created by :func:`interpolate`.
+        raster (str or list): path to interpolated raster of bias ratios to
+            be used for zonal stats, or list of paths. First created by 
+            :func:`interpolate`. Each band of a multi-band raster is 
+            treated as a separate layer.
+
+    Keyword Arguments:
+        all_touched (bool): default True. Include all raster pixels that 
+            touch a gridMET cell in its mean, if False only include pixels 
+            whose centers are within the cell.
         
     Example:
         Although it is prefered to use this function as part of 
@@ -1361,91 +1644,282 @@ def gridmet_zonal_stats(in_path, raster):
         
             'monthly_ratios/spatial/grid.shp'
             
-        also see :func:`interpolate`
+        or, if the fishnet was made with ``grid_format='tiff'`` in 
+        :func:`make_grid`, as a raster of gridMET IDs at::
+
+            'monthly_ratios/spatial/grid.tiff'
+
+        in which case the mean of each gridMET cell is calculated from the 
+        interpolated raster pixels whose centers fall within the cell.
+        Also see :func:`interpolate`
+
+        If the raster pixels are aligned with the gridMET cells, i.e. the
+        raster was made by :func:`interpolate` with a radial basis function
+        and 1 / ``scale_factor`` is an integer, the zonal means of all cells 
+        are calculated at once by summing blocks of pixels in the raster 
+        array. Each block is the pixels within the cell, as with 
+        :func:`rasterstats.zonal_stats` ``all_touched`` has no effect on 
+        aligned rasters.
+
+        To extract zonal means for multiple layers the fishnet is read and 
+        "gridMET_stats.csv" is written only once if a list of rasters is 
+        given, 
+
+        >>> raster_dir = 'monthly_ratios/spatial/etr_mm_invdist_400m/'
+        >>> rasters = [raster_dir + r for r in ('Jan_mean.tiff', 'Feb_mean.tiff')]
+        >>> spatial.gridmet_zonal_stats(summary_file, rasters)
+
+        Column names in "gridMET_stats.csv" are the raster file names 
+        without extension, for multi-band rasters they are the band 
+        descriptions or, if not set, the file name with the band number 
+        appended, e.g. "ratios_1".
         
     Raises:
         FileNotFoundError: if the input summary CSV file or the 
             fishnet for extracting zonal statistics do not exist.
             The fishnet should be in the subdirectory of ``in_path``
-            at "/spatial/grid.shp".
+            at "/spatial/grid.shp" or "/spatial/grid.tiff".
 
     Note:
         If zonal statistics are estimated for the same variable on the
         same raster more than once, the contents of that column in the 
         gridMET_stats.csv file will be overwritten. 
         
+    """
+    out_df, out_file = _gridmet_zonal_means(in_path, raster, all_touched)
+    _save_zonal_stats(out_df, out_file)
+
+def _gridmet_zonal_means(in_path, raster, all_touched=True):
+    """
+    Helper function for :func:`gridmet_zonal_stats` that calculates zonal 
+    means of one or more rasters without saving them. Returns the 
+    DataFrame of means and the path to the "gridMET_stats.csv" file.
     """
     if not os.path.isfile(in_path):
         raise FileNotFoundError('Input summary CSV file given'+\
                                 ' was invalid or not found')
+    if isinstance(raster, (str, Path)):
+        raster = [raster]
+    rasters = [str(r) for r in raster]
     # look for fishnet created in 'in_path/spatial'
     path_root = os.path.split(in_path)[0]
     file_name = os.path.split(in_path)[1]
     # get variable names from input file prefix
     grid_var = file_name.split('_summ')[0]
-    var_name = Path(raster).name.split('.')[0]
     # grid is always in the "spatial" subdir of in_path
     grid_file = OPJ(path_root, 'spatial', 'grid.shp')
+    grid_raster = OPJ(path_root, 'spatial', 'grid.tiff')
     # save zonal stats to summary CSV in same dir as raster as of version 0.3
-    raster_root = os.path.split(raster)[0]
+    raster_root = os.path.split(rasters[0])[0]
     out_file = OPJ(raster_root, 'gridMET_stats.csv')
 
     # this error would only occur when using within Python 
-    if not os.path.isfile(grid_file):
+    if not os.path.isfile(grid_file) and not os.path.isfile(grid_raster):
         raise FileNotFoundError(
             os.path.abspath(grid_file),
             '\ndoes not exist, create it using spatial.make_grid first'
         )
+    layers = _raster_layers(rasters)
     print(
-        'Calculating', grid_var, 'zonal means for', var_name
+        'Calculating', grid_var, 'zonal means for', 
+        ', '.join(name for _, _, name in layers)
     )
 
-    # calc zonal stats and open for grid IDs
-    with fiona.open(grid_file, 'r') as source:
-        zs = zonal_stats(source, raster, all_touched=True)
-        gridmet_ids = [f['properties'].get('GRIDMET_ID') for f in source]
-
-    # get just mean values, zonal_stats can do other stats...
-    means = [z['mean'] for z in zs]
-    out_df = pd.DataFrame(
-        data={
-            'GRIDMET_ID': gridmet_ids, 
-            var_name: means
-        }
-    )
+    out_df = _zonal_means(layers, grid_file, grid_raster, all_touched)
+
+    return out_df, out_file
+
+def _raster_layers(rasters):
+    """
+    Helper function that lists (path, band, name) of each layer to extract
+    zonal means from a list of raster paths, each band of a multi-band 
+    raster is a separate layer named by its description or the file name 
+    with the band number appended.
+    """
+    layers = []
+    for raster in rasters:
+        stem = Path(raster).name.split('.')[0]
+        with rasterio.open(raster) as src:
+            if src.count == 1:
+                layers.append((raster, 1, stem))
+                continue
+            for band, desc in enumerate(src.descriptions, start=1):
+                name = desc if desc else '{}_{}'.format(stem, band)
+                layers.append((raster, band, name))
+
+    return layers
+
+def _zonal_means(layers, grid_file, grid_raster, all_touched=True):
+    """
+    Helper function to calculate zonal means of each gridMET cell in the 
+    fishnet for a list of (path, band, name) raster layers. The fishnet is 
+    read once for all layers. Returns a DataFrame with GRIDMET_ID and a 
+    column of means for each layer, cells outside of gridMET are dropped.
+    """
+    # gridMET ID lattice of fishnet cells for block means if aligned
+    lattice_ids, xmin, ymax, rows, cols = _grid_lattice(grid_file, grid_raster)
+    out_df = pd.DataFrame(data={'GRIDMET_ID': lattice_ids[rows, cols]})
+    features = None
+
+    for raster, band, name in layers:
+        # all_touched has no effect for aligned rasters
+        block_means = _block_zonal_means(
+            raster, lattice_ids, xmin, ymax, band=band
+        )
+        if block_means is not None:
+            means = block_means[rows, cols]
+        # calc zonal stats with fishnet polygons 
+        elif os.path.isfile(grid_file):
+            if features is None:
+                with fiona.open(grid_file, 'r') as source:
+                    features = list(source)
+            zs = zonal_stats(
+                features, raster, band=band, all_touched=all_touched
+            )
+            # get just mean values, zonal_stats can do other stats...
+            means = [z['mean'] for z in zs]
+        # or use gridMET ID raster, no polygons
+        else:
+            means = _id_raster_zonal_means(
+                raster, lattice_ids, xmin, ymax, band=band
+            )[rows, cols]
+        out_df[name] = np.array(means, dtype=float)
+
     out_df.GRIDMET_ID = out_df.GRIDMET_ID.astype(int)
     # drop rows for cells outside of gridMET master grid
     out_df = out_df.drop(out_df[out_df.GRIDMET_ID == -999].index)
 
-    # save or update existing csv file
+    return out_df
+
+def _save_zonal_stats(out_df, out_file):
+    """
+    Helper function to save zonal means to "gridMET_stats.csv" or update 
+    an existing file, columns that already exist are overwritten and new 
+    columns are appended. If the existing file was made with a different
+    fishnet it is overwritten.
+    """
     if not os.path.isfile(out_file):
         print(
             os.path.abspath(out_file),
             '\ndoes not exist, creating file'
         )
         out_df.to_csv(out_file, index=False)
-    else:
-        # overwrite column values if exists, else append
-        existing_df = pd.read_csv(out_file)
-        existing_df.GRIDMET_ID = existing_df.GRIDMET_ID.astype(int)
-        if var_name in existing_df.columns:
-            # may throw error if not same size as original grid
-            try:
-                existing_df.update(out_df)
-                existing_df.to_csv(out_file, index=False)   
-            except:
-                print('Zonal stats for this variable already exist but they',
-                      'appear to have been calculated with a different grid',
-                      'overwriting existing file at:\n',
-                      os.path.abspath(out_file)
-                )
-                out_df.to_csv(out_file, index=False)
-        else:
-            existing_df = existing_df.merge(out_df, on='GRIDMET_ID')
-            #existing_df = pd.concat([existing_df, out_df], axis=1).drop_duplicates()
-            existing_df.to_csv(out_file, index=False)   
-    
-    
+        return
+
+    # overwrite column values if exists, else append
+    existing_df = pd.read_csv(out_file)
+    existing_df.GRIDMET_ID = existing_df.GRIDMET_ID.astype(int)
+    if set(existing_df.GRIDMET_ID) != set(out_df.GRIDMET_ID):
+        print('Zonal stats in existing file appear to have been calculated',
+              'with a different grid, overwriting existing file at:\n',
+              os.path.abspath(out_file)
+        )
+        out_df.to_csv(out_file, index=False)
+        return
+
+    existing_df.set_index('GRIDMET_ID', inplace=True)
+    out_df = out_df.set_index('GRIDMET_ID')
+    for col in out_df.columns:
+        existing_df[col] = out_df[col]
+    existing_df.reset_index().to_csv(out_file, index=False)   
+
+def _grid_lattice(grid_file, grid_raster):
+    """
+    Helper function to get the 2-D array of gridMET IDs of the fishnet cells
+    and its upper left corner from the fishnet shapefile if it exists, the 
+    same file that zonal means are calculated from when the raster is not
+    aligned, or else from the gridMET ID raster. Also returns the row and 
+    column in the array of each cell in the order of the fishnet polygons.
+    """
+    if not os.path.isfile(grid_file):
+        gridmet_ids, xmin, ymax = _read_id_raster(grid_raster)
+        n_rows, n_cols = gridmet_ids.shape
+        # polygons are ordered column by column
+        cols, rows = np.meshgrid(
+            np.arange(n_cols), np.arange(n_rows), indexing='ij'
+        )
+        return gridmet_ids, xmin, ymax, rows.ravel(), cols.ravel()
+
+    with fiona.open(grid_file, 'r') as source:
+        xmin, ymax = source.bounds[0], source.bounds[3]
+        ids, lefts, tops = [], [], []
+        for f in source:
+            ring = np.asarray(f['geometry']['coordinates'][0])
+            lefts.append(ring[:,0].min())
+            tops.append(ring[:,1].max())
+            ids.append(f['properties'].get('GRIDMET_ID'))
+    cols = np.round((np.array(lefts) - xmin) / CELL_SIZE).astype(int)
+    rows = np.round((ymax - np.array(tops)) / CELL_SIZE).astype(int)
+    gridmet_ids = np.full((rows.max() + 1, cols.max() + 1), -999, dtype=int)
+    gridmet_ids[rows, cols] = ids
+
+    return gridmet_ids, xmin, ymax, rows, cols
+
+def _block_zonal_means(raster, gridmet_ids, xmin, ymax, band=1):
+    """
+    Helper function to calculate zonal means for all cells of a gridMET
+    lattice from a raster whose pixels are aligned with gridMET cells, i.e.
+    an integer number of pixels per cell and the same origin. Means are 
+    found from block sums of the k x k pixels of each cell with a 
+    summed-area table of the raster array. Like :func:`zonal_stats`, which
+    only reads the pixel window within the bounds of each cell, the result 
+    is the same with or without ``all_touched``. Returns a 2-D array of 
+    means with the shape of ``gridmet_ids`` or None if the raster is not 
+    aligned.
+    """
+    with rasterio.open(raster) as src:
+        transform = src.transform
+        pixel_size = transform.a
+        # pixels per gridMET cell and position of lattice in pixels
+        scale = CELL_SIZE / pixel_size
+        col_off = (xmin - transform.c) / pixel_size
+        row_off = (transform.f - ymax) / pixel_size
+        aligned = np.isclose(-transform.e, pixel_size) and\
+            round(scale) >= 1 and\
+            all(np.isclose(v, round(v), atol=1e-6) 
+                for v in (scale, col_off, row_off))
+        if not aligned:
+            return None
+        values = src.read(band, masked=True)
+
+    return block_means(values, gridmet_ids.shape, int(round(scale)), 
+        int(round(row_off)), int(round(col_off)))
+
+def _id_raster_zonal_means(raster, gridmet_ids, xmin, ymax, band=1):
+    """
+    Helper function to calculate zonal means of a raster for each gridMET
+    cell in a 2-D array of gridMET IDs, e.g. from a raster created by 
+    :func:`make_grid`, with upper left corner at ``xmin``, ``ymax``. Each 
+    pixel of ``raster`` is assigned to the cell that contains its center by 
+    array indexing. Returns a 2-D array of means with the shape of 
+    ``gridmet_ids``.
+    """
+    n_rows, n_cols = gridmet_ids.shape
+
+    with rasterio.open(raster) as src:
+        values = src.read(band, masked=True)
+        transform = src.transform
+    values = np.ma.masked_invalid(values)
+
+    # gridMET cell row and column of each pixel center
+    x = transform.c + (np.arange(values.shape[1]) + 0.5) * transform.a
+    y = transform.f + (np.arange(values.shape[0]) + 0.5) * transform.e
+    cols = np.floor((x - xmin) / CELL_SIZE).astype(int)
+    rows = np.floor((ymax - y) / CELL_SIZE).astype(int)
+    rows, cols = np.meshgrid(rows, cols, indexing='ij')
+    keep = (rows >= 0) & (rows < n_rows) & (cols >= 0) & (cols < n_cols) &\
+        ~np.ma.getmaskarray(values)
+
+    cell_idx = rows[keep] * n_cols + cols[keep]
+    sums = np.bincount(
+        cell_idx, weights=values.data[keep], minlength=n_rows * n_cols
+    )
+    counts = np.bincount(cell_idx, minlength=n_rows * n_cols)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan)
+
+    return means.reshape(n_rows, n_cols)
+
 def arg_parse():
     """
     Command line usage of grdwxcomp spatial.py for creating shapefiles of 
@@ -1507,6 +1981,17 @@ def arg_parse():
         help='GridMET metadata CSV file with cell data, packaged with '+\
              'gridwxcomp and automatically found if pip was used to install '+\
              'if not given it needs to be located in the currect directory')
+    optional.add_argument(
+        '--grid-format', required=False, default='shp', type=str, 
+        metavar='', help='Fishnet grid format: shp (polygons), tiff '+\
+            '(raster of gridMET IDs), or both')
+    optional.add_argument(
+        '--neighbors', required=False, default=None, type=int, metavar='',
+        help='Number of nearest stations used for radial basis func '+\
+            'interpolation methods, default uses all stations')
+    optional.add_argument(
+        '-j', '--jobs', required=False, default=1, type=int, metavar='',
+        help='Number of processes to interpolate layers in parallel')
 #    optional.add_argument(
 #        '--debug', default=logging.INFO, const=logging.DEBUG,
 #        help='Debug level logging', action="store_const", dest="loglevel")
@@ -1535,5 +2020,8 @@ if __name__ == '__main__':
         zonal_stats=args.zonal_stats,
         overwrite=args.overwrite_grid,
         options=args.options,
-        gridmet_meta_path=args.gridmet_meta
+        gridmet_meta_path=args.gridmet_meta,
+        grid_format=args.grid_format,
+        neighbors=args.neighbors,
+        workers=args.jobs
     )
@@ -2,6 +2,12 @@
 """
 Utility functions or classes for ``gridwxcomp`` package
 """
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
 
 def parse_yr_filter(dt_df, years, label):
     """
@@ -81,4 +87,244 @@ def parse_yr_filter(dt_df, years, label):
     return ret
 
 
+def map_workers(func, args, workers=1, threads=False):
+    """
+    Call a function for each tuple of arguments, optionally in a pool of
+    worker processes or threads.
+
+    Arguments:
+        func (callable): module level function to call as ``func(*arg)``
+            for each ``arg`` in ``args``
+        args (iterable): tuples of positional arguments for ``func``
+
+    Keyword Arguments:
+        workers (int): default 1. Number of worker processes, if 1 or less
+            ``func`` is called in the current process.
+        threads (bool): default False. If True use a pool of threads instead
+            of processes, e.g. for functions that wait on network requests.
+
+    Returns:
+        results (list): return values of ``func`` in the same order as
+            ``args``, regardless of the order calls were completed.
+
+    Example:
+
+        >>> from operator import add
+        >>> map_workers(add, [(1, 2), (3, 4)], workers=2)
+        [3, 7]
+
+    """
+    args = list(args)
+    workers = min(int(workers or 1), len(args))
+    if workers <= 1:
+        return [func(*arg) for arg in args]
+
+    pool = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    with pool(max_workers=workers) as executor:
+        futures = [executor.submit(func, *arg) for arg in args]
+        results = [f.result() for f in futures]
+
+    return results
+
+
+def block_means(values, shape, k, row_off=0, col_off=0):
+    """
+    Mean of each k x k block of pixels of a 2-D array that is aligned with
+    a lattice of cells, e.g. a raster with k pixels per gridMET cell side.
+    Block sums are found with a summed-area table of the array so the cost
+    does not depend on the number of cells.
+
+    Arguments:
+        values (:obj:`numpy.ndarray`): 2-D array of pixel values, masked
+            or NaN values are ignored
+        shape (tuple): number of rows and columns of the cell lattice
+        k (int): number of pixels per cell side
+
+    Keyword Arguments:
+        row_off (int): default 0. Row of ``values`` at the top edge of the
+            lattice, may be negative if the lattice extends past the array
+        col_off (int): default 0. Column of ``values`` at the left edge of
+            the lattice, may be negative
+
+    Returns:
+        means (:obj:`numpy.ndarray`): array of block means with ``shape``,
+            NaN for cells without any valid pixels
+
+    Example:
+
+        >>> block_means(np.arange(16.).reshape(4, 4), (2, 2), 2)
+        array([[ 2.5,  4.5],
+               [10.5, 12.5]])
+
+    """
+    values = np.ma.masked_invalid(values)
+    n_rows, n_cols = shape
+    # canvas of lattice extent, zero where values are missing
+    canvas = (n_rows * k, n_cols * k)
+    sums = np.zeros(canvas)
+    counts = np.zeros(canvas)
+    # canvas index i is values index i + offset
+    r0, c0 = max(0, -row_off), max(0, -col_off)
+    r1 = min(canvas[0], values.shape[0] - row_off)
+    c1 = min(canvas[1], values.shape[1] - col_off)
+    if r1 > r0 and c1 > c0:
+        window = values[
+            r0 + row_off:r1 + row_off,
+            c0 + col_off:c1 + col_off
+        ]
+        sums[r0:r1, c0:c1] = window.filled(0)
+        counts[r0:r1, c0:c1] = ~np.ma.getmaskarray(window)
+
+    def _block_sum(arr):
+        # summed-area table with leading zero row and column
+        table = np.zeros((arr.shape[0] + 1, arr.shape[1] + 1))
+        table[1:,1:] = arr.cumsum(axis=0).cumsum(axis=1)
+        top = np.arange(n_rows) * k
+        bottom = top + k
+        left = np.arange(n_cols) * k
+        right = left + k
+        return table[np.ix_(bottom, right)] - table[np.ix_(top, right)] -\
+            table[np.ix_(bottom, left)] + table[np.ix_(top, left)]
+
+    block_sums = _block_sum(sums)
+    block_counts = _block_sum(counts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(block_counts > 0.5, block_sums / block_counts, np.nan)
+
+    return means
+
+
+class TokenBucket(object):
+    """
+    Thread safe token bucket rate limiter shared by threads that make
+    requests to the same service.
+
+    Arguments:
+        rate (float): tokens added per second, i.e. the sustained number of
+            requests per second.
+
+    Keyword Arguments:
+        capacity (float): default None. Maximum number of tokens, i.e. the
+            size of bursts allowed, if None it is ``max(rate, 1)``.
+
+    Example:
+
+        >>> limiter = TokenBucket(2)
+        >>> for i in range(10):
+        ...     limiter.acquire()  # blocks after the first 2 calls
+
+        Each call after the first two waits for a token, so that the loop
+        takes about 4 seconds.
+
+    """
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError('rate must be positive, got {}'.format(rate))
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(self.rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take one token, waiting until one is available.
+
+        Returns:
+            waited (float): seconds spent waiting for the token.
+        """
+        waited = 0.
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                    self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class CircuitBreaker(object):
+    """
+    Thread safe circuit breaker shared by threads that make requests to the
+    same service. After ``threshold`` consecutive failures the circuit opens
+    and all threads wait in :meth:`CircuitBreaker.wait` until ``cooldown``
+    seconds have passed, then requests are let through again. Each time the
+    circuit opens again before a request succeeds the cooldown is doubled, 
+    up to ``max_cooldown``.
+
+    Keyword Arguments:
+        threshold (int): default 5. Consecutive failures that open the
+            circuit.
+        cooldown (float): default 10. Seconds the circuit stays open the
+            first time it opens.
+        max_cooldown (float): default 300. Maximum seconds the circuit 
+            stays open.
+
+    Example:
+
+        >>> breaker = CircuitBreaker(threshold=3)
+        >>> breaker.wait()
+        >>> try:
+        ...     result = make_request()
+        ... except Exception:
+        ...     breaker.failure()
+        ... else:
+        ...     breaker.success()
+
+    """
+    def __init__(self, threshold=5, cooldown=10, max_cooldown=300):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        """bool: True if requests should currently wait."""
+        return time.monotonic() < self._open_until
+
+    def wait(self):
+        """
+        Block while the circuit is open.
+
+        Returns:
+            waited (float): seconds spent waiting.
+        """
+        waited = 0.
+        while True:
+            with self._lock:
+                wait = self._open_until - time.monotonic()
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def success(self):
+        """Record a successful request, closing the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._trips = 0
 
+    def failure(self):
+        """Record a failed request, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._failures < self.threshold or self.is_open:
+                return
+            cooldown = min(self.cooldown * 2 ** self._trips,
+                self.max_cooldown)
+            self._trips += 1
+            self._failures = 0
+            self._open_until = time.monotonic() + cooldown
+        logging.warning(
+            'Circuit opened after {} consecutive failed requests, '.format(
+                self.threshold) +\
+            'pausing requests for {} seconds'.format(cooldown))
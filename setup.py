@@ -15,12 +15,12 @@ requires = [
     'fiona>=1.7.13',
     'gdal',
     'google-api-python-client>=1.7.7',
-    'numpy>=1.15',
+    'numpy>=1.17',
     'oauth2client>=4.1.2', 
-    'pandas==0.23.4',
+    'pandas>=1.5.3',
     'rasterstats>=0.13',
     'refet>=0.3.7',
-    'scipy>=1.1.0',
+    'scipy>=1.7.0',
     'shapely==1.6.4',
     'xlrd==1.2.0'
 ]
@@ -29,7 +29,7 @@ tests_require = []
 
 classifiers = [
     'License :: OSI Approved :: Apache Software License',
-    'Programming Language :: Python :: 3.7',
+    'Programming Language :: Python :: 3.8',
     'Environment :: Console',
     'Development Status :: 4 - Beta',
     'Topic :: Scientific/Engineering',
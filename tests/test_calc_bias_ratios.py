@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for :mod:`gridwxcomp.calc_bias_ratios`
+"""
+import importlib
+import os
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gridwxcomp.calc_bias_ratios import calc_bias_ratio_tables, calc_bias_ratios
+
+# the package exports the function of the same name as the module
+cbr = importlib.import_module('gridwxcomp.calc_bias_ratios')
+
+
+@pytest.fixture
+def mixed_input(tmp_path):
+    """
+    Input table of three stations, the first has ETr and TMax, the second
+    only ETr and the third neither of them.
+    """
+    rng = np.random.RandomState(0)
+    dates = pd.date_range('2001-01-01', '2003-12-31')
+    station_cols = [
+        ['Calc_ETr (mm)', 'TMax (C)'], ['Calc_ETr (mm)'], ['Precip (mm)']
+    ]
+    rows = []
+    for i, cols in enumerate(station_cols):
+        station_df = pd.DataFrame(
+            {c: rng.uniform(1, 8, len(dates)) for c in cols}, index=dates)
+        station_df.index.name = 'date'
+        station_path = str(tmp_path / 'station_{}.csv'.format(i))
+        station_df.to_csv(station_path)
+        gridmet_df = pd.DataFrame({
+            'etr_mm': rng.uniform(1, 8, len(dates)),
+            'tmax_c': rng.uniform(1, 8, len(dates)),
+            'prcp_mm': rng.uniform(1, 8, len(dates))}, index=dates)
+        gridmet_df.index.name = 'date'
+        gridmet_path = str(tmp_path / 'gridmet_{}.csv'.format(i))
+        gridmet_df.to_csv(gridmet_path)
+        rows.append(dict(
+            STATION_ID='S{}'.format(i), GRIDMET_ID=100 + i, LAT=40., 
+            LON=-110., STATION_LAT=40.1, STATION_LON=-110.1, 
+            STATION_FILE_PATH=station_path, GRIDMET_FILE_PATH=gridmet_path
+        ))
+    input_path = str(tmp_path / 'merged_input.csv')
+    pd.DataFrame(rows).to_csv(input_path, index=False)
+    return input_path
+
+
+def _summary(out_dir, var, suffix='all_yrs', index_col='STATION_ID'):
+    return pd.read_csv(
+        os.path.join(out_dir, '{}_summary_{}.csv'.format(var, suffix)),
+        index_col=index_col
+    )
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_mixed_station_variables(mixed_input, tmp_path, cached):
+    """
+    Stations missing some or all of the variables are skipped for those
+    variables without stopping the run, also when variables are added to
+    monthly sums stored by an earlier run.
+    """
+    out_dir = str(tmp_path / 'ratios')
+    cache_dir = str(tmp_path / 'cache') if cached else None
+    if cached:
+        calc_bias_ratios(mixed_input, str(tmp_path / 'first_run'), 
+            gridmet_var=['etr_mm', 'prcp_mm'], cache_dir=cache_dir)
+    calc_bias_ratios(mixed_input, out_dir, gridmet_var=['etr_mm', 'tmax_c'],
+        cache_dir=cache_dir)
+
+    assert sorted(_summary(out_dir, 'etr_mm').index) == ['S0', 'S1']
+    assert list(_summary(out_dir, 'tmax_c').index) == ['S0']
+
+
+def test_checkpoint_resume(mixed_input, tmp_path, monkeypatch):
+    """
+    A station whose file can not be parsed is journaled as failed and 
+    recalculated on the next run, finished stations are only recalculated
+    if their files changed.
+    """
+    input_df = pd.read_csv(mixed_input)
+    station_path = input_df.STATION_FILE_PATH[1]
+    good_station = open(station_path).read()
+    with open(station_path, 'w') as f:
+        f.write('not,a\ntime,series\n')
+
+    calls = []
+    station_monthly_sums = cbr._station_monthly_sums
+    def _counted(row_df, var_pairs, cache_dir=None):
+        calls.append(row_df.STATION_ID.iloc[0])
+        return station_monthly_sums(row_df, var_pairs, cache_dir)
+    monkeypatch.setattr(cbr, '_station_monthly_sums', _counted)
+
+    out_dir = str(tmp_path / 'ratios')
+    checkpoint = str(tmp_path / 'ratios.jsonl')
+    run = lambda: calc_bias_ratios(mixed_input, out_dir, 
+        gridmet_var=['etr_mm', 'tmax_c'], checkpoint=checkpoint)
+
+    run()
+    journal = cbr._read_checkpoint(checkpoint)
+    assert journal['S0']['status'] == 'done'
+    assert journal['S1']['status'] == 'failed'
+    assert journal['S1']['error']
+    assert journal['S2']['status'] == 'missing'
+    assert list(_summary(out_dir, 'etr_mm').index) == ['S0']
+
+    # fixed file of failed station
+    with open(station_path, 'w') as f:
+        f.write(good_station)
+    calls.clear()
+    run()
+    assert 'S1' in calls and not 'S0' in calls
+    assert cbr._read_checkpoint(checkpoint)['S1']['status'] == 'done'
+    assert sorted(_summary(out_dir, 'etr_mm').index) == ['S0', 'S1']
+
+    # changed file of finished station
+    gridmet_path = input_df.GRIDMET_FILE_PATH[0]
+    gridmet_df = pd.read_csv(gridmet_path, index_col='date')
+    (gridmet_df * 2).to_csv(gridmet_path)
+    before = _summary(out_dir, 'etr_mm')
+    calls.clear()
+    run()
+    assert 'S0' in calls and not 'S1' in calls
+    after = _summary(out_dir, 'etr_mm')
+    assert after.loc['S0', 'growseason_mean'] != \
+        before.loc['S0', 'growseason_mean']
+    assert after.loc['S1', 'growseason_mean'] == \
+        before.loc['S1', 'growseason_mean']
+
+
+def test_tables_match_files(mixed_input, tmp_path):
+    """In memory tables equal the summary files of the same stations."""
+    out_dir = str(tmp_path / 'ratios')
+    calc_bias_ratios(mixed_input, out_dir, gridmet_var=['etr_mm', 'tmax_c'])
+
+    input_df = pd.read_csv(mixed_input)
+    read = lambda path: pd.read_csv(path, parse_dates=True, index_col='date')
+    station_data = dict(zip(input_df.STATION_ID, 
+        input_df.STATION_FILE_PATH.map(read)))
+    gridmet_data = dict(zip(input_df.STATION_ID, 
+        input_df.GRIDMET_FILE_PATH.map(read)))
+    tables = calc_bias_ratio_tables(input_df, station_data, gridmet_data, 
+        gridmet_var=['etr_mm', 'tmax_c'])
+
+    for var, (summary, comp_summary) in tables.items():
+        for table, suffix in [(summary, 'all_yrs'), 
+                (comp_summary, 'comp_all_yrs')]:
+            # round trip through CSV as the files were written
+            table = pd.read_csv(
+                StringIO(table.to_csv(na_rep=-999)), index_col='STATION_ID')
+            pd.testing.assert_frame_equal(
+                table.sort_index(), 
+                _summary(out_dir, var, suffix).sort_index()
+            )
+
+
+@pytest.mark.parametrize('windows,rolling,suffix', [
+    ('2001,2002-2003', None, 'windows'),
+    (None, 2, 'rolling_2yr')
+])
+def test_windows_match_year_filter(mixed_input, tmp_path, windows, rolling,
+        suffix):
+    """Statistics of each window equal a run filtered to its years."""
+    out_dir = str(tmp_path / 'ratios')
+    calc_bias_ratios(mixed_input, out_dir, gridmet_var=['etr_mm', 'tmax_c'],
+        windows=windows, rolling=rolling)
+    window_df = _summary(
+        out_dir, 'etr_mm', suffix, index_col=['STATION_ID', 'WINDOW'])
+    labels = window_df.index.get_level_values('WINDOW').unique()
+    assert sorted(labels.astype(str)) == (
+        ['2001', '2002_2003'] if windows else ['2001_2002', '2002_2003'])
+
+    for label in labels:
+        years = str(label).replace('_', '-')
+        year_dir = str(tmp_path / 'years_{}'.format(label))
+        calc_bias_ratios(mixed_input, year_dir, 
+            gridmet_var=['etr_mm', 'tmax_c'], years=years)
+        year_df = _summary(year_dir, 'etr_mm', str(label))
+        window = window_df.xs(label, level='WINDOW')
+        pd.testing.assert_frame_equal(
+            window[year_df.columns].sort_index(), year_df.sort_index(),
+            check_dtype=False
+        )
+
+
+def test_cache_rereads_changed_files(mixed_input, tmp_path, monkeypatch):
+    """
+    Stored monthly sums are used without reading unchanged time series 
+    files, files that were touched since are read again.
+    """
+    input_df = pd.read_csv(mixed_input)
+    time_series = set(input_df.STATION_FILE_PATH) |\
+        set(input_df.GRIDMET_FILE_PATH)
+    read_files = []
+    read_csv = pd.read_csv
+    def _read_csv(path, *args, **kwargs):
+        if path in time_series:
+            read_files.append(path)
+        return read_csv(path, *args, **kwargs)
+    monkeypatch.setattr(cbr.pd, 'read_csv', _read_csv)
+
+    cache_dir = str(tmp_path / 'cache')
+    run = lambda out: calc_bias_ratios(mixed_input, str(tmp_path / out),
+        gridmet_var=['etr_mm', 'tmax_c'], cache_dir=cache_dir)
+    run('first_run')
+    assert read_files
+
+    # the third station has none of the variables so nothing is stored
+    stored = set(input_df.STATION_FILE_PATH[:2]) |\
+        set(input_df.GRIDMET_FILE_PATH[:2])
+    read_files.clear()
+    run('cached_run')
+    assert not stored & set(read_files)
+    pd.testing.assert_frame_equal(
+        _summary(str(tmp_path / 'first_run'), 'etr_mm'),
+        _summary(str(tmp_path / 'cached_run'), 'etr_mm')
+    )
+
+    # touching a file changes its modification time
+    touched = input_df.STATION_FILE_PATH[0]
+    stat = os.stat(touched)
+    os.utime(touched, (stat.st_atime, stat.st_mtime + 10))
+    read_files.clear()
+    run('touched_run')
+    assert sorted(stored & set(read_files)) == sorted(
+        [touched, input_df.GRIDMET_FILE_PATH[0]])
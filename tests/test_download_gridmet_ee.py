@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for :mod:`gridwxcomp.download_gridmet_ee` with a local fake of the
+Earth Engine API passed as the ``client``, no requests are made.
+"""
+import importlib
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('ee')
+pytest.importorskip('refet')
+
+# the package exports the function of the same name as the module
+dl = importlib.import_module('gridwxcomp.download_gridmet_ee')
+
+
+def _elev(lon, lat):
+    return 1000. + 10 * abs(lon)
+
+
+def _values(lon, lat, date):
+    """gridMET values of a point on a date, before unit conversions."""
+    doy = date.dayofyear
+    return dict(tmax=290. + doy / 10., tmin=275. + doy / 20., srad_wm2=200.,
+        u10_ms=2. + lat / 100., q_kgkg=0.005, rh_min=20., rh_max=80.,
+        prcp_mm=doy % 7 - 2., etr_mm=abs(lon) / 20. + doy / 100.,
+        eto_mm=abs(lat) / 20. + doy / 100.)
+
+
+class _Result(object):
+    """Value of an Earth Engine object computed by getInfo."""
+    def __init__(self, client, compute, size=1):
+        self.client = client
+        self.compute = compute
+        self.size = size
+
+    def getInfo(self):
+        return self.client.get_info(self)
+
+
+class _Feature(object):
+    def __init__(self, geometry, properties):
+        self.geometry = geometry
+        self.properties = properties
+
+    def set(self, key, value):
+        return _Feature(self.geometry, dict(self.properties, **{key: value}))
+
+
+class _Features(_Result):
+    """Mapped collection or FeatureCollection, possibly nested."""
+    def __init__(self, client, features):
+        self.features = features
+        super().__init__(client, lambda: {'features': [
+            {'properties': f.properties} for f in self._flat()
+        ]}, size=len(self._flat()))
+
+    def _flat(self):
+        return [f for ftr in self.features for f in (
+            ftr.features if isinstance(ftr, _Features) else [ftr])]
+
+    def map(self, func):
+        return _Features(self.client, [func(f) for f in self.features])
+
+    def flatten(self):
+        return _Features(self.client, self._flat())
+
+
+class _Date(object):
+    def __init__(self, date):
+        self.date = date
+
+    def format(self, fmt):
+        return self.date.strftime('%Y%m%d')
+
+
+class _Image(object):
+    """Elevation image or gridMET image of one date."""
+    def __init__(self, client, date=None):
+        self.client = client
+        self._date = date
+
+    def date(self):
+        return _Date(self._date)
+
+    def addBands(self, bands):
+        return self
+
+    def rename(self, names):
+        return self
+
+    def _point_values(self, lon, lat):
+        if self._date is None:
+            return {'mean': _elev(lon, lat)}
+        return dict(_values(lon, lat, self._date),
+            date=int(self._date.strftime('%Y%m%d')))
+
+    def reduceRegion(self, reducer, geometry, scale):
+        values = self._point_values(*geometry)
+        if self._date is None:
+            values = {'b1': values['mean']}
+        return _Result(self.client, lambda: values)
+
+    def reduceRegions(self, collection, reducer, scale):
+        return _Features(self.client, [
+            _Feature(f.geometry, dict(f.properties,
+                **self._point_values(*f.geometry)))
+            for f in collection
+        ])
+
+
+class _ImageApi(object):
+    def __init__(self, client):
+        self.client = client
+
+    def __call__(self, image):
+        if isinstance(image, _Image):
+            return image
+        return _Image(self.client)
+
+    def constant(self, value):
+        return _Image(self.client)
+
+
+class _Collection(object):
+    """gridMET ImageCollection, permanent data ends on ``last_date``."""
+    def __init__(self, client, dates=None):
+        self.client = client
+        self.dates = dates
+
+    def filterDate(self, start, end):
+        end = min(pd.Timestamp(end) - pd.Timedelta(days=1),
+            self.client.last_date)
+        return _Collection(self.client, pd.date_range(start, end))
+
+    def filter(self, condition):
+        return self
+
+    def select(self, bands, names):
+        return self
+
+    def limit(self, n):
+        return _Collection(self.client, self.dates[:n])
+
+    def reduceColumns(self, reducer, selectors):
+        return {'count': len(self.dates)}
+
+    def map(self, func):
+        return _Features(self.client,
+            [func(_Image(self.client, d)) for d in self.dates])
+
+
+class _Number(object):
+    def __init__(self, value):
+        self.value = value
+
+    def eq(self, other):
+        return self.value == other
+
+    @staticmethod
+    def parse(value):
+        return int(value)
+
+
+class FakeEE(object):
+    """
+    Fake of the Earth Engine API calls made by
+    :mod:`gridwxcomp.download_gridmet_ee`, computed locally. Values depend
+    only on the point and date so that any way of downloading a cell gives
+    the same data. The first ``throttle`` getInfo calls raise like a
+    throttled request, results of successful calls are recorded.
+    """
+    def __init__(self, throttle=0, last_date='2001-12-31'):
+        self.throttle = throttle
+        self.last_date = pd.Timestamp(last_date)
+        self.calls = 0
+        self.results = []
+        self.call_times = []
+        self._lock = threading.Lock()
+        self.Image = _ImageApi(self)
+        self.Number = _Number
+        self.Reducer = type('Reducer', (), {'mean': staticmethod(
+            lambda: None)})
+        self.Filter = type('Filter', (), {'eq': staticmethod(
+            lambda *args: None)})
+        self.Geometry = type('Geometry', (), {'Point': staticmethod(
+            lambda lon, lat: (lon, lat))})
+        self.Algorithms = type('Algorithms', (), {'If': staticmethod(
+            lambda cond, a, b: _Result(self, lambda: a if cond else b))})
+
+    def ImageCollection(self, name):
+        return _Collection(self)
+
+    def Feature(self, geometry, properties):
+        if isinstance(properties, _Result):
+            properties = properties.compute()
+        return _Feature(geometry, properties)
+
+    def FeatureCollection(self, features):
+        return features
+
+    def get_info(self, result):
+        with self._lock:
+            self.calls += 1
+            self.call_times.append(time.monotonic())
+            if self.calls <= self.throttle:
+                raise RuntimeError('Too many concurrent aggregations.')
+        output = result.compute()
+        with self._lock:
+            self.results.append((result.size, output))
+        return output
+
+
+CELLS = [
+    # GRIDMET_ID, LON, LAT
+    (1, -110.0, 40.0),
+    (2, -111.0, 41.0),
+    (3, -112.0, 42.0),
+]
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    """Input table of four stations in three gridMET cells."""
+    path = str(tmp_path / 'merged_input.csv')
+    pd.DataFrame({
+        'STATION_ID': ['a', 'b', 'c', 'd'],
+        'GRIDMET_ID': [1, 1, 2, 3],
+        'LAT': [40.0, 40.0, 41.0, 42.0],
+        'LON': [-110.0, -110.0, -111.0, -112.0]
+    }).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def full_data(input_csv, tmp_path):
+    """Complete 2000-2001 gridMET files of the cells, downloaded per cell."""
+    out_dir = str(tmp_path / 'full')
+    in_path = str(tmp_path / 'full_input.csv')
+    shutil.copy(input_csv, in_path)
+    dl.download_gridmet_ee(in_path, out_dir, year_filter='2000-2001',
+        client=FakeEE())
+    return {
+        g: pd.read_csv(os.path.join(
+            out_dir, 'gridmet_historical_{}.csv'.format(g)))
+        for g, _, _ in CELLS
+    }
+
+
+def _partial_files(full_data, out_dir):
+    """
+    Files of cell 1 with the first half of 2000, cell 2 without March
+    2001 and no file for cell 3. Returns the number of missing days.
+    """
+    os.makedirs(out_dir)
+    kept = {
+        1: full_data[1][full_data[1].date < '2000-07-01'],
+        2: full_data[2][~full_data[2].date.str.startswith('2001-03')]
+    }
+    for g, df in kept.items():
+        df.to_csv(os.path.join(out_dir, 'gridmet_historical_{}.csv'.format(
+            g)), index=False)
+    return sum(len(full_data[g]) for g in full_data) -\
+        sum(len(df) for df in kept.values())
+
+
+def _assert_complete(full_data, out_dir):
+    for g, df in full_data.items():
+        out_df = pd.read_csv(os.path.join(
+            out_dir, 'gridmet_historical_{}.csv'.format(g)))
+        pd.testing.assert_frame_equal(out_df, df)
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_batch_fills_missing_dates(input_csv, full_data, tmp_path, workers):
+    """
+    Batch mode requests each missing cell-day once, only for cells missing
+    that date, and fills the same files as downloading cells separately.
+    """
+    out_dir = str(tmp_path / 'batch')
+    n_missing = _partial_files(full_data, out_dir)
+    client = FakeEE()
+    dl.download_gridmet_ee(input_csv, out_dir, year_filter='2000-2001',
+        batch=True, workers=workers, client=client)
+
+    _assert_complete(full_data, out_dir)
+    # elevation request of the three cells, then only missing cell-days
+    assert client.results[0][0] == len(CELLS)
+    assert sum(size for size, _ in client.results[1:]) == n_missing
+    input_df = pd.read_csv(input_csv)
+    assert input_df.GRIDMET_FILE_PATH.notnull().all()
+
+
+def test_batch_extract_limits_requests():
+    """
+    Requests hold at most max_elements cell-days and only the cells that
+    are missing the requested dates.
+    """
+    day = lambda d: pd.Timestamp('2001-01-01') + pd.Timedelta(days=d)
+    cells = [
+        (1, -110.0, 40.0, [(day(0), day(30))]),
+        (2, -111.0, 41.0, [(day(0), day(10)), (day(20), day(30))]),
+        (3, -112.0, 42.0, [(day(25), day(40))]),
+    ]
+    client = FakeEE()
+    exports, elevs = dl._batch_extract(
+        cells, client, dl._RequestSession(), max_elements=8)
+
+    assert elevs == {g: _elev(lon, lat) for g, lon, lat, _ in cells}
+    sizes = [size for size, _ in client.results[1:]]
+    assert max(sizes) <= 8
+    assert sum(sizes) == 30 + 20 + 15
+    for g, _, _, ranges in cells:
+        dates = pd.DatetimeIndex(sorted(exports[g].date))
+        expected = pd.DatetimeIndex(
+            [d for start, end in ranges for d in pd.date_range(
+                start, end - pd.Timedelta(days=1))])
+        assert dates.equals(expected)
+
+
+def test_range_groups():
+    """Ranges are split where the cells missing them change."""
+    day = lambda d: pd.Timestamp('2001-01-01') + pd.Timedelta(days=d)
+    cells = [
+        (1, 0, 0, [(day(0), day(30))]),
+        (2, 0, 0, [(day(0), day(10)), (day(20), day(30))]),
+        (3, 0, 0, [(day(40), day(50))]),
+    ]
+    groups = [(start, end, [c[0] for c in group])
+        for start, end, group in dl._range_groups(cells)]
+    assert groups == [
+        (day(0), day(10), [1, 2]),
+        (day(10), day(20), [1]),
+        (day(20), day(30), [1, 2]),
+        (day(40), day(50), [3]),
+    ]
+
+
+def _request(client):
+    """Elevation request of a point, the simplest getInfo call."""
+    return client.Image('projects/climate-engine/gridmet/elevation')\
+        .reduceRegion(None, (-110.0, 40.0), 4000)
+
+
+def test_session_retries_throttled_requests(monkeypatch):
+    """Throttled requests are retried and counted until they succeed."""
+    monkeypatch.setattr(dl, 'sleep', lambda seconds: None)
+    client = FakeEE(throttle=3)
+    session = dl._RequestSession()
+
+    assert session.getinfo(_request(client)) == {'b1': _elev(-110.0, 40.0)}
+    assert client.calls == 4
+    assert session.retries == 3
+    assert session.requests == 1
+
+
+def test_session_gives_up(monkeypatch):
+    """None is returned after all attempts of a request failed."""
+    monkeypatch.setattr(dl, 'sleep', lambda seconds: None)
+    client = FakeEE(throttle=10)
+    session = dl._RequestSession(n=4)
+
+    assert session.getinfo(_request(client)) is None
+    assert client.calls == 3
+    assert session.retries == 3
+    assert session.requests == 0
+
+
+def test_session_threads_back_off_together(monkeypatch):
+    """
+    Consecutive throttled requests of different threads open the shared
+    circuit breaker and no thread makes a request until it closes.
+    """
+    n_threads = 3
+    cooldown = 0.3
+    # threads back off after their failure until all of them failed
+    failed = threading.Barrier(n_threads, timeout=10)
+    monkeypatch.setattr(dl, 'sleep', lambda seconds: failed.wait())
+    client = FakeEE(throttle=n_threads)
+    session = dl._RequestSession()
+    session.breaker = dl.CircuitBreaker(threshold=n_threads, 
+        cooldown=cooldown)
+
+    results = dl.map_workers(session.getinfo, 
+        [(_request(client),)] * n_threads, workers=n_threads, threads=True)
+
+    assert all(results)
+    assert session.retries == n_threads
+    assert session.requests == n_threads
+    failed_times = client.call_times[:n_threads]
+    retry_times = client.call_times[n_threads:]
+    assert len(retry_times) == n_threads
+    assert min(retry_times) >= max(failed_times) + cooldown
+
+
+def test_session_rate_limit():
+    """Requests of all threads are limited to the shared rate."""
+    rate, n_requests = 50, 100
+    client = FakeEE()
+    session = dl._RequestSession(rate_limit=rate)
+
+    start = time.monotonic()
+    dl.map_workers(session.getinfo, [(_request(client),)] * n_requests, 
+        workers=4, threads=True)
+    elapsed = time.monotonic() - start
+
+    assert session.requests == n_requests
+    # a full bucket allows a burst of one second of requests
+    assert elapsed >= (n_requests - rate) / rate
+
+
+@pytest.mark.parametrize('batch', [False, True])
+def test_download_workers(input_csv, full_data, tmp_path, monkeypatch, 
+        batch):
+    """
+    Cells downloaded in parallel threads with throttled requests fill the
+    same files as a single thread.
+    """
+    monkeypatch.setattr(dl, 'sleep', lambda seconds: None)
+    out_dir = str(tmp_path / 'workers')
+    _partial_files(full_data, out_dir)
+    client = FakeEE(throttle=2)
+    dl.download_gridmet_ee(input_csv, out_dir, year_filter='2000-2001',
+        batch=batch, workers=3, client=client)
+
+    _assert_complete(full_data, out_dir)
+    if not batch:
+        # elevation, then an empty check and data request per cell-year, 
+        # cell 1 is missing parts of 2 years, cell 2 one month and cell 3
+        # both years
+        assert client.calls == 2 + (1 + 2 * 2) + (1 + 2) + (1 + 2 * 2)
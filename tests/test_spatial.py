@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for :mod:`gridwxcomp.spatial`
+"""
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip('rasterio')
+fiona = pytest.importorskip('fiona')
+rasterstats = pytest.importorskip('rasterstats')
+pytest.importorskip('osgeo')
+
+from rasterio.transform import from_origin
+
+from gridwxcomp import spatial
+from gridwxcomp.spatial import CELL_SIZE
+
+# upper left corner of a 3 x 4 lattice of gridMET cells
+XMIN = -124.78749996666667 + 100 * CELL_SIZE
+YMAX = 25.04583333333334 + 300 * CELL_SIZE
+N_ROWS, N_COLS = 3, 4
+
+
+@pytest.fixture
+def grid_file(tmp_path):
+    """Fishnet of gridMET cell polygons ordered column by column."""
+    schema = {'geometry': 'Polygon', 'properties': {'GRIDMET_ID': 'int'}}
+    path = str(tmp_path / 'grid.shp')
+    with fiona.open(path, 'w', 'ESRI Shapefile', schema, 
+            crs={'init': 'epsg:4326'}) as dst:
+        for col in range(N_COLS):
+            for row in range(N_ROWS):
+                left = XMIN + col * CELL_SIZE
+                top = YMAX - row * CELL_SIZE
+                ring = [(left, top), (left + CELL_SIZE, top), 
+                    (left + CELL_SIZE, top - CELL_SIZE), 
+                    (left, top - CELL_SIZE), (left, top)]
+                dst.write({
+                    'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+                    'properties': {'GRIDMET_ID': row * N_COLS + col}
+                })
+    return path
+
+
+@pytest.fixture
+def aligned_raster(tmp_path):
+    """
+    Raster with 4 pixels per gridMET cell side that extends 2 pixels past
+    the lattice on each side, with some missing values.
+    """
+    k, pad = 4, 2
+    pixel = CELL_SIZE / k
+    values = np.random.RandomState(0).uniform(
+        0.5, 1.5, (N_ROWS * k + 2 * pad, N_COLS * k + 2 * pad))
+    values[5, 7] = np.nan
+    path = str(tmp_path / 'aligned.tiff')
+    with rasterio.open(path, 'w', driver='GTiff', height=values.shape[0],
+            width=values.shape[1], count=1, dtype='float64', nodata=np.nan,
+            crs='EPSG:4326', 
+            transform=from_origin(XMIN - pad * pixel, YMAX + pad * pixel, 
+                pixel, pixel)) as dst:
+        dst.write(values, 1)
+    return path
+
+
+@pytest.mark.parametrize('all_touched', [True, False])
+def test_block_zonal_means_match_zonal_stats(grid_file, aligned_raster, 
+        all_touched):
+    """Block means of aligned rasters equal rasterstats zonal means."""
+    lattice_ids, xmin, ymax, rows, cols = spatial._grid_lattice(
+        grid_file, 'missing_grid.tiff')
+    block_means = spatial._block_zonal_means(
+        aligned_raster, lattice_ids, xmin, ymax)
+    assert block_means is not None
+
+    with fiona.open(grid_file) as source:
+        features = list(source)
+    zs = rasterstats.zonal_stats(
+        features, aligned_raster, all_touched=all_touched)
+
+    np.testing.assert_allclose(
+        block_means[rows, cols], [z['mean'] for z in zs])
+
+
+@pytest.mark.parametrize('smooth', [0, 0.5])
+@pytest.mark.parametrize('function', sorted(spatial._RBF_KERNELS))
+def test_rbf_interpolate_matches_legacy_rbf(function, smooth):
+    """Rbf functions and smooth give the surface of scipy Rbf."""
+    from scipy.interpolate import Rbf
+
+    rng = np.random.RandomState(0)
+    x = rng.uniform(-115, -110, 30)
+    y = rng.uniform(40, 44, 30)
+    values = rng.uniform(0.8, 1.2, 30)
+    xi = np.linspace(-115, -110, 20)
+    yi = np.linspace(44, 40, 15)
+
+    out = spatial._rbf_interpolate(
+        x, y, values, xi, yi, function=function, smooth=smooth)
+    XI, YI = np.meshgrid(xi, yi)
+    legacy = Rbf(x, y, values, function=function.replace('_rbf', ''), 
+        smooth=smooth)(XI, YI)
+
+    np.testing.assert_allclose(out, legacy, atol=1e-8)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for :mod:`gridwxcomp.util`
+"""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from gridwxcomp.util import block_means, map_workers, CircuitBreaker,\
+    TokenBucket
+
+
+def _loop_block_means(values, shape, k, row_off, col_off):
+    """Reference block means from a loop over the pixels of each cell."""
+    values = np.ma.masked_invalid(values)
+    means = np.full(shape, np.nan)
+    for row in range(shape[0]):
+        for col in range(shape[1]):
+            pixels = []
+            for i in range(row * k, (row + 1) * k):
+                for j in range(col * k, (col + 1) * k):
+                    r, c = i + row_off, j + col_off
+                    if 0 <= r < values.shape[0] and 0 <= c < values.shape[1]\
+                            and not np.ma.getmaskarray(values)[r, c]:
+                        pixels.append(values.data[r, c])
+            if pixels:
+                means[row, col] = np.mean(pixels)
+    return means
+
+
+@pytest.mark.parametrize('k,row_off,col_off', [
+    (1, 0, 0),
+    (4, 2, 2),
+    # lattice extends past the top left and bottom right of the array
+    (4, -3, -5),
+    (3, 6, 9),
+    # lattice entirely outside of the array
+    (2, 100, 0),
+])
+def test_block_means_match_loop(k, row_off, col_off):
+    """Summed-area table block means equal means of each k x k window."""
+    values = np.random.RandomState(0).uniform(0.5, 1.5, (16, 20))
+    values[5, 7] = np.nan
+    # cell with no valid pixels
+    values[4:8, 8:12] = np.nan
+    shape = (3, 4)
+
+    means = block_means(values, shape, k, row_off, col_off)
+    expected = _loop_block_means(values, shape, k, row_off, col_off)
+
+    assert means.shape == shape
+    np.testing.assert_allclose(means, expected, rtol=1e-12)
+
+
+def test_block_means_masked_values():
+    """Masked pixels are ignored the same as NaN pixels."""
+    values = np.random.RandomState(1).uniform(0, 10, (8, 8))
+    mask = np.zeros(values.shape, dtype=bool)
+    mask[0, :3] = True
+    mask[6:, 6:] = True
+    nan_values = values.copy()
+    nan_values[mask] = np.nan
+
+    masked = block_means(np.ma.masked_array(values, mask), (2, 2), 4)
+    expected = _loop_block_means(nan_values, (2, 2), 4, 0, 0)
+
+    np.testing.assert_allclose(masked, expected, rtol=1e-12)
+
+
+def test_map_workers_threads():
+    """Calls run concurrently in threads and results keep their order."""
+    n = 4
+    started = threading.Barrier(n, timeout=10)
+    def _call(i):
+        # only returns once all calls are running at the same time
+        started.wait()
+        return i, threading.get_ident()
+
+    results = map_workers(_call, [(i,) for i in range(n)], workers=n, 
+        threads=True)
+
+    assert [i for i, _ in results] == list(range(n))
+    assert not threading.get_ident() in {t for _, t in results}
+    # a single worker calls the function in the current thread
+    assert map_workers(lambda i: threading.get_ident(), [(0,)]) ==\
+        [threading.get_ident()]
+
+
+def test_token_bucket_rate():
+    """After a burst of ``capacity`` tokens, tokens are given at the rate."""
+    rate, capacity, n = 20, 5, 25
+    limiter = TokenBucket(rate, capacity=capacity)
+    start = time.monotonic()
+    waited = [limiter.acquire() for _ in range(n)]
+    elapsed = time.monotonic() - start
+
+    assert waited[:capacity] == [0.] * capacity
+    assert elapsed >= (n - capacity) / rate
+    assert elapsed < (n - capacity) / rate + 0.5
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_token_bucket_threads():
+    """Threads share the tokens of one bucket."""
+    rate, n = 50, 100
+    limiter = TokenBucket(rate)
+    start = time.monotonic()
+    map_workers(limiter.acquire, [()] * n, workers=8, threads=True)
+
+    assert time.monotonic() - start >= (n - rate) / rate
+
+
+def test_circuit_breaker():
+    """
+    The circuit opens after consecutive failures, its cooldown doubles up
+    to the maximum each time it opens again and resets after a success.
+    """
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05, max_cooldown=0.15)
+    assert breaker.wait() == 0.
+
+    breaker.failure()
+    assert not breaker.is_open
+    breaker.success()
+    breaker.failure()
+    assert not breaker.is_open
+
+    cooldowns = []
+    for _ in range(3):
+        breaker.failure()
+        breaker.failure()
+        assert breaker.is_open
+        # failures while open do not extend the cooldown
+        breaker.failure()
+        cooldowns.append(breaker.wait())
+        assert not breaker.is_open
+    assert cooldowns == pytest.approx([0.05, 0.1, 0.15], abs=0.04)
+
+    breaker.success()
+    breaker.failure()
+    breaker.failure()
+    assert breaker.wait() == pytest.approx(0.05, abs=0.04)
+
+
+def test_circuit_breaker_threads():
+    """All threads wait while the circuit is open."""
+    cooldown = 0.2
+    breaker = CircuitBreaker(threshold=1, cooldown=cooldown)
+    breaker.failure()
+    opened = time.monotonic()
+
+    def _wait():
+        breaker.wait()
+        return time.monotonic()
+
+    resumed = map_workers(_wait, [()] * 4, workers=4, threads=True)
+
+    assert min(resumed) >= opened + cooldown * 0.99